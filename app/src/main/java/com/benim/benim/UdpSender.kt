@@ -8,16 +8,24 @@ import android.hardware.SensorEvent
 import android.hardware.SensorEventListener
 import android.hardware.SensorManager
 import android.os.Binder
+import android.os.Build
 import android.os.Handler
 import android.os.IBinder
 import android.os.Looper
 import android.os.Process
+import android.os.VibrationEffect
+import android.os.Vibrator
 import android.util.Log
 import android.widget.Toast
+import java.math.BigInteger
 import java.net.DatagramPacket
 import java.net.DatagramSocket
 import java.net.InetAddress
+import java.security.MessageDigest
+import java.security.SecureRandom
 import java.util.concurrent.LinkedBlockingQueue
+import javax.crypto.Mac
+import javax.crypto.spec.SecretKeySpec
 import kotlin.concurrent.thread
 
 class UdpService : Service(), SensorEventListener {
@@ -35,7 +43,12 @@ class UdpService : Service(), SensorEventListener {
         const val PACKET_MOUSE_MOVE: Byte = 0x02
         const val PACKET_MOUSE_BUTTON: Byte = 0x03
         const val PACKET_MOUSE_WHEEL: Byte = 0x04
+        const val PACKET_GAMEPAD_DELTA: Byte = 0x06
+        const val PACKET_GAMEPAD_KEYFRAME: Byte = 0x07  // Numaralı tam paket (delta tabanı)
         const val PACKET_GYRO: Byte = 0x0D
+        const val PACKET_IMU: Byte = 0x0E  // Gyro + ivme örnek grubu
+        const val PACKET_RUMBLE: Byte = 0x10  // Sunucu → telefon
+        const val PACKET_KEYFRAME: Byte = 0x11  // Sunucu → telefon: tam paket iste
         const val PACKET_PING: Byte = 0x7F
 
         // ═══════════════════════════════════════════════════════════
@@ -110,6 +123,10 @@ class UdpService : Service(), SensorEventListener {
 
     val isServerAlive: Boolean get() = _isServerAlive
 
+    // Paket doğrulama: DISCOVER sırasında kurulan anahtar, gönderici thread her pakete MAC ekler
+    @Volatile private var packetAuth: PacketAuth? = null
+    @Volatile private var pairingTried = false
+
     // ═══════════════════════════════════════════════════════════════
     // GAMEPAD STATE
     // ═══════════════════════════════════════════════════════════════
@@ -129,11 +146,29 @@ class UdpService : Service(), SensorEventListener {
     // 12-byte paket (XOR dahil)
     private val gamepadPacket = ByteArray(12)
 
+    // Delta paketleri: sunucu ping yankısında destek bildirirse açılır
+    @Volatile private var serverSupportsDelta = false
+    @Volatile private var serverSupportsImu = false
+
+    // Buton kenarı yedekliliği: son EDGE_HISTORY kenar (sıra no'lu) her pakete eklenir,
+    // kaybolan paketin taşıdığı basma/bırakma sonrakiyle yine ulaşır
+    @Volatile private var serverSupportsEdges = false
+    private val EDGE_HISTORY = 4  // 2'nin kuvveti (u16 sıra taşmasıyla uyumlu)
+    private val edgeRing = IntArray(EDGE_HISTORY)  // (sıra shl 8) or kenar
+    private var edgeCount = 0
+    private var edgeSeq = 0
+    @Volatile private var keyframeRequested = false
+    private var keyframe: ByteArray? = null
+    private var keyframeId = 0
+    private var lastKeyframeTime: Long = 0
+    private val KEYFRAME_INTERVAL_MS = 250L
+
     // ═══════════════════════════════════════════════════════════════
     // GYRO
     // ═══════════════════════════════════════════════════════════════
     private var sensorManager: SensorManager? = null
     private var gyroSensor: Sensor? = null
+    private var accelSensor: Sensor? = null
     @Volatile var gyroEnabled = false
         private set
 
@@ -148,14 +183,24 @@ class UdpService : Service(), SensorEventListener {
     @Volatile var gyroPacketsSent: Long = 0
         private set
 
-    // 7-byte gyro paketi (daha basit: int16 format)
-    private val gyroPacket = ByteArray(7)
+    // 11-byte gyro paketi (int16 format + sensör zamanı; eski sunucular ilk 7 byte'ı okur)
+    private val gyroPacket = ByteArray(11)
+
+    // IMU: sunucu destekliyorsa gyro örnekleri son ivmeyle birlikte biriktirilip grup halinde gider
+    private val IMU_MAX_BATCH = 8
+    private val imuPacket = ByteArray(2 + 16 * IMU_MAX_BATCH)
+    private var imuCount = 0
+    private val lastAccel = FloatArray(3)
+    private var hasAccelSample = false
 
     // ═══════════════════════════════════════════════════════════════
     // UI HANDLER
     // ═══════════════════════════════════════════════════════════════
     private val mainHandler = Handler(Looper.getMainLooper())
 
+    // Sunucudan gelen rumble için
+    private val vibrator: Vibrator? by lazy { getSystemService(VIBRATOR_SERVICE) as? Vibrator }
+
     // ═══════════════════════════════════════════════════════════════
     // LIFECYCLE
     // ═══════════════════════════════════════════════════════════════
@@ -177,6 +222,7 @@ class UdpService : Service(), SensorEventListener {
         // Gyro sensör init
         sensorManager = getSystemService(SENSOR_SERVICE) as SensorManager
         gyroSensor = sensorManager?.getDefaultSensor(Sensor.TYPE_GYROSCOPE)
+        accelSensor = sensorManager?.getDefaultSensor(Sensor.TYPE_ACCELEROMETER)
 
         if (gyroSensor != null) {
             Log.d(TAG, "✅ Gyro sensör bulundu: ${gyroSensor?.name}")
@@ -207,27 +253,43 @@ class UdpService : Service(), SensorEventListener {
     // ═══════════════════════════════════════════════════════════════
 
     fun setButton(button: Int, pressed: Boolean) {
-        synchronized(gamepadLock) {
-            buttons = if (pressed) buttons or button else buttons and button.inv()
+        val edged = synchronized(gamepadLock) {
+            updateButtons(if (pressed) buttons or button else buttons and button.inv())
         }
-        sendGamepadPacket()
+        sendGamepadPacket(force = edged)
     }
 
     fun setButtons(mask: Int, pressed: Boolean) {
-        synchronized(gamepadLock) {
-            buttons = if (pressed) buttons or mask else buttons and mask.inv()
+        val edged = synchronized(gamepadLock) {
+            updateButtons(if (pressed) buttons or mask else buttons and mask.inv())
         }
-        sendGamepadPacket()
+        sendGamepadPacket(force = edged)
     }
 
     fun setButtonState(newState: Int) {
-        synchronized(gamepadLock) { buttons = newState }
-        sendGamepadPacket()
+        val edged = synchronized(gamepadLock) { updateButtons(newState) }
+        sendGamepadPacket(force = edged)
     }
 
     fun clearButtons() {
-        synchronized(gamepadLock) { buttons = 0 }
-        sendGamepadPacket()
+        val edged = synchronized(gamepadLock) { updateButtons(0) }
+        sendGamepadPacket(force = edged)
+    }
+
+    // gamepadLock altında: değişen her bit için sıra no'lu kenar kaydet
+    private fun updateButtons(newState: Int): Boolean {
+        var changed = buttons xor newState
+        buttons = newState
+        if (changed == 0) return false
+        while (changed != 0) {
+            val bit = Integer.numberOfTrailingZeros(changed)
+            changed = changed and (changed - 1)
+            edgeSeq = (edgeSeq + 1) and 0xFFFF
+            val edge = bit or (if (newState and (1 shl bit) != 0) 0x80 else 0)
+            edgeRing[edgeSeq and (EDGE_HISTORY - 1)] = (edgeSeq shl 8) or edge
+            if (edgeCount < EDGE_HISTORY) edgeCount++
+        }
+        return true
     }
 
     fun isButtonPressed(button: Int): Boolean = (buttons and button) != 0
@@ -342,25 +404,26 @@ class UdpService : Service(), SensorEventListener {
         rx: Int = rightStickX, ry: Int = rightStickY,
         l2: Int = triggerL2, r2: Int = triggerR2
     ) {
-        synchronized(gamepadLock) {
-            buttons = btns
+        val edged = synchronized(gamepadLock) {
             leftStickX = lx.coerceIn(-127, 127)
             leftStickY = ly.coerceIn(-127, 127)
             rightStickX = rx.coerceIn(-127, 127)
             rightStickY = ry.coerceIn(-127, 127)
             triggerL2 = l2.coerceIn(0, 255)
             triggerR2 = r2.coerceIn(0, 255)
+            updateButtons(btns)
         }
-        sendGamepadPacket()
+        sendGamepadPacket(force = edged)
     }
 
     // ═══════════════════════════════════════════════════════════════
     // GAMEPAD PAKET GÖNDERİMİ (12 BYTE + XOR)
     // ═══════════════════════════════════════════════════════════════
 
-    private fun sendGamepadPacket() {
+    // force: buton kenarı - hız sınırına takılırsa hızlı bas-bırak hiç gitmez
+    private fun sendGamepadPacket(force: Boolean = false) {
         val now = System.currentTimeMillis()
-        if (now - lastSendTime < SEND_INTERVAL_MS) return
+        if (!force && now - lastSendTime < SEND_INTERVAL_MS) return
         lastSendTime = now
 
         if (serverAddressCache == null) return
@@ -391,9 +454,76 @@ class UdpService : Service(), SensorEventListener {
                 xor = xor xor (gamepadPacket[i].toInt() and 0xFF)
             }
             gamepadPacket[11] = xor.toByte()
+
+            sendQueue.offer(withEdges(buildDelta(now) ?: buildKeyframe(now)))
         }
+    }
 
-        sendQueue.offer(gamepadPacket.copyOf())
+    // Kenar eki: [n][n × (sıra u16 LE, kenar)][XOR], eskiden yeniye; kenar bit0-4 = buton, bit7 = basıldı
+    private fun withEdges(packet: ByteArray): ByteArray {
+        if (!serverSupportsEdges || edgeCount == 0) return packet
+        val out = packet.copyOf(packet.size + 2 + 3 * edgeCount)
+        var pos = packet.size
+        out[pos++] = edgeCount.toByte()
+        for (age in edgeCount - 1 downTo 0) {
+            val entry = edgeRing[(edgeSeq - age) and (EDGE_HISTORY - 1)]
+            val seq = entry ushr 8
+            out[pos++] = (seq and 0xFF).toByte()
+            out[pos++] = (seq shr 8).toByte()
+            out[pos++] = (entry and 0xFF).toByte()
+        }
+        var xor = 0
+        for (i in packet.size until pos) xor = xor xor (out[i].toInt() and 0xFF)
+        out[pos] = xor.toByte()
+        return out
+    }
+
+    // [0x07][keyframe id u16 LE][butonlar..tetikler][XOR] - id her keyframe'de bir artar
+    private fun buildKeyframe(now: Long): ByteArray {
+        val frame = gamepadPacket.copyOf()
+        keyframe = frame
+        lastKeyframeTime = now
+        keyframeRequested = false
+        if (!serverSupportsDelta) return frame
+
+        keyframeId = (keyframeId + 1) and 0xFFFF
+        val packet = ByteArray(14)
+        packet[0] = PACKET_GAMEPAD_KEYFRAME
+        packet[1] = (keyframeId and 0xFF).toByte()
+        packet[2] = (keyframeId shr 8).toByte()
+        System.arraycopy(frame, 1, packet, 3, 10)
+        var xor = 0
+        for (i in 0..12) xor = xor xor (packet[i].toInt() and 0xFF)
+        packet[13] = xor.toByte()
+        return packet
+    }
+
+    // [0x06][taban id u16 LE][maske][değişen alanlar][XOR] - hep son keyframe'e göre
+    private fun buildDelta(now: Long): ByteArray? {
+        val key = keyframe ?: return null
+        if (!serverSupportsDelta || keyframeRequested || now - lastKeyframeTime >= KEYFRAME_INTERVAL_MS) return null
+
+        var mask = 0
+        var size = 5
+        if ((1..4).any { gamepadPacket[it] != key[it] }) { mask = 1; size += 4 }
+        for (i in 5..10) {
+            if (gamepadPacket[i] != key[i]) { mask = mask or (1 shl (i - 4)); size += 1 }
+        }
+        if (size >= gamepadPacket.size) return null
+
+        val delta = ByteArray(size)
+        delta[0] = PACKET_GAMEPAD_DELTA
+        delta[1] = (keyframeId and 0xFF).toByte()
+        delta[2] = (keyframeId shr 8).toByte()
+        delta[3] = mask.toByte()
+        var pos = 4
+        if (mask and 1 != 0) for (i in 1..4) delta[pos++] = gamepadPacket[i]
+        for (i in 5..10) if (mask and (1 shl (i - 4)) != 0) delta[pos++] = gamepadPacket[i]
+
+        var xor = 0
+        for (i in 0 until size - 1) xor = xor xor (delta[i].toInt() and 0xFF)
+        delta[size - 1] = xor.toByte()
+        return delta
     }
 
     fun forceUpdate() {
@@ -417,8 +547,13 @@ class UdpService : Service(), SensorEventListener {
         sendRaw(byteArrayOf(PACKET_MOUSE_BUTTON, button, if (pressed) 1 else 0))
     }
 
-    fun sendMouseWheel(delta: Int) {
-        sendRaw(byteArrayOf(PACKET_MOUSE_WHEEL, delta.coerceIn(-128, 127).toByte()))
+    fun sendMouseWheel(delta: Int, horizontal: Int = 0) {
+        val v = delta.coerceIn(-128, 127).toByte()
+        if (horizontal == 0) {
+            sendRaw(byteArrayOf(PACKET_MOUSE_WHEEL, v))
+        } else {
+            sendRaw(byteArrayOf(PACKET_MOUSE_WHEEL, v, horizontal.coerceIn(-128, 127).toByte()))
+        }
     }
 
     // ═══════════════════════════════════════════════════════════════
@@ -441,6 +576,11 @@ class UdpService : Service(), SensorEventListener {
                 gyroSensor,
                 SensorManager.SENSOR_DELAY_GAME
             )
+            accelSensor?.let {
+                sensorManager?.registerListener(this, it, SensorManager.SENSOR_DELAY_GAME)
+            }
+            imuCount = 0
+            hasAccelSample = false
             gyroEnabled = true
             gyroPacketsSent = 0
             Log.d(TAG, "✅ Gyro etkinleştirildi")
@@ -475,21 +615,36 @@ class UdpService : Service(), SensorEventListener {
     /**
      * Gyro sensör olayı
      *
-     * PAKET FORMATI (7 byte - Ham Int16):
-     * [0]   = 0x0D (Header)
-     * [1-2] = gX (int16, Little-Endian, ±32767)
-     * [3-4] = gY (int16)
-     * [5-6] = gZ (int16)
+     * PAKET FORMATI (11 byte - Ham Int16):
+     * [0]    = 0x0D (Header)
+     * [1-2]  = gX (int16, Little-Endian, ±32767)
+     * [3-4]  = gY (int16)
+     * [5-6]  = gZ (int16)
+     * [7-10] = sensör zamanı (u32 µs, Little-Endian, taşar)
      *
      * Değer aralığı: ±500 deg/s = ±32767
+     *
+     * Sunucu IMU destekliyorsa (ping yankısı bit1) ve ivme sensörü varsa
+     * bunun yerine IMU paketi gider, bkz. appendImuSample.
      */
     override fun onSensorChanged(event: SensorEvent?) {
-        if (event?.sensor?.type != Sensor.TYPE_GYROSCOPE) return
-        if (!gyroEnabled) return
+        if (event == null || !gyroEnabled) return
+
+        if (event.sensor.type == Sensor.TYPE_ACCELEROMETER) {
+            System.arraycopy(event.values, 0, lastAccel, 0, 3)
+            hasAccelSample = true
+            return
+        }
+        if (event.sensor.type != Sensor.TYPE_GYROSCOPE) return
 
         // Opsiyonel: Sadece landscape modda çalış
         if (gyroLandscapeOnly && !isLandscape()) return
 
+        if (serverSupportsImu && hasAccelSample) {
+            appendImuSample(event)
+            return
+        }
+
         // Rate limit
         val now = System.currentTimeMillis()
         if (now - lastGyroSendTime < GYRO_SEND_INTERVAL_MS) return
@@ -530,6 +685,10 @@ class UdpService : Service(), SensorEventListener {
         gyroPacket[5] = (gz and 0xFF).toByte()
         gyroPacket[6] = ((gz shr 8) and 0xFF).toByte()
 
+        // Sensör zamanı (ns → µs, DSU çıkışı için)
+        val micros = event.timestamp / 1000
+        for (i in 0..3) gyroPacket[7 + i] = (micros shr (8 * i)).toByte()
+
         sendQueue.offer(gyroPacket.copyOf())
         gyroPacketsSent++
 
@@ -539,6 +698,48 @@ class UdpService : Service(), SensorEventListener {
         }
     }
 
+    /**
+     * IMU PAKETİ: [0x0E][n][n × 16 byte]
+     * Örnek: gx gy gz (int16, ±500 deg/s), ax ay az (int16, ±8 g), zaman (u32 µs), Little-Endian
+     *
+     * Gyro örnekleri atılmaz: gönderim aralığı dolana (veya grup dolana) kadar
+     * birikir, sunucudaki füzyon filtresi hepsini sırayla entegre eder.
+     * Füzyon için ham değerler gider (hassasiyet sunucu tarafında uygulanır).
+     */
+    private fun appendImuSample(event: SensorEvent) {
+        val gyroScale = 57.2958f * 32767f / 500f
+        val accelScale = 32767f / (8f * SensorManager.GRAVITY_EARTH)
+        val values = intArrayOf(
+            (event.values[0] * gyroScale).toInt().coerceIn(-32767, 32767),
+            (event.values[1] * gyroScale).toInt().coerceIn(-32767, 32767),
+            (event.values[2] * gyroScale).toInt().coerceIn(-32767, 32767),
+            (lastAccel[0] * accelScale).toInt().coerceIn(-32767, 32767),
+            (lastAccel[1] * accelScale).toInt().coerceIn(-32767, 32767),
+            (lastAccel[2] * accelScale).toInt().coerceIn(-32767, 32767)
+        )
+        var off = 2 + 16 * imuCount
+        for (v in values) {
+            imuPacket[off++] = (v and 0xFF).toByte()
+            imuPacket[off++] = ((v shr 8) and 0xFF).toByte()
+        }
+        val micros = event.timestamp / 1000
+        for (i in 0..3) imuPacket[off + i] = (micros shr (8 * i)).toByte()
+        imuCount++
+
+        val now = System.currentTimeMillis()
+        if (imuCount < IMU_MAX_BATCH && now - lastGyroSendTime < GYRO_SEND_INTERVAL_MS) return
+        if (serverAddressCache == null) {
+            imuCount = 0
+            return
+        }
+        lastGyroSendTime = now
+        imuPacket[0] = PACKET_IMU
+        imuPacket[1] = imuCount.toByte()
+        sendQueue.offer(imuPacket.copyOf(2 + 16 * imuCount))
+        imuCount = 0
+        gyroPacketsSent++
+    }
+
     override fun onAccuracyChanged(sensor: Sensor?, accuracy: Int) {}
 
     private fun Float.format(digits: Int) = "%.${digits}f".format(this)
@@ -578,25 +779,18 @@ class UdpService : Service(), SensorEventListener {
                     soTimeout = 3000
                 }
 
-                val msg = "DISCOVER_JOYSTICK_SERVER"
-                val packet = DatagramPacket(
-                    msg.toByteArray(), msg.length,
-                    InetAddress.getByName("255.255.255.255"), SERVER_PORT
-                )
-                discoverSocket.send(packet)
-
-                val buf = ByteArray(256)
-                val response = DatagramPacket(buf, buf.size)
-                discoverSocket.receive(response)
+                val found = exchangeDiscovery(discoverSocket, InetAddress.getByName("255.255.255.255"))
+                discoverSocket.close()
 
-                val responseStr = String(response.data, 0, response.length)
-                if (responseStr.startsWith("I_AM_SERVER")) {
-                    val ip = response.address.hostAddress ?: FALLBACK_IP
+                if (found != null) {
+                    val ip = found.first.hostAddress ?: FALLBACK_IP
+                    val auth = found.second
                     setServerIp(ip)
-                    showToast("✅ Sunucu: $ip")
+                    packetAuth = auth
+                    pairingTried = auth == null
+                    showToast(if (auth != null) "✅ Sunucu: $ip (kod ${auth.code})" else "✅ Sunucu: $ip")
                     sendStatusBroadcast(TYPE_DISCOVERY_SUCCESS, ip)
                 }
-                discoverSocket.close()
 
             } catch (e: Exception) {
                 setServerIp(FALLBACK_IP)
@@ -606,8 +800,52 @@ class UdpService : Service(), SensorEventListener {
         }
     }
 
+    /**
+     * DISCOVER + açık anahtar gönder. Yanıt: sunucu adresi ve sunucu eşleştirmeyi
+     * destekliyorsa anahtar (eski sunucular düz "I_AM_SERVER" döner).
+     */
+    private fun exchangeDiscovery(sock: DatagramSocket, target: InetAddress): Pair<InetAddress, PacketAuth?>? {
+        val pairing = PacketAuth.Pairing()
+        val msg = "DISCOVER_JOYSTICK_SERVER PAIR ${pairing.publicHex}".toByteArray()
+        sock.send(DatagramPacket(msg, msg.size, target, SERVER_PORT))
+
+        val buf = ByteArray(1024)
+        val response = DatagramPacket(buf, buf.size)
+        sock.receive(response)
+
+        val responseStr = String(response.data, 0, response.length)
+        if (!responseStr.startsWith("I_AM_SERVER")) return null
+        val peer = responseStr.substringAfter(" PAIR ", "")
+        return response.address to (if (peer.isNotEmpty()) pairing.finish(peer) else null)
+    }
+
+    /** Sunucu bu telefonun anahtarını tanımıyor (yeniden başlamış/elle IP): bir kez doğrudan eşleş */
+    private fun repair() {
+        val addr = serverAddressCache ?: return
+        pairingTried = true
+        thread(name = "udp-pair") {
+            try {
+                val auth = DatagramSocket().use { sock ->
+                    sock.soTimeout = 3000
+                    exchangeDiscovery(sock, addr)?.second
+                } ?: return@thread
+                packetAuth = auth
+                pairingTried = false
+                showToast("🔑 Eşleştirildi: kod ${auth.code}")
+            } catch (e: Exception) {
+                // Yanıt yok (sunucu eşleştirme hız sınırı, kayıp paket): sonraki ping'de yeniden dene
+                pairingTried = false
+                Log.w(TAG, "Pair: ${e.message}")
+            }
+        }
+    }
+
     fun setServerIp(ip: String?) {
         synchronized(serverLock) {
+            if (ip != serverIpInternal) {
+                packetAuth = null
+                pairingTried = false
+            }
             serverIpInternal = ip
             serverAddressCache = ip?.let {
                 try { InetAddress.getByName(it) } catch (_: Exception) { null }
@@ -631,7 +869,8 @@ class UdpService : Service(), SensorEventListener {
                 try {
                     val data = sendQueue.take()
                     val addr = serverAddressCache ?: continue
-                    socket.send(DatagramPacket(data, data.size, addr, SERVER_PORT))
+                    val out = packetAuth?.seal(data) ?: data
+                    socket.send(DatagramPacket(out, out.size, addr, SERVER_PORT))
                 } catch (_: InterruptedException) { break }
                 catch (e: Exception) { Log.e(TAG, "Send: ${e.message}") }
             }
@@ -651,6 +890,11 @@ class UdpService : Service(), SensorEventListener {
 
                     when (buffer[0]) {
                         PACKET_PING -> handlePingResponse(buffer, packet.length)
+                        PACKET_RUMBLE -> handleRumble(buffer, packet.length)
+                        PACKET_KEYFRAME -> {
+                            keyframeRequested = true
+                            forceUpdate()
+                        }
                         else -> {
                             val msg = String(buffer, 0, packet.length)
                             if (msg.startsWith("I_AM_SERVER")) {
@@ -677,6 +921,14 @@ class UdpService : Service(), SensorEventListener {
 
         val rtt = System.currentTimeMillis() - sentTime
         val wasAlive = _isServerAlive
+        // Byte 9: sunucu yetenekleri (bit1 = IMU paketi, bit2 = buton kenarları,
+        // bit3 = bu telefonun anahtarı sunucuda kayıtlı, bit4 = numaralı keyframe + delta;
+        // bit0 eski içerik kimlikli delta, artık kullanılmaz)
+        serverSupportsDelta = len >= 10 && (data[9].toInt() and 0x10) != 0
+        serverSupportsImu = len >= 10 && (data[9].toInt() and 0x02) != 0
+        serverSupportsEdges = len >= 10 && (data[9].toInt() and 0x04) != 0
+        val authenticated = len >= 10 && (data[9].toInt() and 0x08) != 0
+        if (!authenticated && !pairingTried) repair()
 
         synchronized(serverLock) {
             lastPingMs = rtt
@@ -688,6 +940,36 @@ class UdpService : Service(), SensorEventListener {
         sendStatusBroadcast(TYPE_PING_UPDATE)
     }
 
+    // [0x10][güçlü][zayıf][süre ms, u16 LE] - güçlü/zayıf 0 ise durdur
+    private fun handleRumble(data: ByteArray, len: Int) {
+        if (len < 5) return
+        val vib = vibrator ?: return
+
+        val strong = data[1].toInt() and 0xFF
+        val weak = data[2].toInt() and 0xFF
+        val duration = ((data[3].toInt() and 0xFF) or ((data[4].toInt() and 0xFF) shl 8)).toLong()
+        val amplitude = maxOf(strong, weak)
+
+        // Durdurma sadece güç (0, 0); süre 0xFFFF (eski sunucularda 0) = durdurulana kadar
+        if (amplitude == 0) {
+            vib.cancel()
+            return
+        }
+        val endless = duration == 0L || duration == 0xFFFFL
+        if (Build.VERSION.SDK_INT >= Build.VERSION_CODES.O) {
+            vib.vibrate(
+                if (endless) VibrationEffect.createWaveform(longArrayOf(1000), intArrayOf(amplitude), 0)
+                else VibrationEffect.createOneShot(duration, amplitude)
+            )
+        } else if (endless) {
+            @Suppress("DEPRECATION")
+            vib.vibrate(longArrayOf(0, 1000), 0)
+        } else {
+            @Suppress("DEPRECATION")
+            vib.vibrate(duration)
+        }
+    }
+
     private fun startPingLoop() {
         thread(name = "udp-ping") {
             Thread.sleep(500)
@@ -742,4 +1024,86 @@ class UdpService : Service(), SensorEventListener {
     fun getDebugState(): String = synchronized(gamepadLock) {
         "BTN:${buttons.toString(16)} L:($leftStickX,$leftStickY) R:($rightStickX,$rightStickY) T:$triggerL2/$triggerR2 | ${getGyroDebug()}"
     }
-}
\ No newline at end of file
+}
+
+// ═══════════════════════════════════════════════════════════════════
+// PAKET KİMLİK DOĞRULAMA
+// ═══════════════════════════════════════════════════════════════════
+
+/**
+ * Sunucuyla eşleştirmede kurulan anahtar. Her pakete
+ * [sayaç u32 LE][HMAC-SHA256(anahtar, paket + sayaç) ilk 8 byte] eklenir.
+ * Sadece gönderici thread kullanır (sayaç ve Mac thread güvenli değil).
+ */
+internal class PacketAuth(key: ByteArray) {
+
+    companion object {
+        const val TAG_SIZE = 8
+        const val TRAILER = 4 + TAG_SIZE
+        private const val PUBLIC_SIZE = 256
+
+        // RFC 3526 grup 14 (2048 bit MODP), g = 2
+        private val PRIME = BigInteger(
+            "FFFFFFFFFFFFFFFFC90FDAA22168C234C4C6628B80DC1CD129024E088A67CC74" +
+            "020BBEA63B139B22514A08798E3404DDEF9519B3CD3A431B302B0A6DF25F1437" +
+            "4FE1356D6D51C245E485B576625E7EC6F44C42E9A637ED6B0BFF5CB6F406B7ED" +
+            "EE386BFB5A899FA5AE9F24117C4B1FE649286651ECE45B3DC2007CB8A163BF05" +
+            "98DA48361C55D39A69163FA8FD24CF5F83655D23DCA3AD961C62F356208552BB" +
+            "9ED529077096966D670C354E4ABC9804F1746C08CA18217C32905E462E36CE3B" +
+            "E39E772C180E86039B2783A2EC07A28FB5C55DF06F4C52C9DE2BCBF695581718" +
+            "3995497CEA956AE515D2261898FA051015728E5A8AACAA68FFFFFFFFFFFFFFFF", 16)
+        private val GENERATOR = BigInteger.valueOf(2)
+
+        /** Sabit uzunluk big-endian (BigInteger.toByteArray işaret byte'ı ekleyebilir) */
+        private fun fixed(value: BigInteger): ByteArray {
+            val raw = value.toByteArray()
+            val out = ByteArray(PUBLIC_SIZE)
+            val n = minOf(raw.size, PUBLIC_SIZE)
+            System.arraycopy(raw, raw.size - n, out, PUBLIC_SIZE - n, n)
+            return out
+        }
+    }
+
+    /** Bir eşleştirme denemesi: geçici DH anahtarı */
+    class Pairing {
+        private val secret = BigInteger(256, SecureRandom())
+        private val public = fixed(GENERATOR.modPow(secret, PRIME))
+        val publicHex: String = public.joinToString("") { "%02x".format(it) }
+
+        /** Sunucunun açık anahtarı → paket anahtarı (geçersizse null) */
+        fun finish(peerHex: String): PacketAuth? {
+            val hex = peerHex.trim()
+            if (hex.length != PUBLIC_SIZE * 2) return null
+            val peerBytes = ByteArray(PUBLIC_SIZE) { hex.substring(it * 2, it * 2 + 2).toInt(16).toByte() }
+            val peer = BigInteger(1, peerBytes)
+            if (peer <= BigInteger.ONE || peer >= PRIME - BigInteger.ONE) return null
+            val digest = MessageDigest.getInstance("SHA-256")
+            digest.update(fixed(peer.modPow(secret, PRIME)))
+            digest.update(public)       // istemci (A) önce, sunucu (B) sonra
+            digest.update(peerBytes)
+            return PacketAuth(digest.digest())
+        }
+    }
+
+    private val mac = Mac.getInstance("HmacSHA256").apply { init(SecretKeySpec(key, "HmacSHA256")) }
+    private var counter = 0L
+
+    /** Sunucu logundaki 6 haneli kodla aynı olmalı (araya giren yoksa) */
+    val code: String = MessageDigest.getInstance("SHA-256").run {
+        update(key)
+        update("kod".toByteArray())
+        val d = digest()
+        val value = ((d[0].toLong() and 0xFF) shl 24 or ((d[1].toLong() and 0xFF) shl 16) or
+                ((d[2].toLong() and 0xFF) shl 8) or (d[3].toLong() and 0xFF)) % 1000000
+        "%03d %03d".format(value / 1000, value % 1000)
+    }
+
+    fun seal(data: ByteArray): ByteArray {
+        val out = data.copyOf(data.size + TRAILER)
+        counter = (counter + 1) and 0xFFFFFFFFL
+        for (i in 0..3) out[data.size + i] = (counter shr (8 * i)).toByte()
+        mac.update(out, 0, data.size + 4)
+        System.arraycopy(mac.doFinal(), 0, out, data.size + 4, TAG_SIZE)
+        return out
+    }
+}
@@ -11,9 +11,20 @@ import socket
 import subprocess
 import shutil
 import signal
+import selectors
 import threading
 import struct
 import time
+import math
+import mmap
+import heapq
+import hashlib
+import hmac
+import json
+import zlib
+from array import array
+from collections import OrderedDict, deque
+from concurrent.futures import Future
 from datetime import datetime
 from abc import ABC, abstractmethod
 
@@ -36,19 +47,64 @@ class Config:
     PACKET_MOUSE_MOVE = 0x02
     PACKET_MOUSE_BUTTON = 0x03
     PACKET_MOUSE_WHEEL = 0x04
+    PACKET_TOUCH_ABS = 0x05     # Mutlak dokunma (temas id'li)
+    PACKET_GAMEPAD_DELTA = 0x06 # Son keyframe'e göre değişen alanlar
+    PACKET_GAMEPAD_KEYFRAME = 0x07  # Numaralı tam paket (delta tabanı)
     PACKET_GYRO = 0x0D
+    PACKET_IMU = 0x0E           # Gyro + ivme örnek grubu (sensör zamanlı)
+    PACKET_RUMBLE = 0x10        # Sunucu → telefon: [0x10][güçlü][zayıf][süre ms u16 LE, 0xFFFF = durdurulana kadar]
+    PACKET_KEYFRAME = 0x11      # Sunucu → telefon: tam gamepad paketi iste
+    
+    # Ping yankısına eklenen yetenek baytı (eski istemciler ilk 9 byte'ı okur)
+    CAP_GAMEPAD_DELTA = 0x10            # numaralı keyframe + delta (0x01: eski içerik kimlikli delta, ilan edilmez)
+    CAP_IMU = 0x02
+    CAP_BUTTON_EDGES = 0x04
+    CAP_AUTH = 0x08                     # bu istemcinin anahtarı sunucuda kayıtlı
+    EDGE_STALE_WINDOW = 256             # bu kadar geride kalan kenar sırası: yeniden sıralanmış eski paket
+    KEYFRAME_REQUEST_INTERVAL = 0.1     # istemci başına keyframe isteği aralığı (sn)
+    
+    # Force-feedback (rumble)
+    FF_ENABLED = True
+    FF_MAX_EFFECTS = 16
     
     # Hassasiyet
     MOUSE_SENSITIVITY = 1.6
-    SCROLL_SENSITIVITY = 2
-    JOYSTICK_DEADZONE = 10
+    SCROLL_SENSITIVITY = 5      # paket birimi başına 1/10 çentik: uygulamanın tipik 2 birimlik paketi ≈ 1 çentik
     TRIGGER_DEADZONE = 20
     JOYSTICK_AS_MOUSE = False
     
+    # Mutlak dokunma: pointer (tek temas, mutlak imleç) | touchscreen (MT, masaüstü jestleri)
+    TOUCH_MODE = "pointer"
+    TOUCH_REGION = (0.0, 0.0, 1.0, 1.0)     # telefon yüzeyinin eşlendiği ekran bölgesi (0-1)
+    
     # Gyro ayarları
     GYRO_AS_MOUSE = False
     GYRO_SENSITIVITY = 1.0
     
+    # IMU füzyonu (Madgwick) - ivme gelen istemcilerde yönelim tahmini
+    IMU_FUSION_BETA = 0.05              # ivme düzeltme kazancı (büyük: hızlı ama titrek)
+    GYRO_WORLD_YAW = True               # gyro mouse yatayı yerçekimi ekseninde (tutuş açısından bağımsız)
+    TILT_STEER = None                   # None | "lx" | "rx": yatay tutuşta yana yatırma → stick ekseni
+    TILT_STEER_RANGE = 45.0             # derece, tam sapma
+    TILT_STEER_DEADZONE = 2.0           # derece
+    TILT_STEER_INVERT = False
+    
+    # Pointer ivmelenme (PointerAccel) - flat | adaptive | custom
+    # Hız birimi: ham touchpad birimi / ms
+    POINTER_PROFILE = "flat"
+    POINTER_ACCEL = {"threshold": 0.4, "incline": 1.1, "max_gain": 3.0, "min_gain": 0.3}
+    POINTER_POINTS = None   # custom: [(hız, kazanç çarpanı), ...]
+    
+    # Stick tepki eğrisi (StickCurve, LUT ile önceden hesaplanır)
+    # mode: radial | axial, curve: linear | power | exp | custom
+    # deadzone / anti_deadzone / outer: ham birim (0-127)
+    STICK_PROFILES = {
+        "left": {"mode": "radial", "deadzone": 10, "anti_deadzone": 0, "outer": 127,
+                 "curve": "linear", "exponent": 2.0, "points": None},
+        "right": {"mode": "radial", "deadzone": 10, "anti_deadzone": 0, "outer": 127,
+                  "curve": "linear", "exponent": 2.0, "points": None},
+    }
+    
     # 32-BIT BUTON MAPPING
     GAMEPAD_BUTTONS = {
         0x00000001: ("A", "BTN_A"),
@@ -71,6 +127,17 @@ class Config:
     }
     
     BACKEND = "auto"
+    
+    # Makrolar: buton adı → eylem (bkz. MacroEngine), örn {"R1": "turbo:space@15"}
+    MACROS = {}
+    MACRO_TAP_MS = 20           # vuruşta tuşun basılı kalma süresi
+    MACRO_GAP_MS = 20           # dizideki vuruşlar arası boşluk
+    
+    # Backend sağlık denetimi (BackendSupervisor)
+    FAILOVER_ENABLED = True
+    HEALTH_MAX_ERRORS = 5               # art arda hata → yeniden kur / sıradakine geç
+    HEALTH_SLOW_MS = 50.0               # ortalama yazma gecikmesi sınırı
+    FAILOVER_COOLDOWN = 5.0             # iki değişim arası en az süre (sn)
     LOG_FILE = "gamepad_server.log"
     
     # Ayrı log bayrakları
@@ -82,6 +149,76 @@ class Config:
     
     VERIFY_CHECKSUM = True
     
+    # Takılı girdi koruması: girdi tutulurken istemciden bu süre paket
+    # gelmezse butonlar bırakılır, stickler ortalanır (sn, 0 = kapalı).
+    # Android istemcisi sadece değişimde + saniyede bir ping gönderir: varsayılan
+    # iki ping periyodu + Wi-Fi güç tasarrufu gecikmesi (tek kayıp ping bırakmaz).
+    # Bırakmadan sonra istemcinin ilk paketine keyframe isteğiyle yanıt verilir.
+    # Daha sık heartbeat gönderen istemcilerde 0.25 gibi kısa değerler kullanılabilir.
+    INPUT_DEADLINE = 2.5
+    
+    # Bu süre paket gelmeyen istemcinin tüm durumu silinir (sn). Döngü sadece
+    # gerçek son tarihlerde uyanır; istemci yokken select süresiz bekler.
+    CLIENT_TIMEOUT = 60.0
+    
+    # Çıkış upsampling (AxisUpsampler): stick/tetik değerleri sabit hızda
+    # interpolasyon veya kısa ufuklu ekstrapolasyonla backend'e yazılır.
+    # 0 = kapalı. Butonlar hiçbir zaman bekletilmez.
+    UPSAMPLE_RATE = 0                   # Hz
+    UPSAMPLE_MODE = "extrapolate"       # interpolate | extrapolate
+    UPSAMPLE_HORIZON = 0.5              # ekstrapolasyon ufku (giriş aralığı oranı)
+    
+    # Paylaşımlı bellek dışa aktarımı (FrameExporter) - None = kapalı
+    EXPORT_SHM = None
+    EXPORT_SHM_DEFAULT = "/dev/shm/benim_input"
+    EXPORT_SHM_SLOTS = 1024
+    
+    # Kabul kontrolü (AdmissionControl) - routing öncesi istemci başına token bucket
+    ADMISSION_ENABLED = True
+    ADMISSION_RATES = {                 # paket tipi: (token/sn, kova kapasitesi)
+        PACKET_GAMEPAD: (500, 100),
+        PACKET_GAMEPAD_DELTA: (500, 100),
+        PACKET_GAMEPAD_KEYFRAME: (500, 100),
+        PACKET_MOUSE_MOVE: (500, 100),
+        PACKET_MOUSE_BUTTON: (100, 40),
+        PACKET_MOUSE_WHEEL: (250, 50),
+        PACKET_TOUCH_ABS: (500, 100),
+        PACKET_GYRO: (1000, 200),
+        PACKET_IMU: (500, 100),         # paket başına birden çok örnek
+        PACKET_PING: (20, 10),
+        0x44: (2, 5),                   # "DISCOVER"
+    }
+    ADMISSION_DEFAULT_RATE = (50, 20)   # bilinmeyen paket tipleri
+    MAX_CLIENTS = 64                    # izlenen istemci sınırı (LRU ile çıkarılır)
+    ALLOWLIST = None                    # None: herkes, set: sadece bu IP'ler
+    PAIRING_WINDOW = 0                  # sn, >0 ise sadece bu sürede DISCOVER gönderenler eşleşir
+    
+    # Paket kimlik doğrulama (PacketAuth): DISCOVER sırasında Diffie-Hellman ile
+    # istemci başına anahtar; her pakete [sayaç u32 LE][HMAC-SHA256 ilk 8 byte] eklenir.
+    #   off      : eşleştirme yok, paketler olduğu gibi (XOR checksum)
+    #   optional : eşleşmiş istemcinin etiketsiz/yanlış paketi düşer, diğerleri eskisi gibi
+    #   required : sadece eşleşmiş istemcilerin doğrulanmış paketleri
+    AUTH_MODE = "optional"
+    AUTH_PAIR_RATE = (2, 4)             # (eşleştirme/sn, kova): tüm istemciler ortak, DH döngüde ~8 ms
+    AUTH_MAX_PENDING = 16               # ilk doğrulanmış paketini bekleyen eşleştirme sınırı
+    
+    # Çalışma zamanı profili (SIGUSR1 ile başlat/durdur)
+    PROFILE_MODE = "cprofile"           # cprofile (pstats) | sample (collapsed stack)
+    PROFILE_DURATION = 10.0             # sn, süre dolunca kendiliğinden durur
+    PROFILE_DIR = "."
+    PROFILE_SAMPLE_INTERVAL = 0.001     # sample modu örnekleme aralığı (sn)
+    
+    # DSU (cemuhook) hareket sunucusu - emülatörler için ayrı port, None = kapalı
+    DSU_PORT = None
+    DSU_PORT_DEFAULT = 26761
+    DSU_HOST = "127.0.0.1"
+    # Telefon eksenleri → DSU pitch/yaw/roll (yatay tutuş, üst kenar solda)
+    DSU_GYRO_MAP = ("-y", "z", "-x")
+    
+    # Yerel kontrol soketi (canlı ayar, istatistik) - None = kapalı
+    CONTROL_SOCKET = os.path.join(os.environ.get("XDG_RUNTIME_DIR") or "/tmp", "benim_control.sock")
+    CAPTURE_MAX_PACKETS = 200000
+    
     @classmethod
     def enable_debug(cls):
         """Tüm logları aç"""
@@ -92,6 +229,702 @@ class Config:
         cls.LOG_GYRO = True
         cls.LOG_BUTTONS = True
 
+# ═══════════════════════════════════════════════════════════════
+# STICK TEPKİ EĞRİSİ (LUT)
+# ═══════════════════════════════════════════════════════════════
+class StickCurve:
+    """
+    Radial/axial deadzone, anti-deadzone, dış doygunluk ve eğri.
+    Girdi signed 8-bit olduğu için tüm eğri 256×256 tabloya önceden
+    hesaplanır; frame başına eksen başına tek lookup kalır.
+    İndeks: (ham_x << 8) | ham_y  (işaretsiz byte)
+    Çıktı : -32767 ~ +32767 (uinput ABS aralığı)
+    """
+    AXIS_MAX = 32767
+    MODES = ("radial", "axial")
+    CURVES = ("linear", "power", "exp", "custom")
+
+    def __init__(self, mode="radial", deadzone=10, anti_deadzone=0, outer=127,
+                 curve="linear", exponent=2.0, points=None):
+        self.validate(mode, deadzone, anti_deadzone, outer, curve, exponent, points)
+        self.mode = mode
+        self.deadzone = deadzone
+        self.anti_deadzone = min(max(anti_deadzone, 0), 127) / 127
+        self.outer = outer
+        self.curve = curve
+        self.exponent = exponent
+        self.points = self._normalize_points(points) if points else None
+        self.table_x, self.table_y = self._build()
+
+    @classmethod
+    def validate(cls, mode="radial", deadzone=10, anti_deadzone=0, outer=127,
+                 curve="linear", exponent=2.0, points=None):
+        """Profil değerlerini tablo hesaplamadan denetle; geçersizse ValueError"""
+        if mode not in cls.MODES:
+            raise ValueError(f"Geçersiz stick modu: {mode}")
+        if curve not in cls.CURVES:
+            raise ValueError(f"Geçersiz eğri: {curve}")
+        if not 0 <= deadzone < outer <= 127:
+            raise ValueError(f"Geçersiz deadzone/outer: {deadzone}/{outer}")
+        if not -20 <= exponent <= 20:   # NaN da reddedilir; exp eğrisi taşmaz
+            raise ValueError(f"Geçersiz üs: {exponent}")
+        if curve == "custom" and not points:
+            raise ValueError("custom eğri için points gerekli")
+        for point in points or ():
+            if len(point) != 2 or not all(0 <= n <= 1 for n in point):
+                raise ValueError(f"Geçersiz eğri noktası: {':'.join(f'{n:g}' for n in point)}")
+
+    @staticmethod
+    def _normalize_points(points):
+        """(girdi, çıktı) 0-1 noktaları, uçlar (0,0)/(1,1) ile tamamlanır"""
+        pts = sorted((float(i), float(o)) for i, o in points)
+        if pts[0][0] > 0:
+            pts.insert(0, (0.0, 0.0))
+        if pts[-1][0] < 1:
+            pts.append((1.0, 1.0))
+        return pts
+
+    def _shape(self, t):
+        """0-1 aralığında eğri"""
+        if self.curve == "power":
+            return t ** self.exponent
+        if self.curve == "exp":
+            k = self.exponent
+            return (math.exp(k * t) - 1) / (math.exp(k) - 1) if k else t
+        if self.curve == "custom":
+            pts = self.points
+            for (x0, y0), (x1, y1) in zip(pts, pts[1:]):
+                if t <= x1:
+                    return y0 + (y1 - y0) * (t - x0) / (x1 - x0) if x1 > x0 else y1
+            return pts[-1][1]
+        return t
+
+    def _response(self, m):
+        """Ham büyüklük (0-127+) → 0-1 çıktı"""
+        if m <= self.deadzone:
+            return 0.0
+        t = 1.0 if m >= self.outer else (m - self.deadzone) / (self.outer - self.deadzone)
+        t = min(max(self._shape(t), 0.0), 1.0)
+        if t <= 0.0:
+            return 0.0
+        return self.anti_deadzone + (1.0 - self.anti_deadzone) * t
+
+    def _build(self):
+        scale = self.AXIS_MAX
+        raw = [max(b - 256 if b > 127 else b, -127) for b in range(256)]
+
+        if self.mode == "axial":
+            axis = []
+            for v in raw:
+                r = self._response(abs(v))
+                axis.append(int(round(math.copysign(r, v) * scale)))
+            table_x = array('i', [a for a in axis for _ in range(256)])
+            table_y = array('i', axis * 256)
+            return table_x, table_y
+
+        table_x = array('i', bytes(4 * 65536))
+        table_y = array('i', bytes(4 * 65536))
+        for bx, x in enumerate(raw):
+            base = bx << 8
+            for by, y in enumerate(raw):
+                m = math.hypot(x, y)
+                r = self._response(m)
+                if r:
+                    table_x[base | by] = int(round(max(-1.0, min(1.0, x / m * r)) * scale))
+                    table_y[base | by] = int(round(max(-1.0, min(1.0, y / m * r)) * scale))
+        return table_x, table_y
+
+    def lookup(self, bx, by):
+        """Ham byte çifti → (x, y) ölçekli çıktı"""
+        idx = (bx << 8) | by
+        return self.table_x[idx], self.table_y[idx]
+
+    def describe(self):
+        extra = f" e={self.exponent}" if self.curve in ("power", "exp") else ""
+        return (f"{self.mode} dz={self.deadzone} anti={round(self.anti_deadzone * 127)} "
+                f"outer={self.outer} {self.curve}{extra}")
+
+    @staticmethod
+    def parse_spec(spec):
+        """
+        CLI profil tanımı: "[left|right|both:]key=val,key=val"
+        Örnek: "right:curve=power,exponent=2.2,deadzone=8"
+               "curve=custom,points=0.3:0.1;0.7:0.5"
+        """
+        sides = ("left", "right")
+        head, sep, rest = spec.partition(":")
+        if sep and head in ("left", "right", "both"):
+            sides = ("left", "right") if head == "both" else (head,)
+            spec = rest
+
+        values = {}
+        for item in filter(None, spec.split(",")):
+            key, _, val = item.partition("=")
+            key = key.strip()
+            if key in ("mode", "curve"):
+                values[key] = val.strip()
+            elif key in ("deadzone", "anti_deadzone", "outer"):
+                values[key] = int(val)
+            elif key == "exponent":
+                values[key] = float(val)
+            elif key == "points":
+                values[key] = [tuple(float(n) for n in p.split(":")) for p in val.split(";") if p]
+            else:
+                raise ValueError(f"Bilinmeyen stick ayarı: {key}")
+        return sides, values
+
+# ═══════════════════════════════════════════════════════════════
+# POINTER İVMELENME
+# ═══════════════════════════════════════════════════════════════
+class PointerAccel:
+    """
+    Touchpad pointer balistiği. İstemci başına hız paket zamanlamasından
+    tahmin edilir (ham birim/ms); hız → kazanç eğrisi tabloya önceden
+    hesaplanır. Kesirli hareket istemci başına biriktirilir, küçük
+    hareketler kaybolmaz.
+    """
+    PROFILES = ("flat", "adaptive", "custom")
+    VEL_MAX = 16.0          # tablo üst sınırı (birim/ms)
+    VEL_STEPS = 64          # 1 birim/ms başına tablo adımı
+    IDLE_RESET = 0.1        # s, bu boşluktan sonra hız yeniden başlar
+    NOMINAL_DT_MS = 16.7    # ilk paket için varsayılan aralık (~60 Hz)
+    MIN_DT_MS = 2.0         # art arda gelen paketler için alt sınır
+    SMOOTHING = 0.5         # hız EMA katsayısı
+
+    def __init__(self, profile="flat", sensitivity=1.6, threshold=0.4, incline=1.1,
+                 max_gain=3.0, min_gain=0.3, points=None):
+        if profile not in self.PROFILES:
+            raise ValueError(f"Geçersiz pointer profili: {profile}")
+        if profile == "custom" and not points:
+            raise ValueError("custom profil için points gerekli")
+        self.profile = profile
+        self.sensitivity = sensitivity
+        self.threshold = threshold
+        self.incline = incline
+        self.max_gain = max_gain
+        self.min_gain = min_gain
+        self.points = sorted((float(v), float(g)) for v, g in points) if points else None
+        self.table = [sensitivity * self._factor(i / self.VEL_STEPS)
+                      for i in range(int(self.VEL_MAX * self.VEL_STEPS) + 1)]
+        self.clients = {}   # client → [son zaman, hız, kalan x, kalan y]
+
+    @staticmethod
+    def parse_points(spec):
+        """CLI "hız:kazanç;hız:kazanç" → [(hız, kazanç), ...]; geçersizse ValueError"""
+        points = []
+        for item in filter(None, spec.split(";")):
+            try:
+                point = tuple(float(n) for n in item.split(":"))
+            except ValueError:
+                point = ()
+            if len(point) != 2 or not all(0 <= n < math.inf for n in point):
+                raise ValueError(f"geçersiz nokta {item}")
+            points.append(point)
+        return points
+
+    def _factor(self, v):
+        """Hız (birim/ms) → kazanç çarpanı"""
+        if self.profile == "adaptive":
+            # libinput benzeri: yavaşta hassas, eşikten sonra doğrusal artış
+            if v < self.threshold:
+                return self.min_gain + (1.0 - self.min_gain) * v / self.threshold
+            return min(self.max_gain, 1.0 + (v - self.threshold) * self.incline)
+        if self.profile == "custom":
+            pts = self.points
+            if v <= pts[0][0]:
+                return pts[0][1]
+            for (v0, g0), (v1, g1) in zip(pts, pts[1:]):
+                if v <= v1:
+                    return g0 + (g1 - g0) * (v - v0) / (v1 - v0) if v1 > v0 else g1
+            return pts[-1][1]
+        return 1.0
+
+    def apply(self, client, dx, dy, now):
+        """Ham delta → ivmelenmiş tamsayı delta"""
+        st = self.clients.get(client)
+        if st is None:
+            st = self.clients[client] = [now, 0.0, 0.0, 0.0]
+            dt = self.IDLE_RESET + 1
+        else:
+            dt = now - st[0]
+            st[0] = now
+
+        dist = math.hypot(dx, dy)
+        if dt > self.IDLE_RESET:
+            v = dist / self.NOMINAL_DT_MS
+        else:
+            v_inst = dist / max(dt * 1000.0, self.MIN_DT_MS)
+            v = st[1] + (v_inst - st[1]) * self.SMOOTHING
+        st[1] = v
+
+        i = int(v * self.VEL_STEPS)
+        table = self.table
+        gain = table[i] if i < len(table) else table[-1]
+
+        fx = dx * gain + st[2]
+        fy = dy * gain + st[3]
+        ox, oy = int(fx), int(fy)
+        st[2] = fx - ox
+        st[3] = fy - oy
+        return ox, oy
+
+    def forget(self, client):
+        self.clients.pop(client, None)
+
+    def describe(self):
+        if self.profile == "adaptive":
+            return (f"adaptive (eşik={self.threshold} eğim={self.incline} "
+                    f"max={self.max_gain}x, sens={self.sensitivity})")
+        return f"{self.profile} (sens={self.sensitivity})"
+
+# ═══════════════════════════════════════════════════════════════
+# KABUL KONTROLÜ (FLOOD KORUMASI)
+# ═══════════════════════════════════════════════════════════════
+class AdmissionControl:
+    """
+    Routing öncesi ucuz kaynak başına kabul kontrolü.
+    - İstemci + paket tipi başına token bucket
+    - İzlenen istemci tablosu MAX_CLIENTS ile sınırlı, en eski (LRU) çıkarılır;
+      çıkarma sadece kovayı siler (tutulan girdi son tarih/zaman aşımına kalır,
+      sahte kaynak seli gerçek telefonun girdisini bırakamaz)
+    - Allowlist veya eşleştirme (pairing) penceresi
+    Reddedilen paket handler'a hiç ulaşmaz, sadece sayaç artar.
+    """
+    
+    def __init__(self, rates, default_rate=(50, 20), max_clients=64,
+                 allowlist=None, pairing_window=0):
+        self.rates = dict(rates)
+        self.default_rate = default_rate
+        self.max_clients = max(1, max_clients)
+        self.allowlist = set(allowlist) if allowlist else None
+        self.pairing = pairing_window > 0
+        self.pairing_until = time.monotonic() + pairing_window
+        self.paired = set()
+        self.clients = OrderedDict()    # ip → {paket tipi: [token, son zaman]}
+        self.stats = {'admitted': 0, 'rate_limited': 0, 'not_allowed': 0, 'evicted': 0}
+    
+    def admit(self, ip, ptype, now):
+        """Paket kabul edilirse True"""
+        clients = self.clients
+        buckets = clients.get(ip)
+        
+        if buckets is None:
+            if not self._is_allowed(ip, ptype, now):
+                self.stats['not_allowed'] += 1
+                return False
+            if len(clients) >= self.max_clients:
+                clients.popitem(last=False)
+                self.stats['evicted'] += 1
+            buckets = clients[ip] = {}
+        else:
+            clients.move_to_end(ip)
+        
+        bucket = buckets.get(ptype)
+        rate, burst = self.rates.get(ptype, self.default_rate)
+        if bucket is None:
+            bucket = buckets[ptype] = [burst, now]
+        
+        tokens = bucket[0] + (now - bucket[1]) * rate
+        if tokens > burst:
+            tokens = burst
+        bucket[1] = now
+        if tokens < 1.0:
+            bucket[0] = tokens
+            self.stats['rate_limited'] += 1
+            return False
+        
+        bucket[0] = tokens - 1.0
+        self.stats['admitted'] += 1
+        return True
+    
+    def _is_allowed(self, ip, ptype, now):
+        """Yeni kaynak: allowlist / eşleştirme kontrolü"""
+        if ip in self.paired:
+            return True
+        if self.allowlist is None and not self.pairing:
+            return True
+        if self.allowlist is not None and ip in self.allowlist:
+            return True
+        # Eşleştirme penceresi açıkken DISCOVER gönderen istemci eşlenir
+        if self.pairing and ptype == 0x44 and now < self.pairing_until:
+            self.paired.add(ip)
+            return True
+        return False
+    
+    def forget(self, ip):
+        self.clients.pop(ip, None)
+    
+    def describe(self):
+        mode = "açık"
+        if self.allowlist is not None:
+            mode = f"allowlist ({len(self.allowlist)} IP)"
+        if self.pairing:
+            mode += ", eşleştirme penceresi"
+        return f"{mode}, max {self.max_clients} istemci"
+
+# ═══════════════════════════════════════════════════════════════
+# PAKET KİMLİK DOĞRULAMA
+# ═══════════════════════════════════════════════════════════════
+class _AuthSession:
+    """Bir istemcinin anahtarı: önceden hesaplanmış HMAC iç/dış durumları + tekrar penceresi"""
+    __slots__ = ("inner", "outer", "top", "window", "code")
+    
+    def __init__(self, key):
+        block = key.ljust(64, b"\0")
+        self.inner = hashlib.sha256(bytes(b ^ 0x36 for b in block))
+        self.outer = hashlib.sha256(bytes(b ^ 0x5C for b in block))
+        self.top = 0            # görülen en büyük sayaç
+        self.window = 1         # bit i: top - i görüldü (sayaç 0 hiç geçerli değil)
+        self.code = int.from_bytes(hashlib.sha256(key + b"kod").digest()[:4], "big") % 1000000
+    
+    def tag(self, body):
+        inner = self.inner.copy()
+        inner.update(body)
+        outer = self.outer.copy()
+        outer.update(inner.digest())
+        return outer.digest()[:PacketAuth.TAG_SIZE]
+    
+    def accept(self, counter):
+        """Kayan 64'lük pencere: yeniden sıralanan paket geçer, tekrar eden geçmez"""
+        ahead = counter - self.top
+        if ahead > 0:
+            self.window = ((self.window << ahead) | 1) & 0xFFFFFFFFFFFFFFFF if ahead < 64 else 1
+            self.top = counter
+            return True
+        bit = 1 << -ahead
+        if -ahead >= 64 or self.window & bit:
+            return False
+        self.window |= bit
+        return True
+
+class PacketAuth:
+    """
+    İstemci başına anahtarlı paket doğrulama (routing ve kabul kontrolünden önce).
+    Eşleştirme: telefon "DISCOVER_JOYSTICK_SERVER PAIR <A hex>" gönderir, sunucu
+    "I_AM_SERVER PAIR <B hex>" yanıtlar (RFC 3526 grup 14, 2048 bit DH). Anahtar
+    SHA-256(gizli || A || B); iki taraf da 6 haneli doğrulama kodu gösterir.
+    Paket: [yük][sayaç u32 LE][HMAC-SHA256(anahtar, yük+sayaç) ilk 8 byte].
+    HMAC anahtar bloğu oturumda önceden işlenir (paket başına iki sıkıştırma).
+    Her yeni eşleştirme önce bekleyen anahtar olur (ayrı, sınırlı tablo) ve
+    o anahtarla doğrulanan ilk pakette oturuma geçer: sahte DISCOVER mevcut
+    oturumu düşüremez, doğrulanmamış eşleştirmeler doğrulanmış oturumları
+    tablodan itemez. DH üs alma döngüde çalıştığı için eşleştirme tüm
+    istemciler için ortak bir token bucket ile sınırlıdır.
+    """
+    TAG_SIZE = 8
+    TRAILER = 4 + TAG_SIZE
+    MODES = ("off", "optional", "required")
+    PRIME = int(
+        "FFFFFFFFFFFFFFFFC90FDAA22168C234C4C6628B80DC1CD129024E088A67CC74"
+        "020BBEA63B139B22514A08798E3404DDEF9519B3CD3A431B302B0A6DF25F1437"
+        "4FE1356D6D51C245E485B576625E7EC6F44C42E9A637ED6B0BFF5CB6F406B7ED"
+        "EE386BFB5A899FA5AE9F24117C4B1FE649286651ECE45B3DC2007CB8A163BF05"
+        "98DA48361C55D39A69163FA8FD24CF5F83655D23DCA3AD961C62F356208552BB"
+        "9ED529077096966D670C354E4ABC9804F1746C08CA18217C32905E462E36CE3B"
+        "E39E772C180E86039B2783A2EC07A28FB5C55DF06F4C52C9DE2BCBF695581718"
+        "3995497CEA956AE515D2261898FA051015728E5A8AACAA68FFFFFFFFFFFFFFFF", 16)
+    GENERATOR = 2
+    PUBLIC_SIZE = 256
+    
+    def __init__(self, mode="optional", max_clients=64, pair_rate=(2, 4), max_pending=16):
+        if mode not in self.MODES:
+            raise ValueError(f"Geçersiz doğrulama modu: {mode}")
+        self.mode = mode
+        self.max_clients = max(1, max_clients)
+        self.max_pending = max(1, max_pending)
+        self.pair_rate = pair_rate
+        self.pair_bucket = [pair_rate[1], 0.0]  # [token, son zaman]
+        self.sessions = OrderedDict()   # ip → _AuthSession (doğrulanma sırasına göre)
+        self.pending = OrderedDict()    # ip → henüz doğrulanmış paketi gelmemiş oturum
+        self.stats = {'authenticated': 0, 'auth_fail': 0, 'auth_missing': 0, 'replayed': 0,
+                      'paired': 0, 'pair_limited': 0}
+    
+    # ─── Eşleştirme ─────────────────────────────────────────────
+    
+    def pair(self, ip, peer_hex, now):
+        """
+        İstemci açık anahtarı → (sunucu açık anahtarı hex, doğrulama kodu);
+        hız sınırına takılırsa None, geçersiz anahtarda ValueError
+        """
+        peer_bytes = bytes.fromhex(peer_hex)
+        peer = int.from_bytes(peer_bytes, "big")
+        if len(peer_bytes) != self.PUBLIC_SIZE or not 1 < peer < self.PRIME - 1:
+            raise ValueError("geçersiz açık anahtar")
+        rate, burst = self.pair_rate
+        bucket = self.pair_bucket
+        tokens = min(burst, bucket[0] + (now - bucket[1]) * rate)
+        bucket[1] = now
+        if tokens < 1.0:
+            bucket[0] = tokens
+            self.stats['pair_limited'] += 1
+            return None
+        bucket[0] = tokens - 1.0
+        secret = int.from_bytes(os.urandom(32), "big")
+        public = pow(self.GENERATOR, secret, self.PRIME).to_bytes(self.PUBLIC_SIZE, "big")
+        shared = pow(peer, secret, self.PRIME).to_bytes(self.PUBLIC_SIZE, "big")
+        session = _AuthSession(hashlib.sha256(shared + peer_bytes + public).digest())
+        
+        # Doğrulanmış oturumlara dokunulmaz; taşan bekleyen tablo kendi en eskisini atar
+        pending = self.pending
+        pending.pop(ip, None)
+        if len(pending) >= self.max_pending:
+            pending.popitem(last=False)
+        pending[ip] = session
+        self.stats['paired'] += 1
+        return public.hex(), session.code
+    
+    def _install(self, ip, session):
+        """Doğrulanmış ilk paketle bekleyen oturumu etkinleştir"""
+        self.pending.pop(ip, None)
+        self.sessions.pop(ip, None)
+        if len(self.sessions) >= self.max_clients:
+            self.sessions.popitem(last=False)
+        self.sessions[ip] = session
+    
+    def revoke(self, ip):
+        self.pending.pop(ip, None)
+        return self.sessions.pop(ip, None) is not None
+    
+    # ─── Doğrulama ──────────────────────────────────────────────
+    
+    def verify(self, batch):
+        """
+        Tek uyanmada okunan [(veri, adres), ...] → doğrulanmış, eki çıkarılmış liste.
+        Toplu çağrı: arama/bağlama döngü başına bir kez, paket başına sadece
+        bir sözlük araması + iki hash kopyası.
+        """
+        sessions = self.sessions
+        required = self.mode == "required"
+        if not sessions and not self.pending and not required:
+            return batch
+        out = []
+        append = out.append
+        compare = hmac.compare_digest
+        trailer = self.TRAILER
+        size = self.TAG_SIZE
+        stats = self.stats
+        ok = 0
+        for data, addr in batch:
+            session = sessions.get(addr[0])
+            if session is None:
+                pending = self.pending.get(addr[0])
+                n = len(data) - trailer
+                if pending is not None and n >= 1 and compare(pending.tag(data[:n + 4]), data[n + 4:]):
+                    # Yeni eşleştirmenin ilk doğrulanmış paketi: oturuma geçir
+                    self._install(addr[0], pending)
+                    session = pending
+                elif not required or data.startswith(b"DISCOVER"):
+                    # Eşleşmemiş kaynak: sadece DISCOVER (eşleştirme) ya da optional modda her şey
+                    append((data, addr))
+                    continue
+                else:
+                    stats['auth_missing'] += 1
+                    continue
+            
+            n = len(data) - trailer
+            if n < 1:
+                if data.startswith(b"DISCOVER"):
+                    append((data, addr))
+                else:
+                    stats['auth_missing'] += 1
+                continue
+            body = data[:n + 4]
+            tag = data[n + 4:]
+            # session.tag() satır içi: paket başına bir metod çağrısı az
+            inner = session.inner.copy()
+            inner.update(body)
+            outer = session.outer.copy()
+            outer.update(inner.digest())
+            if not compare(outer.digest()[:size], tag):
+                pending = self.pending.get(addr[0])
+                if pending is None or not compare(pending.tag(body), tag):
+                    if data.startswith(b"DISCOVER"):
+                        append((data, addr))    # yeniden eşleştirme etiketsiz gelir
+                    else:
+                        stats['auth_fail'] += 1
+                    continue
+                self._install(addr[0], pending)
+                session = pending
+            counter = int.from_bytes(body[n:], "little")
+            if 0 < counter - session.top < 64:
+                # Sıralı gelen paket (olağan durum): pencereyi kaydır
+                session.window = ((session.window << (counter - session.top)) | 1) & 0xFFFFFFFFFFFFFFFF
+                session.top = counter
+            elif not session.accept(counter):
+                stats['replayed'] += 1
+                continue
+            ok += 1
+            append((data[:n], addr))
+        stats['authenticated'] += ok
+        return out
+    
+    def describe(self):
+        return f"{self.mode} (HMAC-SHA256/{self.TAG_SIZE * 8} bit, DH-2048 eşleştirme)"
+
+# ═══════════════════════════════════════════════════════════════
+# MUTLAK DOKUNMA
+# ═══════════════════════════════════════════════════════════════
+class TouchTranslator:
+    """
+    Temas listesi → evdev olayları. uinput tabanlı backend'ler ortak kullanır.
+      pointer    : ilk temas mutlak imleci taşır (QEMU tablet gibi ABS_X/Y),
+                   durum bit1 sol tıklamayı basılı tutar
+      touchscreen: MT protocol B, INPUT_PROP_DIRECT; jestleri masaüstü tanır
+    Temas: (id, durum, x, y) — durum bit0 = dokunuyor, bit1 = tıklama.
+    Koordinatlar 0-65535 (ekran genişliği/yüksekliği).
+    """
+    MODES = ("pointer", "touchscreen")
+    MAX_SLOTS = 10
+    TOUCHING, PRESSED = 0x01, 0x02
+    
+    EV_KEY, EV_ABS = 0x01, 0x03
+    ABS_X, ABS_Y = 0x00, 0x01
+    ABS_MT_SLOT, ABS_MT_POSITION_X, ABS_MT_POSITION_Y, ABS_MT_TRACKING_ID = 0x2f, 0x35, 0x36, 0x39
+    BTN_LEFT, BTN_RIGHT, BTN_MIDDLE = 0x110, 0x111, 0x112
+    BTN_TOUCH = 0x14a
+    BTN_TOOL_FINGER, BTN_TOOL_DOUBLETAP, BTN_TOOL_TRIPLETAP, BTN_TOOL_QUADTAP = 0x145, 0x14d, 0x14e, 0x14f
+    INPUT_PROP_DIRECT = 0x01
+    
+    def __init__(self, mode="pointer"):
+        if mode not in self.MODES:
+            raise ValueError(f"Geçersiz dokunma modu: {mode}")
+        self.mode = mode
+        self.slots = {}         # temas id → (slot, tracking id)
+        self.next_tracking = 0
+        self.touching = 0
+        self.last_xy = None
+        self.pressed = False
+    
+    def capabilities(self):
+        """(tuşlar, eksenler {kod: (min, max, fuzz, flat)}, özellikler)"""
+        full = (0, 65535, 0, 0)
+        if self.mode == "pointer":
+            return ([self.BTN_LEFT, self.BTN_RIGHT, self.BTN_MIDDLE],
+                    {self.ABS_X: full, self.ABS_Y: full}, [])
+        return ([self.BTN_TOUCH, self.BTN_TOOL_FINGER, self.BTN_TOOL_DOUBLETAP,
+                 self.BTN_TOOL_TRIPLETAP, self.BTN_TOOL_QUADTAP],
+                {self.ABS_X: full, self.ABS_Y: full,
+                 self.ABS_MT_SLOT: (0, self.MAX_SLOTS - 1, 0, 0),
+                 self.ABS_MT_TRACKING_ID: (0, 65535, 0, 0),
+                 self.ABS_MT_POSITION_X: full, self.ABS_MT_POSITION_Y: full},
+                [self.INPUT_PROP_DIRECT])
+    
+    def frame(self, contacts):
+        """[(id, durum, x, y), ...] → [(tip, kod, değer), ...] (SYN hariç)"""
+        events = []
+        if self.mode == "pointer":
+            pressed = False
+            for _, state, x, y in contacts:
+                if state & self.TOUCHING:
+                    if (x, y) != self.last_xy:
+                        self.last_xy = (x, y)
+                        events += [(self.EV_ABS, self.ABS_X, x), (self.EV_ABS, self.ABS_Y, y)]
+                    pressed = bool(state & self.PRESSED)
+                    break
+            if pressed != self.pressed:
+                self.pressed = pressed
+                events.append((self.EV_KEY, self.BTN_LEFT, int(pressed)))
+            return events
+        
+        first = None
+        for cid, state, x, y in contacts:
+            entry = self.slots.get(cid)
+            if state & self.TOUCHING:
+                if entry is None:
+                    used = {slot for slot, _ in self.slots.values()}
+                    free = next((i for i in range(self.MAX_SLOTS) if i not in used), None)
+                    if free is None:
+                        continue
+                    entry = self.slots[cid] = (free, self.next_tracking)
+                    self.next_tracking = (self.next_tracking + 1) & 0xFFFF
+                    events += [(self.EV_ABS, self.ABS_MT_SLOT, entry[0]),
+                               (self.EV_ABS, self.ABS_MT_TRACKING_ID, entry[1])]
+                else:
+                    events.append((self.EV_ABS, self.ABS_MT_SLOT, entry[0]))
+                events += [(self.EV_ABS, self.ABS_MT_POSITION_X, x),
+                           (self.EV_ABS, self.ABS_MT_POSITION_Y, y)]
+                if first is None:
+                    first = (x, y)
+            elif entry is not None:
+                del self.slots[cid]
+                events += [(self.EV_ABS, self.ABS_MT_SLOT, entry[0]),
+                           (self.EV_ABS, self.ABS_MT_TRACKING_ID, -1)]
+        
+        # Tek dokunma emülasyonu
+        count = len(self.slots)
+        if (count > 0) != (self.touching > 0):
+            events.append((self.EV_KEY, self.BTN_TOUCH, 1 if count else 0))
+        if count != self.touching:
+            tools = (self.BTN_TOOL_FINGER, self.BTN_TOOL_DOUBLETAP,
+                     self.BTN_TOOL_TRIPLETAP, self.BTN_TOOL_QUADTAP)
+            for n, tool in enumerate(tools, 1):
+                was = self.touching == n or (n == 4 and self.touching > 4)
+                now = count == n or (n == 4 and count > 4)
+                if was != now:
+                    events.append((self.EV_KEY, tool, 1 if now else 0))
+            self.touching = count
+        if first:
+            events += [(self.EV_ABS, self.ABS_X, first[0]), (self.EV_ABS, self.ABS_Y, first[1])]
+        return events
+
+# ═══════════════════════════════════════════════════════════════
+# KLAVYE TUŞLARI
+# ═══════════════════════════════════════════════════════════════
+def _keyboard_table():
+    """ad → (Linux KEY_* kodu, X keysym, pynput adı/karakteri)"""
+    keys = {}
+    for i, ch in enumerate("1234567890"):
+        keys[ch] = (2 + i, ch, ch)
+    for row, base in (("qwertyuiop", 16), ("asdfghjkl", 30), ("zxcvbnm", 44)):
+        for i, ch in enumerate(row):
+            keys[ch] = (base + i, ch, ch)
+    for i in range(10):
+        keys[f"f{i + 1}"] = (59 + i, f"F{i + 1}", f"f{i + 1}")
+    keys["f11"] = (87, "F11", "f11")
+    keys["f12"] = (88, "F12", "f12")
+    keys.update({
+        "esc": (1, "Escape", "esc"), "minus": (12, "minus", "-"), "equal": (13, "equal", "="),
+        "backspace": (14, "BackSpace", "backspace"), "tab": (15, "Tab", "tab"),
+        "leftbrace": (26, "bracketleft", "["), "rightbrace": (27, "bracketright", "]"),
+        "enter": (28, "Return", "enter"), "ctrl": (29, "Control_L", "ctrl_l"),
+        "semicolon": (39, "semicolon", ";"), "apostrophe": (40, "apostrophe", "'"),
+        "grave": (41, "grave", "`"), "shift": (42, "Shift_L", "shift_l"),
+        "backslash": (43, "backslash", "\\"), "comma": (51, "comma", ","), "dot": (52, "period", "."),
+        "slash": (53, "slash", "/"), "rightshift": (54, "Shift_R", "shift_r"),
+        "alt": (56, "Alt_L", "alt_l"), "space": (57, "space", "space"),
+        "capslock": (58, "Caps_Lock", "caps_lock"), "rightctrl": (97, "Control_R", "ctrl_r"),
+        "rightalt": (100, "Alt_R", "alt_r"), "home": (102, "Home", "home"), "up": (103, "Up", "up"),
+        "pageup": (104, "Prior", "page_up"), "left": (105, "Left", "left"),
+        "right": (106, "Right", "right"), "end": (107, "End", "end"), "down": (108, "Down", "down"),
+        "pagedown": (109, "Next", "page_down"), "insert": (110, "Insert", "insert"),
+        "delete": (111, "Delete", "delete"), "mute": (113, "XF86AudioMute", "media_volume_mute"),
+        "volumedown": (114, "XF86AudioLowerVolume", "media_volume_down"),
+        "volumeup": (115, "XF86AudioRaiseVolume", "media_volume_up"), "pause": (119, "Pause", "pause"),
+        "meta": (125, "Super_L", "cmd"), "nextsong": (163, "XF86AudioNext", "media_next"),
+        "playpause": (164, "XF86AudioPlay", "media_play_pause"),
+        "previoussong": (165, "XF86AudioPrev", "media_previous"),
+    })
+    aliases = {"control": "ctrl", "super": "meta", "win": "meta", "return": "enter", "escape": "esc",
+               "pgup": "pageup", "pgdn": "pagedown", "del": "delete", "ins": "insert", "altgr": "rightalt"}
+    for alias, name in aliases.items():
+        keys[alias] = keys[name]
+    return keys
+
+KEYBOARD_KEYS = _keyboard_table()
+KEY_BY_CODE = {code: (keysym, pynput_name) for code, keysym, pynput_name in KEYBOARD_KEYS.values()}
+
+def parse_keys(text):
+    """'ctrl+shift+s' / 'KEY_SPACE' → Linux tuş kodları (basılış sırasıyla)"""
+    codes = []
+    for part in text.split("+"):
+        name = part.strip().lower()
+        if name.startswith("key_"):
+            name = name[4:]
+        if name not in KEYBOARD_KEYS:
+            raise ValueError(f"bilinmeyen tuş: {part.strip()}")
+        codes.append(KEYBOARD_KEYS[name][0])
+    return tuple(codes)
+
 # ═══════════════════════════════════════════════════════════════
 # BACKEND BASE
 # ═══════════════════════════════════════════════════════════════
@@ -100,20 +933,47 @@ class InputBackend(ABC):
     method = "unknown"
     library = "none"
     
+    # Kaydırma yüksek çözünürlük biriminde gelir: 120 = bir çentik (REL_WHEEL_HI_RES)
+    WHEEL_HI_RES = 120
+    wheel_rest = (0, 0)
+    
     @abstractmethod
     def mouse_move(self, dx, dy): pass
     @abstractmethod
     def mouse_button(self, button, pressed): pass
     @abstractmethod
-    def mouse_scroll(self, delta): pass
+    def mouse_scroll(self, v, h=0): pass
+    
+    def _wheel_notches(self, v, h):
+        """Hi-res birimleri tam çentiğe çevir, artanı sonraki kaydırmaya sakla"""
+        rv, rh = self.wheel_rest
+        rv += v
+        rh += h
+        nv = int(rv / self.WHEEL_HI_RES)
+        nh = int(rh / self.WHEEL_HI_RES)
+        self.wheel_rest = (rv - nv * self.WHEEL_HI_RES, rh - nh * self.WHEEL_HI_RES)
+        return nv, nh
     
     def gamepad_buttons(self, buttons, prev): pass
+    # Stick değerleri StickCurve tablosundan gelir: -32767 ~ +32767
     def gamepad_left_stick(self, x, y): pass
     def gamepad_right_stick(self, x, y): pass
     def gamepad_triggers(self, l2, r2): pass
     def gamepad_gyro(self, rx, ry, rz): pass
+    def flush(self): pass       # Frame sonu (toplu yazan backend'ler için)
     def close(self): pass
     
+    # Force-feedback: okunabilir fd döndüren backend'ler olay döngüsüne eklenir.
+    # ff_read() → [(güçlü, zayıf, süre_ms), ...]; süre 0 = sonsuz, (0, 0, 0) = durdur
+    def ff_fileno(self): return None
+    def ff_read(self): return []
+    
+    # Mutlak dokunma: contacts = [(id, durum, x, y), ...], x/y 0-65535 (ekran)
+    def touch_frame(self, contacts): pass
+    
+    # Klavye: code = Linux KEY_* kodu (KEYBOARD_KEYS), olay hemen yazılır
+    def key(self, code, pressed): pass
+    
     def get_info(self):
         return {"name": self.name, "method": self.method, "library": self.library}
 
@@ -125,6 +985,9 @@ class EvdevBackend(InputBackend):
     method = "Kernel uinput (sanal cihaz)"
     library = "python-evdev"
     
+    # Eski python-evdev sürümlerinde ecodes'ta yok
+    REL_WHEEL_HI_RES, REL_HWHEEL_HI_RES = 0x0b, 0x0c
+    
     def __init__(self):
         import evdev
         from evdev import UInput, ecodes, AbsInfo
@@ -135,7 +998,8 @@ class EvdevBackend(InputBackend):
         
         # MOUSE
         mouse_cap = {
-            ecodes.EV_REL: [ecodes.REL_X, ecodes.REL_Y, ecodes.REL_WHEEL],
+            ecodes.EV_REL: [ecodes.REL_X, ecodes.REL_Y, ecodes.REL_WHEEL, ecodes.REL_HWHEEL,
+                            self.REL_WHEEL_HI_RES, self.REL_HWHEEL_HI_RES],
             ecodes.EV_KEY: [ecodes.BTN_LEFT, ecodes.BTN_RIGHT, ecodes.BTN_MIDDLE],
         }
         self.mouse = UInput(mouse_cap, name="Benim Virtual Mouse")
@@ -148,6 +1012,7 @@ class EvdevBackend(InputBackend):
                 ecodes.BTN_SELECT, ecodes.BTN_START, ecodes.BTN_MODE,
                 ecodes.BTN_THUMBL, ecodes.BTN_THUMBR,
             ],
+            ecodes.EV_FF: [ecodes.FF_RUMBLE] if Config.FF_ENABLED else [],
             ecodes.EV_ABS: [
                 # Sol joystick (ana hareket/steering) - standart
                 (ecodes.ABS_X, AbsInfo(0, -32767, 32767, 16, 128, 0)),
@@ -172,8 +1037,12 @@ class EvdevBackend(InputBackend):
             name="Benim Virtual Gamepad",
             vendor=0x045e,
             product=0x028e,
-            version=0x0110
+            version=0x0110,
+            max_effects=Config.FF_MAX_EFFECTS
         )
+        self.ff_effects = {}    # effect id → (güçlü, zayıf, süre_ms)
+        self.touch = None       # Mutlak dokunma cihazı (ilk pakette açılır)
+        self.keyboard = None    # Klavye cihazı (ilk tuşta açılır)
         
         # Mapping
         self.mouse_btns = {0: ecodes.BTN_LEFT, 1: ecodes.BTN_RIGHT, 2: ecodes.BTN_MIDDLE}
@@ -208,8 +1077,18 @@ class EvdevBackend(InputBackend):
         self.mouse.write(self.ecodes.EV_KEY, btn, 1 if pressed else 0)
         self.mouse.syn()
     
-    def mouse_scroll(self, delta):
-        self.mouse.write(self.ecodes.EV_REL, self.ecodes.REL_WHEEL, delta)
+    def mouse_scroll(self, v, h=0):
+        # Hi-res olaylar + eski uygulamalar için çentik sınırında REL_WHEEL
+        nv, nh = self._wheel_notches(v, h)
+        write, ec = self.mouse.write, self.ecodes
+        if v:
+            write(ec.EV_REL, self.REL_WHEEL_HI_RES, v)
+        if nv:
+            write(ec.EV_REL, ec.REL_WHEEL, nv)
+        if h:
+            write(ec.EV_REL, self.REL_HWHEEL_HI_RES, h)
+        if nh:
+            write(ec.EV_REL, ec.REL_HWHEEL, nh)
         self.mouse.syn()
     
     def gamepad_buttons(self, buttons, prev):
@@ -247,19 +1126,15 @@ class EvdevBackend(InputBackend):
             self.gamepad.syn()
     
     def gamepad_left_stick(self, x, y):
-        """Sol joystick → ABS_X/Y"""
-        scaled_x = x * 258  # -127~+127 → -32767~+32767
-        scaled_y = y * 258
-        self.gamepad.write(self.ecodes.EV_ABS, self.ecodes.ABS_X, scaled_x)
-        self.gamepad.write(self.ecodes.EV_ABS, self.ecodes.ABS_Y, scaled_y)
+        """Sol joystick → ABS_X/Y (StickCurve çıktısı, ölçekli)"""
+        self.gamepad.write(self.ecodes.EV_ABS, self.ecodes.ABS_X, x)
+        self.gamepad.write(self.ecodes.EV_ABS, self.ecodes.ABS_Y, y)
         self.gamepad.syn()
     
     def gamepad_right_stick(self, x, y):
-        """Sağ joystick → ABS_Z/RZ"""
-        scaled_x = x * 258  # -127~+127 → -32767~+32767
-        scaled_y = y * 258
-        self.gamepad.write(self.ecodes.EV_ABS, self.ecodes.ABS_Z, scaled_x)
-        self.gamepad.write(self.ecodes.EV_ABS, self.ecodes.ABS_RZ, scaled_y)
+        """Sağ joystick → ABS_Z/RZ (StickCurve çıktısı, ölçekli)"""
+        self.gamepad.write(self.ecodes.EV_ABS, self.ecodes.ABS_Z, x)
+        self.gamepad.write(self.ecodes.EV_ABS, self.ecodes.ABS_RZ, y)
         self.gamepad.syn()
     
     def gamepad_triggers(self, l2, r2):
@@ -277,13 +1152,418 @@ class EvdevBackend(InputBackend):
             if dx or dy:
                 self.mouse_move(dx, dy)
     
+    def touch_frame(self, contacts):
+        """Mutlak dokunma → tablet/touchscreen cihazı (ilk kullanımda açılır)"""
+        if self.touch is None:
+            from evdev import UInput, AbsInfo
+            self.touch_tr = TouchTranslator(Config.TOUCH_MODE)
+            keys, axes, props = self.touch_tr.capabilities()
+            self.touch = UInput(
+                {self.ecodes.EV_KEY: keys,
+                 self.ecodes.EV_ABS: [(code, AbsInfo(0, mn, mx, fuzz, flat, 0))
+                                      for code, (mn, mx, fuzz, flat) in axes.items()]},
+                name="Benim Virtual Tablet", input_props=props)
+        events = self.touch_tr.frame(contacts)
+        for etype, code, value in events:
+            self.touch.write(etype, code, value)
+        if events:
+            self.touch.syn()
+    
+    def key(self, code, pressed):
+        """Klavye tuşu → ayrı sanal klavye (ilk kullanımda açılır)"""
+        if self.keyboard is None:
+            from evdev import UInput
+            self.keyboard = UInput({self.ecodes.EV_KEY: sorted(KEY_BY_CODE)},
+                                   name="Benim Virtual Keyboard")
+        self.keyboard.write(self.ecodes.EV_KEY, code, 1 if pressed else 0)
+        self.keyboard.syn()
+    
+    def ff_fileno(self):
+        return self.gamepad.fd if Config.FF_ENABLED else None
+    
+    def ff_read(self):
+        """Upload/erase el sıkışmasını yap, play/stop olaylarını döndür"""
+        ecodes = self.ecodes
+        out = []
+        try:
+            events = list(self.gamepad.read())
+        except (BlockingIOError, OSError):
+            return out
+        for ev in events:
+            if ev.type == ecodes.EV_UINPUT:
+                if ev.code == ecodes.UI_FF_UPLOAD:
+                    upload = self.gamepad.begin_upload(ev.value)
+                    effect = upload.effect
+                    if effect.type == ecodes.FF_RUMBLE:
+                        rumble = effect.u.ff_rumble_effect
+                        self.ff_effects[effect.id] = (rumble.strong_magnitude, rumble.weak_magnitude,
+                                                      effect.ff_replay.length)
+                    upload.retval = 0
+                    self.gamepad.end_upload(upload)
+                elif ev.code == ecodes.UI_FF_ERASE:
+                    erase = self.gamepad.begin_erase(ev.value)
+                    self.ff_effects.pop(erase.effect_id, None)
+                    erase.retval = 0
+                    self.gamepad.end_erase(erase)
+            elif ev.type == ecodes.EV_FF and ev.code in self.ff_effects:
+                out.append(self.ff_effects[ev.code] if ev.value else (0, 0, 0))
+        return out
+    
     def close(self):
         try:
             self.mouse.close()
             self.gamepad.close()
+            if self.touch:
+                self.touch.close()
+            if self.keyboard:
+                self.keyboard.close()
         except Exception:
             pass
 
+# ═══════════════════════════════════════════════════════════════
+# UINPUT BACKEND (ham ioctl, python-evdev'siz)
+# ═══════════════════════════════════════════════════════════════
+class UinputBackend(InputBackend):
+    """
+    /dev/uinput'a doğrudan yazar. Cihazlar ioctl ile bir kez kurulur;
+    bir frame'in tüm input_event'leri önceden ayrılmış buffer'a paketlenip
+    flush() ile tek write() çağrısında gönderilir.
+    Değişmeyen ABS değerleri hiç yazılmaz.
+    """
+    name = "uinput"
+    method = "Kernel uinput (ham ioctl, frame başına tek write)"
+    library = "yok (fcntl)"
+    
+    # linux/input-event-codes.h
+    EV_SYN, EV_KEY, EV_REL, EV_ABS = 0x00, 0x01, 0x02, 0x03
+    SYN_REPORT = 0
+    REL_X, REL_Y, REL_HWHEEL, REL_WHEEL = 0x00, 0x01, 0x06, 0x08
+    REL_WHEEL_HI_RES, REL_HWHEEL_HI_RES = 0x0b, 0x0c
+    BTN_LEFT, BTN_RIGHT, BTN_MIDDLE = 0x110, 0x111, 0x112
+    BTN_A, BTN_B, BTN_X, BTN_Y = 0x130, 0x131, 0x133, 0x134
+    BTN_TL, BTN_TR, BTN_TL2, BTN_TR2 = 0x136, 0x137, 0x138, 0x139
+    BTN_SELECT, BTN_START, BTN_MODE = 0x13a, 0x13b, 0x13c
+    BTN_THUMBL, BTN_THUMBR = 0x13d, 0x13e
+    ABS_X, ABS_Y, ABS_Z, ABS_RZ = 0x00, 0x01, 0x02, 0x05
+    ABS_GAS, ABS_BRAKE = 0x09, 0x0a
+    ABS_HAT0X, ABS_HAT0Y = 0x10, 0x11
+    ABS_CNT = 0x40
+    BUS_USB = 0x03
+    EV_FF, FF_RUMBLE = 0x15, 0x50
+    EV_UINPUT, UI_FF_UPLOAD, UI_FF_ERASE = 0x0101, 1, 2
+    
+    # linux/uinput.h ioctl'leri
+    UI_DEV_CREATE = 0x5501
+    UI_DEV_DESTROY = 0x5502
+    UI_DEV_SETUP = 0x405c5503       # _IOW('U', 3, struct uinput_setup)
+    UI_ABS_SETUP = 0x401c5504       # _IOW('U', 4, struct uinput_abs_setup)
+    UI_SET_EVBIT = 0x40045564
+    UI_SET_KEYBIT = 0x40045565
+    UI_SET_RELBIT = 0x40045566
+    UI_SET_ABSBIT = 0x40045567
+    UI_SET_FFBIT = 0x4004556b
+    UI_SET_PROPBIT = 0x4004556e
+    
+    # struct ff_effect: union içinde pointer var, boyut mimariye bağlı
+    FF_EFFECT_SIZE = 48 if struct.calcsize('P') == 8 else 44
+    FF_UPLOAD_SIZE = 8 + 2 * FF_EFFECT_SIZE     # struct uinput_ff_upload
+    FF_ERASE_SIZE = 12                          # struct uinput_ff_erase
+    UI_BEGIN_FF_UPLOAD = (3 << 30) | (FF_UPLOAD_SIZE << 16) | (0x55 << 8) | 200
+    UI_END_FF_UPLOAD = (1 << 30) | (FF_UPLOAD_SIZE << 16) | (0x55 << 8) | 201
+    UI_BEGIN_FF_ERASE = (3 << 30) | (FF_ERASE_SIZE << 16) | (0x55 << 8) | 202
+    UI_END_FF_ERASE = (1 << 30) | (FF_ERASE_SIZE << 16) | (0x55 << 8) | 203
+    
+    EVENT = struct.Struct('llHHi')  # struct input_event (timeval + type/code/value)
+    MAX_EVENTS = 64
+    
+    def __init__(self):
+        import fcntl
+        self.fcntl = fcntl
+        
+        if not os.path.exists("/dev/uinput"):
+            raise FileNotFoundError("/dev/uinput bulunamadı")
+        
+        self.mouse_fd = self._create_device(
+            "Benim Virtual Mouse", 0x0001, 0x0001, 0x0001,
+            keys=[self.BTN_LEFT, self.BTN_RIGHT, self.BTN_MIDDLE],
+            rels=[self.REL_X, self.REL_Y, self.REL_WHEEL, self.REL_HWHEEL,
+                  self.REL_WHEEL_HI_RES, self.REL_HWHEEL_HI_RES],
+        )
+        stick = (-32767, 32767, 16, 128)
+        self.gamepad_fd = self._create_device(
+            "Benim Virtual Gamepad", 0x045e, 0x028e, 0x0110,
+            keys=[
+                self.BTN_A, self.BTN_B, self.BTN_X, self.BTN_Y,
+                self.BTN_TL, self.BTN_TR, self.BTN_TL2, self.BTN_TR2,
+                self.BTN_SELECT, self.BTN_START, self.BTN_MODE,
+                self.BTN_THUMBL, self.BTN_THUMBR,
+            ],
+            axes={
+                self.ABS_X: stick, self.ABS_Y: stick,
+                self.ABS_Z: stick, self.ABS_RZ: stick,
+                self.ABS_BRAKE: (0, 255, 0, 0), self.ABS_GAS: (0, 255, 0, 0),
+                self.ABS_HAT0X: (-1, 1, 0, 0), self.ABS_HAT0Y: (-1, 1, 0, 0),
+            },
+            ff=[self.FF_RUMBLE] if Config.FF_ENABLED else (),
+        )
+        self.ff_effects = {}    # effect id → (güçlü, zayıf, süre_ms)
+        self.ff_buf = bytearray(self.EVENT.size * 16)
+        
+        # Frame buffer'ları (önceden ayrılmış)
+        size = self.EVENT.size
+        self.gp_buf = bytearray(size * self.MAX_EVENTS)
+        self.gp_view = memoryview(self.gp_buf)
+        self.gp_off = 0
+        self.mouse_buf = bytearray(size * 5)
+        self.touch_fd = None    # Mutlak dokunma cihazı (ilk pakette açılır)
+        self.touch_buf = bytearray(size * self.MAX_EVENTS)
+        self.kbd_fd = None      # Klavye cihazı (ilk tuşta açılır)
+        self.kbd_buf = bytearray(size * 2)
+        self.abs_last = [0] * self.ABS_CNT
+        
+        self.mouse_btns = {0: self.BTN_LEFT, 1: self.BTN_RIGHT, 2: self.BTN_MIDDLE}
+        self.gpad_btns = [
+            (0x00000001, self.BTN_A), (0x00000002, self.BTN_B),
+            (0x00000004, self.BTN_X), (0x00000008, self.BTN_Y),
+            (0x00000010, self.BTN_TL), (0x00000020, self.BTN_TR),
+            (0x00000040, self.BTN_TL2), (0x00000080, self.BTN_TR2),
+            (0x00000100, self.BTN_SELECT), (0x00000200, self.BTN_START),
+            (0x00000400, self.BTN_MODE), (0x00000800, self.BTN_THUMBL),
+            (0x00001000, self.BTN_THUMBR),
+        ]
+        self.DPAD_UP = 0x00002000
+        self.DPAD_DOWN = 0x00004000
+        self.DPAD_LEFT = 0x00008000
+        self.DPAD_RIGHT = 0x00010000
+        self.DPAD_MASK = 0x0001E000
+    
+    def _create_device(self, name, vendor, product, version, keys=(), rels=(), axes=None, ff=(), props=()):
+        """uinput cihazını ioctl'lerle kur"""
+        ioctl = self.fcntl.ioctl
+        # FF olayları aynı fd'den okunur
+        fd = os.open("/dev/uinput", (os.O_RDWR if ff else os.O_WRONLY) | os.O_NONBLOCK)
+        ff_max = Config.FF_MAX_EFFECTS if ff else 0
+        try:
+            if keys:
+                ioctl(fd, self.UI_SET_EVBIT, self.EV_KEY)
+                for code in keys:
+                    ioctl(fd, self.UI_SET_KEYBIT, code)
+            if rels:
+                ioctl(fd, self.UI_SET_EVBIT, self.EV_REL)
+                for code in rels:
+                    ioctl(fd, self.UI_SET_RELBIT, code)
+            if axes:
+                ioctl(fd, self.UI_SET_EVBIT, self.EV_ABS)
+                for code in axes:
+                    ioctl(fd, self.UI_SET_ABSBIT, code)
+            if ff:
+                ioctl(fd, self.UI_SET_EVBIT, self.EV_FF)
+                for code in ff:
+                    ioctl(fd, self.UI_SET_FFBIT, code)
+            for prop in props:
+                ioctl(fd, self.UI_SET_PROPBIT, prop)
+            
+            name_b = name.encode()[:79]
+            try:
+                # Modern arayüz (Linux 4.5+)
+                ioctl(fd, self.UI_DEV_SETUP,
+                      struct.pack('HHHH80sI', self.BUS_USB, vendor, product, version, name_b, ff_max))
+                for code, (mn, mx, fuzz, flat) in (axes or {}).items():
+                    ioctl(fd, self.UI_ABS_SETUP,
+                          struct.pack('Hxxiiiiii', code, 0, mn, mx, fuzz, flat, 0))
+            except OSError:
+                # Eski arayüz: struct uinput_user_dev yaz
+                absmax, absmin = [0] * self.ABS_CNT, [0] * self.ABS_CNT
+                absfuzz, absflat = [0] * self.ABS_CNT, [0] * self.ABS_CNT
+                for code, (mn, mx, fuzz, flat) in (axes or {}).items():
+                    absmin[code], absmax[code] = mn, mx
+                    absfuzz[code], absflat[code] = fuzz, flat
+                os.write(fd, struct.pack(
+                    f'80sHHHHI{self.ABS_CNT * 4}i', name_b, self.BUS_USB, vendor, product, version, ff_max,
+                    *absmax, *absmin, *absfuzz, *absflat))
+            
+            ioctl(fd, self.UI_DEV_CREATE)
+        except Exception:
+            os.close(fd)
+            raise
+        return fd
+    
+    # ─── Frame buffer ───────────────────────────────────────────
+    
+    def _emit(self, etype, code, value):
+        """Gamepad frame'ine olay ekle (yazmaz)"""
+        off = self.gp_off
+        if off >= len(self.gp_buf) - self.EVENT.size:
+            self.flush()
+            off = 0
+        self.EVENT.pack_into(self.gp_buf, off, 0, 0, etype, code, value)
+        self.gp_off = off + self.EVENT.size
+    
+    def _abs(self, code, value):
+        if self.abs_last[code] != value:
+            self.abs_last[code] = value
+            self._emit(self.EV_ABS, code, value)
+    
+    def flush(self):
+        """Biriken frame'i SYN_REPORT ile tek write() olarak gönder"""
+        off = self.gp_off
+        if not off:
+            return
+        self.EVENT.pack_into(self.gp_buf, off, 0, 0, self.EV_SYN, self.SYN_REPORT, 0)
+        self.gp_off = 0
+        os.write(self.gamepad_fd, self.gp_view[:off + self.EVENT.size])
+    
+    def _write_frame(self, fd, buf, events):
+        """Olaylar + SYN_REPORT tek write()"""
+        pack_into, size = self.EVENT.pack_into, self.EVENT.size
+        off = 0
+        for etype, code, value in events:
+            pack_into(buf, off, 0, 0, etype, code, value)
+            off += size
+        pack_into(buf, off, 0, 0, self.EV_SYN, self.SYN_REPORT, 0)
+        os.write(fd, memoryview(buf)[:off + size])
+    
+    def _mouse_write(self, *events):
+        self._write_frame(self.mouse_fd, self.mouse_buf, events)
+    
+    # ─── Mouse ──────────────────────────────────────────────────
+    
+    def mouse_move(self, dx, dy):
+        self._mouse_write((self.EV_REL, self.REL_X, dx), (self.EV_REL, self.REL_Y, dy))
+    
+    def mouse_button(self, button, pressed):
+        btn = self.mouse_btns.get(button, self.BTN_LEFT)
+        self._mouse_write((self.EV_KEY, btn, 1 if pressed else 0))
+    
+    def mouse_scroll(self, v, h=0):
+        # Hi-res olaylar + eski uygulamalar için çentik sınırında REL_WHEEL, tek write()
+        nv, nh = self._wheel_notches(v, h)
+        events = []
+        if v:
+            events.append((self.EV_REL, self.REL_WHEEL_HI_RES, v))
+        if nv:
+            events.append((self.EV_REL, self.REL_WHEEL, nv))
+        if h:
+            events.append((self.EV_REL, self.REL_HWHEEL_HI_RES, h))
+        if nh:
+            events.append((self.EV_REL, self.REL_HWHEEL, nh))
+        if events:
+            self._mouse_write(*events)
+    
+    # ─── Gamepad ────────────────────────────────────────────────
+    
+    def gamepad_buttons(self, buttons, prev):
+        changed = buttons ^ prev
+        for mask, btn in self.gpad_btns:
+            if changed & mask:
+                self._emit(self.EV_KEY, btn, 1 if buttons & mask else 0)
+        
+        if changed & self.DPAD_MASK:
+            hat_x = -1 if buttons & self.DPAD_LEFT else (1 if buttons & self.DPAD_RIGHT else 0)
+            hat_y = -1 if buttons & self.DPAD_UP else (1 if buttons & self.DPAD_DOWN else 0)
+            self._abs(self.ABS_HAT0X, hat_x)
+            self._abs(self.ABS_HAT0Y, hat_y)
+    
+    def gamepad_left_stick(self, x, y):
+        """Sol joystick → ABS_X/Y (StickCurve çıktısı, ölçekli)"""
+        self._abs(self.ABS_X, x)
+        self._abs(self.ABS_Y, y)
+    
+    def gamepad_right_stick(self, x, y):
+        """Sağ joystick → ABS_Z/RZ (StickCurve çıktısı, ölçekli)"""
+        self._abs(self.ABS_Z, x)
+        self._abs(self.ABS_RZ, y)
+    
+    def gamepad_triggers(self, l2, r2):
+        """Trigger'lar → ABS_BRAKE/GAS"""
+        self._abs(self.ABS_BRAKE, l2)
+        self._abs(self.ABS_GAS, r2)
+    
+    def gamepad_gyro(self, rx, ry, rz):
+        """Gyro'yu mouse hareketine çevir (isteğe bağlı)"""
+        if Config.GYRO_AS_MOUSE:
+            dx = int(rz * Config.GYRO_SENSITIVITY / 1000)
+            dy = int(-rx * Config.GYRO_SENSITIVITY / 1000)
+            if dx or dy:
+                self.mouse_move(dx, dy)
+    
+    # ─── Mutlak dokunma ─────────────────────────────────────────
+    
+    def touch_frame(self, contacts):
+        """Mutlak dokunma → tablet/touchscreen cihazı (ilk kullanımda açılır)"""
+        if self.touch_fd is None:
+            self.touch_tr = TouchTranslator(Config.TOUCH_MODE)
+            keys, axes, props = self.touch_tr.capabilities()
+            self.touch_fd = self._create_device(
+                "Benim Virtual Tablet", 0x0001, 0x0002, 0x0001,
+                keys=keys, axes=axes, props=props)
+        events = self.touch_tr.frame(contacts)
+        if events:
+            self._write_frame(self.touch_fd, self.touch_buf, events[:self.MAX_EVENTS - 1])
+    
+    # ─── Klavye ─────────────────────────────────────────────────
+    
+    def key(self, code, pressed):
+        if self.kbd_fd is None:
+            self.kbd_fd = self._create_device("Benim Virtual Keyboard", 0x0001, 0x0003, 0x0001,
+                                              keys=sorted(KEY_BY_CODE))
+        self._write_frame(self.kbd_fd, self.kbd_buf, ((self.EV_KEY, code, 1 if pressed else 0),))
+    
+    # ─── Force-feedback ─────────────────────────────────────────
+    
+    def ff_fileno(self):
+        return self.gamepad_fd if Config.FF_ENABLED else None
+    
+    def ff_read(self):
+        """Upload/erase el sıkışmasını yap, play/stop olaylarını döndür"""
+        try:
+            n = os.readv(self.gamepad_fd, [self.ff_buf])
+        except (BlockingIOError, OSError):
+            return []
+        out = []
+        size = self.EVENT.size
+        for off in range(0, n - n % size, size):
+            _, _, etype, code, value = self.EVENT.unpack_from(self.ff_buf, off)
+            if etype == self.EV_UINPUT:
+                if code == self.UI_FF_UPLOAD:
+                    self._ff_upload(value)
+                elif code == self.UI_FF_ERASE:
+                    self._ff_erase(value)
+            elif etype == self.EV_FF and code in self.ff_effects:
+                out.append(self.ff_effects[code] if value else (0, 0, 0))
+        return out
+    
+    def _ff_upload(self, request_id):
+        buf = bytearray(self.FF_UPLOAD_SIZE)
+        struct.pack_into('I', buf, 0, request_id)
+        self.fcntl.ioctl(self.gamepad_fd, self.UI_BEGIN_FF_UPLOAD, buf, True)
+        # effect: type, id, direction, trigger(2×u16), replay(length, delay), union
+        etype, effect_id = struct.unpack_from('Hh', buf, 8)
+        length = struct.unpack_from('H', buf, 8 + 10)[0]
+        if etype == self.FF_RUMBLE:
+            strong, weak = struct.unpack_from('HH', buf, 8 + 16)
+            self.ff_effects[effect_id] = (strong, weak, length)
+        struct.pack_into('i', buf, 4, 0)
+        self.fcntl.ioctl(self.gamepad_fd, self.UI_END_FF_UPLOAD, buf)
+    
+    def _ff_erase(self, request_id):
+        buf = bytearray(self.FF_ERASE_SIZE)
+        struct.pack_into('I', buf, 0, request_id)
+        self.fcntl.ioctl(self.gamepad_fd, self.UI_BEGIN_FF_ERASE, buf, True)
+        self.ff_effects.pop(struct.unpack_from('I', buf, 8)[0], None)
+        struct.pack_into('i', buf, 4, 0)
+        self.fcntl.ioctl(self.gamepad_fd, self.UI_END_FF_ERASE, buf)
+    
+    def close(self):
+        for fd in (self.mouse_fd, self.gamepad_fd, self.touch_fd, self.kbd_fd):
+            if fd is None:
+                continue
+            try:
+                self.fcntl.ioctl(fd, self.UI_DEV_DESTROY)
+                os.close(fd)
+            except Exception:
+                pass
+
 # ═══════════════════════════════════════════════════════════════
 # PYNPUT BACKEND
 # ═══════════════════════════════════════════════════════════════
@@ -310,8 +1590,10 @@ class PynputBackend(InputBackend):
         else:
             self.ctrl.release(btn)
     
-    def mouse_scroll(self, delta): 
-        self.ctrl.scroll(0, delta)
+    def mouse_scroll(self, v, h=0):
+        nv, nh = self._wheel_notches(v, h)
+        if nv or nh:
+            self.ctrl.scroll(nh, nv)
     
     def gamepad_gyro(self, rx, ry, rz):
         """Gyro'yu mouse hareketine çevir"""
@@ -320,6 +1602,18 @@ class PynputBackend(InputBackend):
             dy = int(-rx * Config.GYRO_SENSITIVITY / 1000)
             if dx or dy:
                 self.ctrl.move(dx, dy)
+    
+    def key(self, code, pressed):
+        if not hasattr(self, "keyboard"):
+            from pynput.keyboard import Controller as KeyController, Key
+            self.keyboard = KeyController()
+            self.Key = Key
+        name = KEY_BY_CODE[code][1]
+        target = name if len(name) == 1 else getattr(self.Key, name)
+        if pressed:
+            self.keyboard.press(target)
+        else:
+            self.keyboard.release(target)
 
 # ═══════════════════════════════════════════════════════════════
 # XDOTOOL BACKEND
@@ -336,14 +1630,35 @@ class XdotoolBackend(InputBackend):
             raise FileNotFoundError("xdotool bulunamadı")
     
     def _run(self, *args):
-        try: 
-            subprocess.run(["xdotool"] + list(args), capture_output=True, timeout=1)
-        except Exception:
-            pass
+        # Hata yutulmaz: BackendSupervisor sayar, gerekirse backend değiştirir
+        result = subprocess.run(["xdotool"] + list(args), capture_output=True, timeout=1)
+        if result.returncode:
+            raise RuntimeError(f"xdotool {args[0]}: {result.stderr.decode(errors='replace').strip() or result.returncode}")
     
     def mouse_move(self, dx, dy): 
         self._run("mousemove_relative", "--", str(dx), str(dy))
     
+    def touch_frame(self, contacts):
+        """Mutlak konum: ilk temas imleci taşır, durum bit1 sol tıklama"""
+        if not hasattr(self, "screen"):
+            try:
+                out = subprocess.run(["xdotool", "getdisplaygeometry"],
+                                     capture_output=True, text=True, timeout=1).stdout.split()
+                self.screen = (int(out[0]), int(out[1]))
+            except Exception:
+                self.screen = (1920, 1080)
+            self.touch_pressed = False
+        pressed = False
+        for _, state, x, y in contacts:
+            if state & TouchTranslator.TOUCHING:
+                w, h = self.screen
+                self._run("mousemove", str(x * (w - 1) // 65535), str(y * (h - 1) // 65535))
+                pressed = bool(state & TouchTranslator.PRESSED)
+                break
+        if pressed != self.touch_pressed:
+            self.touch_pressed = pressed
+            self._run("mousedown" if pressed else "mouseup", "1")
+    
     def mouse_button(self, button, pressed):
         btn = {0: "1", 1: "3", 2: "2"}.get(button, "1")
         if pressed:
@@ -351,10 +1666,12 @@ class XdotoolBackend(InputBackend):
         else:
             self._run("mouseup", btn)
     
-    def mouse_scroll(self, delta):
-        btn = "4" if delta > 0 else "5"
-        for _ in range(abs(delta)):
-            self._run("click", btn)
+    def mouse_scroll(self, v, h=0):
+        # Birikmiş çentikler eksen başına tek xdotool çağrısında (--repeat)
+        nv, nh = self._wheel_notches(v, h)
+        for count, btn in ((nv, "4" if nv > 0 else "5"), (nh, "7" if nh > 0 else "6")):
+            if count:
+                self._run("click", "--repeat", str(abs(count)), "--delay", "0", btn)
     
     def gamepad_gyro(self, rx, ry, rz):
         if Config.GYRO_AS_MOUSE:
@@ -362,6 +1679,9 @@ class XdotoolBackend(InputBackend):
             dy = int(-rx * Config.GYRO_SENSITIVITY / 1000)
             if dx or dy:
                 self._run("mousemove_relative", "--", str(dx), str(dy))
+    
+    def key(self, code, pressed):
+        self._run("keydown" if pressed else "keyup", KEY_BY_CODE[code][0])
 
 # ═══════════════════════════════════════════════════════════════
 # YDOTOOL BACKEND
@@ -382,10 +1702,10 @@ class YdotoolBackend(InputBackend):
             time.sleep(1)
     
     def _run(self, *args):
-        try: 
-            subprocess.run(["ydotool"] + list(args), capture_output=True, timeout=1)
-        except Exception:
-            pass
+        # Hata yutulmaz: BackendSupervisor sayar, gerekirse backend değiştirir (ydotoold yeniden başlar)
+        result = subprocess.run(["ydotool"] + list(args), capture_output=True, timeout=1)
+        if result.returncode:
+            raise RuntimeError(f"ydotool {args[0]}: {result.stderr.decode(errors='replace').strip() or result.returncode}")
     
     def mouse_move(self, dx, dy): 
         self._run("mousemove", "-x", str(dx), "-y", str(dy))
@@ -397,8 +1717,10 @@ class YdotoolBackend(InputBackend):
         else:
             self._run("click", "-u", code)
     
-    def mouse_scroll(self, delta): 
-        self._run("mousemove", "-w", str(delta))
+    def mouse_scroll(self, v, h=0):
+        nv, nh = self._wheel_notches(v, h)
+        if nv or nh:
+            self._run("mousemove", "-w", "-x", str(nh), "-y", str(nv))
     
     def gamepad_gyro(self, rx, ry, rz):
         if Config.GYRO_AS_MOUSE:
@@ -406,20 +1728,27 @@ class YdotoolBackend(InputBackend):
             dy = int(-rx * Config.GYRO_SENSITIVITY / 1000)
             if dx or dy:
                 self._run("mousemove", "-x", str(dx), "-y", str(dy))
+    
+    def key(self, code, pressed):
+        # ydotool 1.x Linux tuş kodlarını doğrudan alır
+        self._run("key", f"{code}:{1 if pressed else 0}")
 
 # ═══════════════════════════════════════════════════════════════
 # BACKEND FACTORY
 # ═══════════════════════════════════════════════════════════════
+def backend_order():
+    """auto deneme sırası (failover da aynı sırayı izler)"""
+    is_wayland = os.environ.get('XDG_SESSION_TYPE') == 'wayland'
+    order = [UinputBackend, EvdevBackend]
+    order.append(YdotoolBackend if is_wayland else PynputBackend)
+    order.append(XdotoolBackend)
+    return order
+
 def create_backend(backend_type="auto"):
     errors = []
-    is_wayland = os.environ.get('XDG_SESSION_TYPE') == 'wayland'
     
     if backend_type == "auto":
-        order = [EvdevBackend]
-        order.append(YdotoolBackend if is_wayland else PynputBackend)
-        order.append(XdotoolBackend)
-        
-        for BackendClass in order:
+        for BackendClass in backend_order():
             try:
                 return BackendClass()
             except Exception as e:
@@ -427,6 +1756,7 @@ def create_backend(backend_type="auto"):
         raise RuntimeError("Backend başlatılamadı!\n" + "\n".join(f"  • {e}" for e in errors))
     
     backends = {
+        "uinput": UinputBackend,
         "evdev": EvdevBackend, 
         "pynput": PynputBackend, 
         "xdotool": XdotoolBackend, 
@@ -435,46 +1765,1780 @@ def create_backend(backend_type="auto"):
     return backends[backend_type]()
 
 # ═══════════════════════════════════════════════════════════════
-# UDP SERVER
+# BACKEND SAĞLIK DENETİMİ
 # ═══════════════════════════════════════════════════════════════
-class UdpServer:
-    def __init__(self, port=None):
-        self.port = port or Config.UDP_PORT
-        self.running = False
-        self.backend = None
-        self.sock = None
-        self.prev_buttons = {}
-        self.last_activity = {}
-        self.stats = {
-            'packets': 0,
-            'pings': 0,
-            'mouse_moves': 0,
-            'clicks': 0,
-            'gamepad': 0,
-            'gyro': 0,
-            'checksum_ok': 0,
-            'checksum_fail': 0
-        }
-        
-        # Thread güvenliği için lock
-        self.lock = threading.Lock()
+class BackendHealth:
+    """Aktif backend'in çağrı/hata sayıları ve yazma gecikmesi (EMA, sn)"""
+    __slots__ = ("calls", "errors", "consecutive", "slow", "latency", "last_error")
     
-    def _get_ip(self):
-        try:
-            s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            s.connect(("8.8.8.8", 80))
-            ip = s.getsockname()[0]
-            s.close()
-            return ip
-        except Exception:
-            return "127.0.0.1"
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.consecutive = 0
+        self.slow = 0
+        self.latency = 0.0
+        self.last_error = None
     
-    def _print_banner(self):
-        ip = self._get_ip()
-        display = os.environ.get('XDG_SESSION_TYPE', 'x11').upper()
+    def as_dict(self):
+        return {"calls": self.calls, "errors": self.errors, "consecutive": self.consecutive,
+                "slow": self.slow, "latency_ms": round(self.latency * 1000, 3),
+                "last_error": self.last_error}
+
+class BackendSupervisor:
+    """
+    Aktif backend'i sarar: her çıkış çağrısının süresini ölçer, hatayı yakalar
+    (paket döngüsü durmaz). Art arda MAX_ERRORS hata ya da sürekli yavaşlık
+    görülürse önce aynı backend yeniden kurulur, olmazsa backend_order()
+    sırasıyla sonrakilere geçilir. Denetim çağrı anında yapılır, periyodik
+    uyanma gerekmez. Aday backend yardımcı thread'de kurulur (ydotoold
+    başlatma gibi saniyelik beklemeler paket döngüsünü durdurmaz), değişim
+    defer() ile döngü thread'inde yapılır. Sarılmayan öznitelikler (name,
+    ff_fileno, close...) doğrudan aktif backend'e gider.
+    """
+    TRACKED = ("mouse_move", "mouse_button", "mouse_scroll", "touch_frame",
+               "gamepad_buttons", "gamepad_left_stick", "gamepad_right_stick",
+               "gamepad_triggers", "gamepad_gyro", "flush", "ff_read", "key")
+    LATENCY_ALPHA = 0.05
+    RETRY_WINDOW = 60.0     # yeniden kurulan backend bu sürede yine bozulursa sıradakine geç
+    
+    def __init__(self, backend, log=None, on_swap=None, defer=None, max_errors=5, slow_ms=50.0, cooldown=5.0):
+        self.backend = backend
+        self.log = log or (lambda *a, **k: None)
+        self.on_swap = on_swap
+        self.defer = defer or (lambda func: func())    # func'ı döngü thread'inde çalıştır
+        self.max_errors = max_errors
+        self.slow = slow_ms / 1000
+        self.cooldown = cooldown
+        self.failovers = 0
+        self.last_failover = -cooldown
+        self.rebuilt = None     # son yeniden kurulan backend sınıfı
+        self.swapping = False
+        self._bind()
+    
+    def __getattr__(self, name):
+        return getattr(self.backend, name)
+    
+    def _bind(self, health=None):
+        """Aktif backend'in metotlarını ölçen sarmalayıcılarla örnek üzerine yerleştir"""
+        self.health = health or BackendHealth()
+        for name in self.TRACKED:
+            setattr(self, name, self._wrap(name, getattr(self.backend, name)))
+    
+    def _bind_muted(self):
+        """Değişim sürerken çıkışı yut; ff_read eski cihazı okumaya devam eder (fd boşalır)"""
+        def mute(*args):
+            return None
+        for name in self.TRACKED:
+            if name != "ff_read":
+                setattr(self, name, mute)
+    
+    def _wrap(self, name, method):
+        health, clock, slow, alpha = self.health, time.perf_counter, self.slow, self.LATENCY_ALPHA
         
-        print()
-        print("═" * 62)
+        def call(*args):
+            start = clock()
+            try:
+                result = method(*args)
+            except Exception as e:
+                health.calls += 1
+                health.errors += 1
+                health.consecutive += 1
+                health.last_error = f"{name}: {e}"
+                if health.consecutive >= self.max_errors:
+                    self.failover(health.last_error)
+                return None
+            elapsed = clock() - start
+            health.calls += 1
+            health.consecutive = 0
+            health.latency += (elapsed - health.latency) * alpha
+            if elapsed > slow:
+                health.slow += 1
+                if health.latency > slow:
+                    self.failover(f"yavaş ({health.latency * 1000:.0f} ms)", slow=True)
+            return result
+        
+        call.__name__ = name
+        return call
+    
+    def failover(self, reason, slow=False):
+        """
+        Backend'i yeniden kur ya da sıradakine geç (cooldown içinde tekrar denenmez).
+        Kurulum sürerken çıkış yutulur: bekleyen paketler bozuk backend'e yazılmaz,
+        değişimden sonra on_swap tutulan girdiyi güncel haliyle yeniden yazar.
+        """
+        now = time.monotonic()
+        if self.swapping or not Config.FAILOVER_ENABLED or now - self.last_failover < self.cooldown:
+            return False
+        if now - self.last_failover > self.RETRY_WINDOW:
+            self.rebuilt = None
+        self.last_failover = now
+        self.swapping = True
+        current = type(self.backend)
+        candidates = [cls for cls in backend_order() if cls is not current]
+        # Hata: aynı backend'i yeniden kurmak çoğu zaman yeter (ydotoold, X oturumu).
+        # Yavaşlık ya da yeniden kurulduktan hemen sonra tekrar bozulma: en son dene.
+        if slow or self.rebuilt is current:
+            candidates.append(current)
+        else:
+            candidates.insert(0, current)
+        
+        self._bind_muted()
+        threading.Thread(target=self._build, args=(candidates, current, reason),
+                         name="backend-failover", daemon=True).start()
+        return True
+    
+    def _build(self, candidates, current, reason):
+        """Yardımcı thread: adayları sırayla kur, sonucu döngüye devret"""
+        errors = []
+        new = None
+        for cls in candidates:
+            try:
+                new = cls()
+                break
+            except Exception as e:
+                errors.append(f"{cls.name}: {e}")
+        try:
+            self.defer(lambda: self._finish(new, current, reason, errors))
+        except Exception:
+            # Döngü kapandı: kurulan backend kullanılmayacak
+            if new is not None:
+                try:
+                    new.close()
+                except Exception:
+                    pass
+    
+    def _finish(self, new, current, reason, errors):
+        """Döngü thread'i: yeni backend'e geç ya da eskisine geri bağlan"""
+        self.swapping = False
+        if new is None:
+            self._bind(self.health)
+            self.log(f"Backend sorunlu ({reason}), yedek bulunamadı: {'; '.join(errors)}", level="ERROR")
+            return False
+        old = self.backend
+        self.backend = new
+        self.rebuilt = current if type(new) is current else None
+        self._bind()
+        self.failovers += 1
+        if self.on_swap:
+            self.on_swap(old, new, reason)
+        try:
+            old.close()
+        except Exception:
+            pass
+        return True
+
+# ═══════════════════════════════════════════════════════════════
+# SON TARİH ZAMANLAYICISI
+# ═══════════════════════════════════════════════════════════════
+class DeadlineScheduler:
+    """
+    Anahtar başına tek son tarih (min-heap + tembel yenileme).
+    touch() sadece dict'i günceller; heap'in tepesindeki giriş eskiyse
+    pop anında gerçek son tarihle yeniden eklenir. Tarama yapılmaz:
+    touch O(1), tetikleme O(log n).
+    """
+    
+    def __init__(self, callback):
+        self.callback = callback
+        self.deadlines = {}     # anahtar → son tarih (monotonic)
+        self.heap = []          # (son tarih, anahtar), eski girişler olabilir
+    
+    def touch(self, key, deadline):
+        current = self.deadlines.get(key)
+        if current is None or deadline < current:
+            heapq.heappush(self.heap, (deadline, key))
+        self.deadlines[key] = deadline
+    
+    def cancel(self, key):
+        self.deadlines.pop(key, None)
+    
+    def armed(self, key):
+        return key in self.deadlines
+    
+    def next_deadline(self):
+        """En yakın (olası) son tarih, yoksa None"""
+        heap = self.heap
+        while heap and heap[0][1] not in self.deadlines:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+    
+    def run_expired(self, now):
+        """Süresi dolanlar için callback çağır"""
+        heap = self.heap
+        while heap and heap[0][0] <= now:
+            _, key = heapq.heappop(heap)
+            actual = self.deadlines.get(key)
+            if actual is None:
+                continue
+            if actual > now:
+                heapq.heappush(heap, (actual, key))
+                continue
+            del self.deadlines[key]
+            self.callback(key)
+
+# ═══════════════════════════════════════════════════════════════
+# ZAMANLAYICI ÇARKI VE MAKROLAR
+# ═══════════════════════════════════════════════════════════════
+class TimerWheel:
+    """
+    Hashed timing wheel: giriş, zamanının tick'ine göre bir yuvaya düşer
+    (ekleme/iptal O(1)); döngü sadece geçen tick'lerin yuvalarına bakar.
+    Yuva sadece kovalama içindir: tam zaman girişte saklanır ve
+    next_deadline() onu döndürür, yani tetikleme tick'e yuvarlanmaz
+    (select bu ana kadar uyur). DeadlineScheduler ile aynı döngü arayüzü.
+    Giriş: [zaman, callback, arg] - iptalde callback None olur.
+    """
+    
+    def __init__(self, tick=0.001, slots=512):
+        self.tick = tick
+        self.mask = slots - 1           # 2'nin kuvveti
+        self.slots = [[] for _ in range(slots)]
+        self.cursor = int(time.monotonic() / tick)
+        self.count = 0
+    
+    def __len__(self):
+        return self.count
+    
+    def schedule(self, when, callback, arg=None):
+        entry = [when, callback, arg]
+        t = int(when / self.tick)
+        if t < self.cursor:
+            t = self.cursor
+        self.slots[t & self.mask].append(entry)
+        self.count += 1
+        return entry
+    
+    def cancel(self, entry):
+        if entry[1] is not None:
+            entry[1] = None
+            self.count -= 1
+    
+    def next_deadline(self):
+        """En yakın giriş zamanı; tur içindeki ilk dolu yuva yeterli"""
+        if not self.count:
+            return None
+        slots, mask, cursor = self.slots, self.mask, self.cursor
+        horizon = (cursor + mask + 1) * self.tick
+        for k in range(mask + 1):
+            best = None
+            for entry in slots[(cursor + k) & mask]:
+                if entry[1] is not None and entry[0] < horizon and (best is None or entry[0] < best):
+                    best = entry[0]
+            if best is not None:
+                return best
+        # Hepsi bir turdan uzakta
+        return min(entry[0] for slot in slots for entry in slot if entry[1] is not None)
+    
+    def run_expired(self, now):
+        target = int(now / self.tick)
+        slots, mask = self.slots, self.mask
+        ticks = range(self.cursor, target + 1) if target - self.cursor <= mask else range(mask + 1)
+        for t in ticks:
+            index = t & mask
+            bucket = slots[index]
+            if not bucket:
+                continue
+            # Callback'ler aynı yuvaya ekleyebilir: yeni liste sonraki tura kalır
+            slots[index] = keep = []
+            for entry in bucket:
+                callback = entry[1]
+                if callback is None:
+                    continue
+                if entry[0] <= now:
+                    entry[1] = None
+                    self.count -= 1
+                    callback(entry[2])
+                else:
+                    keep.append(entry)
+        self.cursor = target
+
+class _MacroRun:
+    """Bir istemcinin bir makro butonu: zamanlanmış girişler ve bastığı hedefler"""
+    __slots__ = ("ip", "entries", "held", "turbo")
+    
+    def __init__(self, ip):
+        self.ip = ip
+        self.entries = []
+        self.held = []
+        self.turbo = None   # [hedef, periyot, basılı süre, sonraki basış, ilk aralık, basılı mı]
+
+class MacroEngine:
+    """
+    Buton → klavye/gamepad makroları. Makrolu butonlar sanal gamepad'e
+    gitmez; zamanlı adımlar döngüdeki TimerWheel'de çalışır (sleep/thread yok).
+    Eylemler (hedef: tuş akoru 'ctrl+c' ya da büyük harf gamepad butonu 'A'):
+      key:ctrl+c              buton basılıyken hedef basılı
+      tap:ctrl+s              basınca bir kez vur
+      seq:h,i,100ms,enter     basınca sırayla vur (ms: ek bekleme)
+      turbo:space@15          basılıyken saniyede 15 vuruş
+      repeat:right@30/300     bir vuruş, 300 ms sonra saniyede 30 tekrar
+    Aynı tuşu tutan birden çok makro için referans sayılır.
+    """
+    ACTIONS = ("key", "tap", "seq", "turbo", "repeat")
+    
+    def __init__(self, wheel, emit_key, emit_pad):
+        self.wheel = wheel
+        self.emit_key = emit_key        # (kod, basıldı)
+        self.emit_pad = emit_pad        # (ip, maske, basıldı)
+        self.macros = {}                # buton maskesi → (eylem, parametreler, metin)
+        self.mapped = 0
+        self.raw = {}                   # ip → makrolu butonların ham durumu
+        self.runs = {}                  # (ip, maske) → _MacroRun
+        self.key_refs = {}              # tuş kodu → tutan sayısı
+        self.pad_refs = {}              # (ip, maske) → tutan sayısı
+        self.pad_held = {}              # ip → makroların tuttuğu gamepad bitleri
+        self.fired = 0
+    
+    # ─── Ayrıştırma ─────────────────────────────────────────────
+    
+    @staticmethod
+    def button_mask(name):
+        for mask, (button, _) in Config.GAMEPAD_BUTTONS.items():
+            if button == name.strip().upper():
+                return mask
+        raise ValueError(f"bilinmeyen buton: {name}")
+    
+    @staticmethod
+    def parse_target(text):
+        text = text.strip()
+        for mask, (button, _) in Config.GAMEPAD_BUTTONS.items():
+            if button == text:
+                return ("pad", mask)
+        return ("key", parse_keys(text))
+    
+    @classmethod
+    def parse(cls, spec):
+        """'turbo:space@15' → (eylem, parametreler)"""
+        action, sep, arg = spec.partition(":")
+        action = action.strip().lower()
+        if not sep or action not in cls.ACTIONS:
+            raise ValueError(f"makro '{spec}': eylem {', '.join(cls.ACTIONS)} olmalı")
+        if action in ("key", "tap"):
+            return action, cls.parse_target(arg)
+        if action == "seq":
+            steps = []
+            for item in arg.split(","):
+                item = item.strip()
+                if item.endswith("ms") and item[:-2].replace(".", "", 1).isdigit():
+                    steps.append(float(item[:-2]) / 1000)
+                elif item:
+                    steps.append(cls.parse_target(item))
+            if not steps:
+                raise ValueError(f"makro '{spec}': boş dizi")
+            return action, tuple(steps)
+        target, _, timing = arg.partition("@")
+        rate, _, delay = timing.partition("/")
+        try:
+            rate = float(rate)
+            delay = float(delay) / 1000 if delay else 0.0
+        except ValueError:
+            raise ValueError(f"makro '{spec}': hız Hz olarak bekleniyor (örn space@15)")
+        if rate <= 0:
+            raise ValueError(f"makro '{spec}': hız pozitif olmalı")
+        if action == "turbo":
+            delay = 0.0
+        elif not delay:
+            delay = 0.3
+        return action, (cls.parse_target(target), 1.0 / rate, delay)
+    
+    def configure(self, specs):
+        """{buton adı: eylem | 'off'} uygula; çalışan makrolar bırakılır"""
+        macros = dict(self.macros)
+        for name, spec in specs.items():
+            mask = self.button_mask(name)
+            if spec in (None, "", "off"):
+                macros.pop(mask, None)
+            else:
+                macros[mask] = (*self.parse(spec), spec)
+        for ip in {ip for ip, _ in self.runs}:
+            self.release(ip)
+        self.raw.clear()
+        self.macros = macros
+        self.mapped = 0
+        for mask in macros:
+            self.mapped |= mask
+    
+    def describe(self):
+        return {Config.GAMEPAD_BUTTONS[mask][0]: spec for mask, (_, _, spec) in self.macros.items()}
+    
+    # ─── Hedefler ───────────────────────────────────────────────
+    
+    def _press(self, run, target):
+        kind, value = target
+        if kind == "pad":
+            key = (run.ip, value)
+            count = self.pad_refs.get(key, 0)
+            self.pad_refs[key] = count + 1
+            if not count:
+                self.pad_held[run.ip] = self.pad_held.get(run.ip, 0) | value
+                self.emit_pad(run.ip, value, True)
+        else:
+            refs = self.key_refs
+            for code in value:
+                count = refs.get(code, 0)
+                refs[code] = count + 1
+                if not count:
+                    self.emit_key(code, True)
+        run.held.append(target)
+    
+    def _release(self, run, target):
+        if target not in run.held:
+            return
+        run.held.remove(target)
+        kind, value = target
+        if kind == "pad":
+            key = (run.ip, value)
+            count = self.pad_refs.pop(key, 1) - 1
+            if count:
+                self.pad_refs[key] = count
+            else:
+                self.pad_held[run.ip] = self.pad_held.get(run.ip, 0) & ~value
+                self.emit_pad(run.ip, value, False)
+        else:
+            refs = self.key_refs
+            for code in reversed(value):
+                count = refs.pop(code, 1) - 1
+                if count:
+                    refs[code] = count
+                else:
+                    self.emit_key(code, False)
+    
+    def _timed(self, arg):
+        run, target, pressed = arg
+        if pressed:
+            self._press(run, target)
+            self.fired += 1
+        else:
+            self._release(run, target)
+    
+    def _turbo(self, run):
+        """Turbo/tekrar adımı: bas → basılı süre sonra bırak → sonraki basış zamanına kadar bekle"""
+        turbo = run.turbo
+        if turbo is None:
+            return
+        target, period, hold, next_press, first, down = turbo
+        if down:
+            self._release(run, target)
+            turbo[5] = False
+            run.entries = [self.wheel.schedule(next_press, self._turbo, run)]
+            return
+        self._press(run, target)
+        self.fired += 1
+        now = time.monotonic()
+        # Takvime göre ilerle (kayma yok); döngü çok geciktiyse yakala, patlama yapma
+        press_at = max(next_press, now - period)
+        turbo[3] = press_at + (first or period)
+        turbo[4] = 0.0
+        turbo[5] = True
+        run.entries = [self.wheel.schedule(press_at + hold, self._turbo, run)]
+    
+    # ─── Butonlar ───────────────────────────────────────────────
+    
+    def feed(self, ip, buttons, now):
+        """Ham maske → makrolu bitleri ayıklanmış maske + makroların tuttuğu gamepad bitleri"""
+        state = buttons & self.mapped
+        prev = self.raw.get(ip, 0)
+        if state != prev:
+            self.raw[ip] = state
+            changed = state ^ prev
+            while changed:
+                mask = changed & -changed
+                changed ^= mask
+                if state & mask:
+                    self._on_press(ip, mask, now)
+                else:
+                    self._on_release(ip, mask)
+        return (buttons & ~self.mapped) | self.pad_held.get(ip, 0)
+    
+    def raw_state(self, ip, output):
+        """Yazılmış maskeden ham duruma dön (kenar uygulaması için)"""
+        return (output & ~self.mapped & ~self.pad_held.get(ip, 0)) | self.raw.get(ip, 0)
+    
+    def _on_press(self, ip, mask, now):
+        action, params, _ = self.macros[mask]
+        run = self.runs.get((ip, mask))
+        if run is None:
+            run = self.runs[(ip, mask)] = _MacroRun(ip)
+        else:
+            run.entries = [entry for entry in run.entries if entry[1] is not None]
+        hold = Config.MACRO_TAP_MS / 1000
+        schedule = self.wheel.schedule
+        
+        if action == "key":
+            self._press(run, params)
+            self.fired += 1
+        elif action == "tap":
+            self._press(run, params)
+            self.fired += 1
+            run.entries.append(schedule(now + hold, self._timed, (run, params, False)))
+        elif action == "seq":
+            gap = Config.MACRO_GAP_MS / 1000
+            t = now
+            for step in params:
+                if isinstance(step, float):
+                    t += step
+                    continue
+                run.entries.append(schedule(t, self._timed, (run, step, True)))
+                run.entries.append(schedule(t + hold, self._timed, (run, step, False)))
+                t += hold + gap
+        else:
+            target, period, delay = params
+            run.turbo = [target, period, min(hold, period / 2), now, delay, False]
+            self._turbo(run)
+    
+    def _on_release(self, ip, mask):
+        action, params, _ = self.macros[mask]
+        run = self.runs.get((ip, mask))
+        if run is None:
+            return
+        if action == "key":
+            self._release(run, params)
+        elif action in ("turbo", "repeat"):
+            run.turbo = None
+            for entry in run.entries:
+                self.wheel.cancel(entry)
+            run.entries = []
+            for target in list(run.held):
+                self._release(run, target)
+    
+    def release(self, ip):
+        """İstemcinin tüm makrolarını durdur, tuttuğu her şeyi bırak"""
+        for key in [key for key in self.runs if key[0] == ip]:
+            run = self.runs.pop(key)
+            run.turbo = None
+            for entry in run.entries:
+                self.wheel.cancel(entry)
+            for target in list(run.held):
+                self._release(run, target)
+        self.raw.pop(ip, None)
+        self.pad_held.pop(ip, None)
+    
+    def replay_keys(self):
+        """Backend değişti: basılı tuşları yeniden yaz (gamepad bitleri prev_buttons ile gelir)"""
+        for code in self.key_refs:
+            self.emit_key(code, True)
+
+# ═══════════════════════════════════════════════════════════════
+# ÇIKIŞ UPSAMPLING
+# ═══════════════════════════════════════════════════════════════
+class _AxisStream:
+    """İstemci başına son iki örnek ve giriş aralığı tahmini"""
+    __slots__ = ("t0", "a0", "t1", "a1", "interval", "next_tick", "emitted")
+    
+    def __init__(self, now, axes):
+        self.t0 = self.t1 = now
+        self.a0 = self.a1 = axes
+        self.interval = 0.0
+        self.next_tick = 0.0
+        self.emitted = axes
+
+class AxisUpsampler:
+    """
+    Stick/tetik eksenlerini sabit çıkış hızında üretir.
+    Telefon ~60 Hz (titrek) gönderirken oyunlar 250-1000 Hz okur; ara
+    değerler varış zamanlarına göre hesaplanır.
+      interpolate: son iki örnek arasında, bir giriş aralığı geriden
+      extrapolate: son eğimle ileri, en fazla HORIZON × aralık kadar;
+                   sonra beklenir, yeni örnek gelmezse gerçek değere
+                   oturur. Eksen sıfırı geçemez (bırakılan stick sekmez)
+    İstemcinin giriş hızı çıkış hızını aşıyorsa o istemci için devre
+    dışı kalır (push() True döner, çağıran doğrudan yazar).
+    Eksenler: (lx, ly, rx, ry, l2, r2)
+    """
+    MODES = ("interpolate", "extrapolate")
+    LIMITS = ((-32767, 32767),) * 4 + ((0, 255),) * 2
+    MAX_INTERVAL = 0.1      # sn, daha uzun boşluk = yeni hareket
+    EMA = 0.2
+    
+    def __init__(self, rate, mode="extrapolate", horizon=0.5):
+        if mode not in self.MODES:
+            raise ValueError(f"Geçersiz upsample modu: {mode}")
+        self.rate = rate
+        self.period = 1.0 / rate
+        self.mode = mode
+        self.horizon = horizon
+        self.clients = {}
+    
+    def push(self, client, now, axes):
+        """
+        Yeni örnek. Dönüş: (şimdi yaz?, tick gerekli?)
+        """
+        st = self.clients.get(client)
+        if st is None:
+            self.clients[client] = _AxisStream(now, axes)
+            return True, False
+        
+        dt = now - st.t1
+        if dt > self.MAX_INTERVAL or dt <= 0:
+            # Boşluktan sonra eski eğim anlamsız: düz başla
+            st.t0, st.a0 = now - (st.interval or self.MAX_INTERVAL), axes
+        else:
+            st.interval = dt if not st.interval else st.interval + (dt - st.interval) * self.EMA
+            st.t0, st.a0 = st.t1, st.a1
+        st.t1, st.a1 = now, axes
+        
+        # Giriş zaten çıkıştan hızlı: upsampling gereksiz
+        if st.interval and st.interval < self.period:
+            st.emitted = axes
+            return True, False
+        
+        if self.mode == "extrapolate":
+            st.emitted = axes
+            return True, st.a0 != st.a1
+        return False, True
+    
+    def render(self, client, now):
+        """
+        Tick anındaki eksenler → (eksenler, devam?).
+        Eksenler son yazılanla aynıysa None döner (yazma gereksiz).
+        """
+        st = self.clients.get(client)
+        if st is None:
+            return None, False
+        
+        axes, more = self._render(st, now)
+        if axes == st.emitted:
+            return None, more
+        st.emitted = axes
+        return axes, more
+    
+    def _render(self, st, now):
+        span = st.t1 - st.t0
+        if span <= 0:
+            return st.a1, False
+        interval = st.interval or span
+        
+        if self.mode == "interpolate":
+            t = now - interval
+            if t >= st.t1:
+                return st.a1, False
+            f = max(0.0, (t - st.t0) / span)
+            return tuple(int(a + (b - a) * f) for a, b in zip(st.a0, st.a1)), True
+        
+        h = now - st.t1
+        limit = self.horizon * interval
+        if h >= interval + limit:
+            return st.a1, False
+        f = min(h, limit) / span
+        out = []
+        for a, b, (lo, hi) in zip(st.a0, st.a1, self.LIMITS):
+            v = int(b + (b - a) * f)
+            if (v > 0 > b) or (v < 0 < b) or not b and a:
+                v = 0
+            out.append(lo if v < lo else hi if v > hi else v)
+        return tuple(out), True
+    
+    def forget(self, client):
+        self.clients.pop(client, None)
+    
+    def describe(self):
+        return f"{self.rate} Hz {self.mode}"
+
+# ═══════════════════════════════════════════════════════════════
+# PAYLAŞIMLI BELLEK DIŞA AKTARIMI
+# ═══════════════════════════════════════════════════════════════
+class FrameRing:
+    """
+    /dev/shm altında tek yazar / çok okuyuculu halka buffer düzeni.
+    Tüm alanlar little-endian.
+    
+    Header (64 byte):
+      [0]  magic      8s   b"BNMRING1"
+      [8]  version    u32  1
+      [12] slot_size  u32  64
+      [16] slot_count u32
+      [24] write_seq  u64  son yazılan frame numarası (1'den başlar)
+    
+    Slot (64 byte), frame n → slot (n % slot_count):
+      [0]  seq        u64  0 = yazılıyor, aksi halde frame numarası
+      [8]  client_id  u32  istemci IPv4 adresi (big-endian sayı)
+      [12] kind       u16  1 = gamepad, 2 = gyro
+      [14] (boş)      u16
+      [16] timestamp  u64  CLOCK_MONOTONIC ns
+      [24] buttons    u32
+      [28] lx ly rx ry i16 ×4 (StickCurve çıktısı, ±32767)
+      [36] l2 r2      u8 ×2
+      [38] gx gy gz   i16 ×3
+    
+    Yazar önce seq=0, sonra gövde, sonra seq=n yazar; okuyucu seq'i
+    gövdeden önce ve sonra okuyup eşleşmeyen (yırtık) slotu atlar.
+    """
+    MAGIC = b"BNMRING1"
+    VERSION = 1
+    HEADER = struct.Struct('<8sIIIIQ')
+    HEADER_SIZE = 64
+    SLOT_SIZE = 64
+    SEQ = struct.Struct('<Q')
+    BODY = struct.Struct('<IHxxQIhhhhBBhhh')
+    WRITE_SEQ_OFFSET = 24
+    
+    KIND_GAMEPAD = 1
+    KIND_GYRO = 2
+
+class FrameExporter(FrameRing):
+    """Decode edilen her frame'i halka buffer'a yazar (tek yazar)"""
+    
+    def __init__(self, path, slots=1024):
+        self.path = path
+        self.slots = slots
+        size = self.HEADER_SIZE + slots * self.SLOT_SIZE
+        fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.ftruncate(fd, size)
+            self.mm = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+        self.HEADER.pack_into(self.mm, 0, self.MAGIC, self.VERSION, self.SLOT_SIZE, slots, 0, 0)
+        self.seq = 0
+        self.state = {}     # ip → [client_id, buttons, lx, ly, rx, ry, l2, r2, gx, gy, gz]
+    
+    def _client(self, ip):
+        st = self.state.get(ip)
+        if st is None:
+            try:
+                cid = struct.unpack('!I', socket.inet_aton(ip))[0]
+            except OSError:
+                cid = 0
+            st = self.state[ip] = [cid, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
+        return st
+    
+    def gamepad(self, ip, buttons, lx, ly, rx, ry, l2, r2):
+        st = self._client(ip)
+        st[1:8] = buttons, lx, ly, rx, ry, l2, r2
+        self._write(self.KIND_GAMEPAD, st)
+    
+    def gyro(self, ip, gx, gy, gz):
+        st = self._client(ip)
+        st[8:11] = gx, gy, gz
+        self._write(self.KIND_GYRO, st)
+    
+    def _write(self, kind, st):
+        seq = self.seq + 1
+        self.seq = seq
+        off = self.HEADER_SIZE + (seq % self.slots) * self.SLOT_SIZE
+        mm = self.mm
+        self.SEQ.pack_into(mm, off, 0)
+        self.BODY.pack_into(mm, off + 8, st[0], kind, time.monotonic_ns(), *st[1:])
+        self.SEQ.pack_into(mm, off, seq)
+        self.SEQ.pack_into(mm, self.WRITE_SEQ_OFFSET, seq)
+    
+    def forget(self, ip):
+        self.state.pop(ip, None)
+    
+    def close(self):
+        try:
+            self.mm.close()
+            os.unlink(self.path)
+        except Exception:
+            pass
+
+class FrameReader(FrameRing):
+    """
+    Halka buffer okuyucu (sunucudan bağımsız süreçler için).
+    
+        reader = FrameReader()
+        while True:
+            for f in reader.poll():
+                print(f["client_id"], f["buttons"], f["lx"], f["ly"])
+    
+    Kopyasız erişim için slot(seq) ham memoryview döndürür.
+    Okuyucu geride kalırsa kaçırılan frame sayısı self.lost'a eklenir.
+    """
+    FIELDS = ("client_id", "kind", "timestamp_ns", "buttons", "lx", "ly", "rx", "ry",
+              "l2", "r2", "gx", "gy", "gz")
+    
+    def __init__(self, path=None):
+        path = path or Config.EXPORT_SHM_DEFAULT
+        with open(path, "rb") as f:
+            self.mm = mmap.mmap(f.fileno(), 0, prot=mmap.PROT_READ)
+        self.view = memoryview(self.mm)
+        magic, version, slot_size, slots, _, _ = self.HEADER.unpack_from(self.mm, 0)
+        if magic != self.MAGIC or version != self.VERSION or slot_size != self.SLOT_SIZE:
+            raise ValueError(f"Tanınmayan halka buffer: {path}")
+        self.slots = slots
+        self.next_seq = self.head() + 1
+        self.lost = 0
+    
+    def head(self):
+        """Son yazılan frame numarası"""
+        return self.SEQ.unpack_from(self.mm, self.WRITE_SEQ_OFFSET)[0]
+    
+    def slot(self, seq):
+        """Frame'in ham 64 byte'lık slotu (kopyasız memoryview)"""
+        off = self.HEADER_SIZE + (seq % self.slots) * self.SLOT_SIZE
+        return self.view[off:off + self.SLOT_SIZE]
+    
+    def read(self, seq):
+        """Frame'i tuple olarak oku, üzerine yazıldıysa/yırtıksa None"""
+        off = self.HEADER_SIZE + (seq % self.slots) * self.SLOT_SIZE
+        if self.SEQ.unpack_from(self.mm, off)[0] != seq:
+            return None
+        body = self.BODY.unpack_from(self.mm, off + 8)
+        if self.SEQ.unpack_from(self.mm, off)[0] != seq:
+            return None
+        return body
+    
+    def poll(self):
+        """Son çağrıdan beri yazılan frame'ler (dict)"""
+        head = self.head()
+        if head - self.next_seq >= self.slots:
+            skip = head - self.slots + 1
+            self.lost += skip - self.next_seq
+            self.next_seq = skip
+        while self.next_seq <= head:
+            body = self.read(self.next_seq)
+            self.next_seq += 1
+            if body is None:
+                self.lost += 1
+                continue
+            yield dict(zip(self.FIELDS, body))
+    
+    def close(self):
+        self.view.release()
+        self.mm.close()
+
+# ═══════════════════════════════════════════════════════════════
+# SENSÖR FÜZYONU (IMU)
+# ═══════════════════════════════════════════════════════════════
+class ImuFusion:
+    """
+    İstemci başına Madgwick (6 eksen) yönelim filtresi. Gyro entegre edilir,
+    ivmenin gösterdiği yerçekimi yönü gyro kaymasını yavaşça düzeltir.
+    Durum istemci başına önceden ayrılmış array('d') içinde yerinde güncellenir:
+    [q0 q1 q2 q3  son örnek zamanı (µs, taşması açılmış)  başlatıldı]
+    Bir paketteki örnek grubu tek döngüde işlenir.
+    """
+    GYRO_SCALE = math.radians(500 / 32767)  # paket birimi → rad/s (±500 dps)
+    ACCEL_SCALE = 8 / 32767                  # paket birimi → g (±8 g)
+    MAX_DT = 0.1            # daha uzun boşlukta (kayıp/duraklama) entegrasyon yapılmaz
+    SHOCK = 0.3             # |ivme| 1 g'den bu kadar saparsa (sarsıntı) düzeltme atlanır
+    
+    def __init__(self, beta=0.05):
+        self.beta = beta
+        self.states = {}
+    
+    def forget(self, ip):
+        self.states.pop(ip, None)
+    
+    def update(self, ip, samples, stamps, count):
+        """
+        samples: int16 görünümü (örnek başına 8: gx gy gz ax ay az + zaman),
+        stamps: aynı bloğun u32 görünümü (örnek başına 4, zaman 4.sırada).
+        """
+        state = self.states.get(ip)
+        if state is None:
+            state = self.states[ip] = array('d', (1.0, 0.0, 0.0, 0.0, 0.0, 0.0))
+        q0, q1, q2, q3, last_us, ready = state
+        beta = self.beta
+        gscale = self.GYRO_SCALE
+        max_dt = self.MAX_DT
+        shock_lo = (1.0 - self.SHOCK) ** 2 / self.ACCEL_SCALE ** 2
+        shock_hi = (1.0 + self.SHOCK) ** 2 / self.ACCEL_SCALE ** 2
+        
+        for k in range(count):
+            i = k << 3
+            ax, ay, az = samples[i + 3], samples[i + 4], samples[i + 5]
+            # u32 zamanı taşma ile aç (son değerin alt 32 biti ile karşılaştır)
+            stamp = stamps[(k << 2) + 3]
+            base = last_us - (last_us % 4294967296.0)
+            now_us = base + stamp
+            if now_us < last_us:
+                now_us += 4294967296.0
+            dt = (now_us - last_us) * 1e-6
+            last_us = now_us
+            
+            if not ready:
+                # İlk örnek: yönelimi doğrudan ivmeden kur (yavaş yakınsama yok)
+                if ax or ay or az:
+                    roll = math.atan2(ay, az)
+                    pitch = math.atan2(-ax, math.sqrt(ay * ay + az * az))
+                    cr, sr = math.cos(roll / 2), math.sin(roll / 2)
+                    cp, sp = math.cos(pitch / 2), math.sin(pitch / 2)
+                    q0, q1, q2, q3 = cr * cp, sr * cp, cr * sp, -sr * sp
+                    ready = 1.0
+                continue
+            if dt <= 0.0 or dt > max_dt:
+                continue
+            
+            gx = samples[i] * gscale
+            gy = samples[i + 1] * gscale
+            gz = samples[i + 2] * gscale
+            
+            # Gyro'dan quaternion türevi
+            d0 = 0.5 * (-q1 * gx - q2 * gy - q3 * gz)
+            d1 = 0.5 * (q0 * gx + q2 * gz - q3 * gy)
+            d2 = 0.5 * (q0 * gy - q1 * gz + q3 * gx)
+            d3 = 0.5 * (q0 * gz + q1 * gy - q2 * gx)
+            
+            # İvme düzeltmesi (gradyan inişi adımı)
+            norm = ax * ax + ay * ay + az * az
+            if shock_lo < norm < shock_hi:
+                inv = 1.0 / math.sqrt(norm)
+                ax *= inv
+                ay *= inv
+                az *= inv
+                _2q0, _2q1, _2q2, _2q3 = 2.0 * q0, 2.0 * q1, 2.0 * q2, 2.0 * q3
+                _4q0, _4q1, _4q2 = 4.0 * q0, 4.0 * q1, 4.0 * q2
+                q0q0, q1q1, q2q2, q3q3 = q0 * q0, q1 * q1, q2 * q2, q3 * q3
+                s0 = _4q0 * q2q2 + _2q2 * ax + _4q0 * q1q1 - _2q1 * ay
+                s1 = (_4q1 * q3q3 - _2q3 * ax + 4.0 * q0q0 * q1 - _2q0 * ay - _4q1
+                      + 8.0 * q1 * q1q1 + 8.0 * q1 * q2q2 + _4q1 * az)
+                s2 = (4.0 * q0q0 * q2 + _2q0 * ax + _4q2 * q3q3 - _2q3 * ay - _4q2
+                      + 8.0 * q2 * q1q1 + 8.0 * q2 * q2q2 + _4q2 * az)
+                s3 = 4.0 * q1q1 * q3 - _2q1 * ax + 4.0 * q2q2 * q3 - _2q2 * ay
+                norm = s0 * s0 + s1 * s1 + s2 * s2 + s3 * s3
+                if norm > 0.0:
+                    inv = beta / math.sqrt(norm)
+                    d0 -= s0 * inv
+                    d1 -= s1 * inv
+                    d2 -= s2 * inv
+                    d3 -= s3 * inv
+            
+            q0 += d0 * dt
+            q1 += d1 * dt
+            q2 += d2 * dt
+            q3 += d3 * dt
+            inv = 1.0 / math.sqrt(q0 * q0 + q1 * q1 + q2 * q2 + q3 * q3)
+            q0 *= inv
+            q1 *= inv
+            q2 *= inv
+            q3 *= inv
+        
+        state[0], state[1], state[2], state[3], state[4], state[5] = q0, q1, q2, q3, last_us, ready
+        return state
+    
+    @staticmethod
+    def parse_axis(text):
+        """Direksiyon ekseni: lx | rx | off"""
+        text = text.strip().lower()
+        if text in ("off", "none", "kapalı"):
+            return None
+        if text not in ("lx", "rx"):
+            raise ValueError(f"eğim ekseni lx, rx veya off olmalı: {text}")
+        return text
+    
+    @staticmethod
+    def up(state):
+        """Telefon ekseninde yukarı (yerçekimine ters) birim vektör"""
+        q0, q1, q2, q3 = state[0], state[1], state[2], state[3]
+        return (2.0 * (q1 * q3 - q0 * q2),
+                2.0 * (q0 * q1 + q2 * q3),
+                q0 * q0 - q1 * q1 - q2 * q2 + q3 * q3)
+    
+    @staticmethod
+    def tilt(up):
+        """
+        Yatay tutuşta direksiyon açısı (derece, sağa pozitif): yukarı vektörün
+        ekran düzlemindeki açısı, hangi yatay yönde tutulduğuna göre referanslı.
+        """
+        ux, uy, _ = up
+        if ux < 0.0:
+            ux, uy = -ux, -uy
+        return math.degrees(math.atan2(uy, ux))
+    
+    @staticmethod
+    def world_yaw(gx, gy, gz, up):
+        """
+        Yatay dönüş hızı yerçekimi ekseninde ("player space"): telefon eğik
+        tutulsa da sağa-sola çevirmek yatay harekettir. Yanal eksen (x) pitch'e
+        kaldığı için yalnız y/z katkısı alınır, eğimde kaybolan büyüklük
+        sınırlı olarak telafi edilir.
+        """
+        _, uy, uz = up
+        yaw = gy * uy + gz * uz
+        limit = math.sqrt(gy * gy + gz * gz)
+        yaw *= 1.41
+        if yaw > limit:
+            return limit
+        if yaw < -limit:
+            return -limit
+        return yaw
+
+# ═══════════════════════════════════════════════════════════════
+# DSU (CEMUHOOK) HAREKET SUNUCUSU
+# ═══════════════════════════════════════════════════════════════
+class DsuServer:
+    """
+    Cemu/Dolphin/Yuzu için DSU protokolü (cemuhook, v1001). Telefona bakan
+    soketten ayrı, varsayılan olarak sadece loopback'te dinler. Her telefon
+    bir slota (0-3) oturur; her örnek (gyro/gamepad) tek kez kodlanır ve o
+    slota abone tüm emülatörlere gönderilir. Zaman damgası örnekten gelir.
+    """
+    MAGIC_SERVER = b"DSUS"
+    MAGIC_CLIENT = b"DSUC"
+    VERSION = 1001
+    MSG_VERSION, MSG_PORTS, MSG_DATA = 0x100000, 0x100001, 0x100002
+    SLOTS = 4
+    SUBSCRIBE_TIMEOUT = 5.0     # istemciler isteği periyodik tekrarlar
+    GYRO_SCALE = 500 / 32767    # paket birimi → derece/sn (telefon ±500 dps)
+    
+    HEADER = struct.Struct('<4sHHII')
+    # başlık + tip, slot/durum/model/bağlantı/MAC/pil, bağlı, paket no, butonlar,
+    # PS/touch, stickler, 12 analog, 2 dokunma, hareket zamanı (µs), ivme (g), gyro (dps)
+    DATA = struct.Struct('<4sHHII I BBBB6sB B I BB BB BBBB 12B BBHH BBHH Q 6f')
+    
+    def __init__(self, host="127.0.0.1", port=26761, gyro_map=("-y", "z", "-x")):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind((host, port))
+        self.sock.setblocking(False)
+        self.address = (host, port)
+        self.server_id = int.from_bytes(os.urandom(4), "little")
+        self.slot_of = {}                   # ip → slot
+        self.slots = [None] * self.SLOTS    # slot → ip
+        self.state = [None] * self.SLOTS    # slot → [buttons, lx, ly, rx, ry, l2, r2, zaman_us, ivme, gyro]
+        self.counters = [0] * self.SLOTS
+        self.subs = {}                      # adres → {slot | None (hepsi): son istek}
+        self.ts_wrap = {}                   # ip → (son u32 zaman, taşma ofseti)
+        self.buf = bytearray(self.DATA.size)
+        self.sent = 0
+        self.stale = 0                      # sırası geçmiş (yeniden sıralanmış) örnekler
+        self.gyro_map = tuple(("xyz".index(axis[-1]), -1.0 if axis[0] == "-" else 1.0) for axis in gyro_map)
+        
+        # Buton maskesi → DSU buton baytları (düşük 8 bit ve üst 9 bit için tablolar)
+        face = {0: 0x20, 1: 0x40, 2: 0x10, 3: 0x80, 4: 0x04, 5: 0x08, 6: 0x01, 7: 0x02}
+        self.btn_lo = bytes(sum(v for b, v in face.items() if i >> b & 1) for i in range(256))
+        upper = {8: 0x01, 9: 0x08, 11: 0x02, 12: 0x04, 13: 0x10, 14: 0x40, 15: 0x80, 16: 0x20}
+        self.btn_hi = bytes(sum(v for b, v in upper.items() if i << 8 >> b & 1) for i in range(512))
+    
+    def fileno(self):
+        return self.sock.fileno()
+    
+    def _mac(self, slot):
+        return bytes((0xBE, 0x71, 0x00, 0x00, 0x00, slot))
+    
+    def _slot(self, ip):
+        slot = self.slot_of.get(ip)
+        if slot is None:
+            if None not in self.slots:
+                return None
+            slot = self.slots.index(None)
+            self.slots[slot] = ip
+            self.slot_of[ip] = slot
+            self.state[slot] = [0, 0, 0, 0, 0, 0, 0, time.monotonic_ns() // 1000,
+                                (0.0, 0.0, 0.0), (0.0, 0.0, 0.0)]
+        return slot
+    
+    def forget(self, ip):
+        slot = self.slot_of.pop(ip, None)
+        if slot is not None:
+            self.slots[slot] = None
+            self.state[slot] = None
+        self.ts_wrap.pop(ip, None)
+    
+    # ─── Örnekler ───────────────────────────────────────────────
+    
+    def update_pad(self, ip, buttons, lx, ly, rx, ry, l2, r2):
+        slot = self._slot(ip)
+        if slot is None:
+            return
+        self.state[slot][:7] = (buttons, lx, ly, rx, ry, l2, r2)
+        self.publish(slot)
+    
+    def update_motion(self, ip, gyro, accel=None, sample_us=None):
+        """gyro: paket birimi (x, y, z); accel: g; sample_us: telefonun u32 sensör zamanı"""
+        slot = self._slot(ip)
+        if slot is None:
+            return
+        state = self.state[slot]
+        if sample_us is None:
+            state[7] = time.monotonic_ns() // 1000
+        else:
+            last, offset = self.ts_wrap.get(ip, (sample_us, 0))
+            if (sample_us - last) & 0xFFFFFFFF >= 1 << 31:
+                # Son örnekten eski (yeniden sıralanmış paket): zaman geri gitmez, örnek atlanır
+                self.stale += 1
+                return
+            if sample_us < last:
+                offset += 1 << 32   # ileri yönde u32 taşması
+            self.ts_wrap[ip] = (sample_us, offset)
+            state[7] = sample_us + offset
+        scale = self.GYRO_SCALE
+        state[9] = tuple(gyro[i] * sign * scale for i, sign in self.gyro_map)
+        if accel is not None:
+            state[8] = tuple(accel[i] * sign for i, sign in self.gyro_map)
+        self.publish(slot)
+    
+    def publish(self, slot):
+        """Slotun durumunu bir kez kodla, abonelerin hepsine gönder"""
+        targets = self._targets(slot)
+        if not targets:
+            return
+        buttons, lx, ly, rx, ry, l2, r2, stamp, accel, gyro = self.state[slot]
+        b1 = self.btn_hi[(buttons >> 8) & 0x1FF]
+        b2 = self.btn_lo[buttons & 0xFF]
+        analog = (255 if b1 & 0x80 else 0, 255 if b1 & 0x40 else 0,
+                  255 if b1 & 0x20 else 0, 255 if b1 & 0x10 else 0,
+                  255 if b2 & 0x80 else 0, 255 if b2 & 0x40 else 0,
+                  255 if b2 & 0x20 else 0, 255 if b2 & 0x10 else 0,
+                  255 if b2 & 0x08 else 0, 255 if b2 & 0x04 else 0, r2, l2)
+        self.counters[slot] = counter = (self.counters[slot] + 1) & 0xFFFFFFFF
+        buf = self.buf
+        # Stickler: ±32767 → 0-255 (DSU'da Y yukarı pozitif, uinput'ta aşağı)
+        self.DATA.pack_into(
+            buf, 0, self.MAGIC_SERVER, self.VERSION, len(buf) - 16, 0, self.server_id, self.MSG_DATA,
+            slot, 2, 2, 1, self._mac(slot), 0x05, 1, counter, b1, b2,
+            1 if buttons & 0x400 else 0, 0,
+            (lx >> 8) + 128, ((-ly) >> 8) + 128, (rx >> 8) + 128, ((-ry) >> 8) + 128,
+            *analog, 0, 0, 0, 0, 0, 0, 0, 0, stamp, *accel, *gyro)
+        struct.pack_into('<I', buf, 8, zlib.crc32(buf))
+        sendto = self.sock.sendto
+        for addr in targets:
+            try:
+                sendto(buf, addr)
+            except OSError:
+                pass
+        self.sent += len(targets)
+    
+    def _targets(self, slot):
+        if not self.subs:
+            return ()
+        now = time.monotonic()
+        targets = []
+        for addr, slots in list(self.subs.items()):
+            for key, seen in list(slots.items()):
+                if now - seen > self.SUBSCRIBE_TIMEOUT:
+                    del slots[key]
+            if not slots:
+                del self.subs[addr]
+            elif slot in slots or None in slots:
+                targets.append(addr)
+        return targets
+    
+    # ─── İstekler ───────────────────────────────────────────────
+    
+    def _reply(self, addr, msg_type, body):
+        packet = bytearray(self.HEADER.pack(self.MAGIC_SERVER, self.VERSION, 4 + len(body), 0, self.server_id))
+        packet += struct.pack('<I', msg_type) + body
+        struct.pack_into('<I', packet, 8, zlib.crc32(packet))
+        try:
+            self.sock.sendto(packet, addr)
+        except OSError:
+            pass
+    
+    def drain(self, limit=32):
+        """Emülatör isteklerini işle (olay döngüsünden çağrılır)"""
+        for _ in range(limit):
+            try:
+                data, addr = self.sock.recvfrom(512)
+            except (BlockingIOError, InterruptedError):
+                return
+            if len(data) < 20 or data[:4] != self.MAGIC_CLIENT:
+                continue
+            crc = bytearray(data)
+            crc[8:12] = b"\0\0\0\0"
+            if zlib.crc32(crc) != struct.unpack_from('<I', data, 8)[0]:
+                continue
+            msg_type = struct.unpack_from('<I', data, 16)[0]
+            body = data[20:]
+            if msg_type == self.MSG_VERSION:
+                self._reply(addr, msg_type, struct.pack('<H', self.VERSION))
+            elif msg_type == self.MSG_PORTS and len(body) >= 4:
+                count = min(struct.unpack_from('<i', body)[0], self.SLOTS, len(body) - 4)
+                for slot in body[4:4 + max(count, 0)]:
+                    if slot >= self.SLOTS:
+                        continue
+                    connected = self.slots[slot] is not None
+                    self._reply(addr, msg_type, struct.pack(
+                        '<BBBB6sBB', slot, 2 if connected else 0, 2 if connected else 0,
+                        1 if connected else 0, self._mac(slot) if connected else bytes(6),
+                        0x05 if connected else 0, 0))
+            elif msg_type == self.MSG_DATA and len(body) >= 8:
+                flags, slot, mac = body[0], body[1], bytes(body[2:8])
+                if flags & 0x01:
+                    key = slot if slot < self.SLOTS else None
+                elif flags & 0x02:
+                    key = mac[5] if mac[:5] == self._mac(0)[:5] and mac[5] < self.SLOTS else None
+                else:
+                    key = None
+                if key is None and flags:
+                    continue
+                self.subs.setdefault(addr, {})[key] = time.monotonic()
+    
+    def close(self):
+        self.sock.close()
+
+# ═══════════════════════════════════════════════════════════════
+# ÇALIŞMA ZAMANI PROFİLLEYİCİ
+# ═══════════════════════════════════════════════════════════════
+class LoopProfiler:
+    """
+    Paket döngüsünü yeniden başlatmadan profille. start()/stop() döngü
+    thread'inden çağrılmalı (sinyal işleyicisi ve zamanlayıcılar orada çalışır).
+      cprofile: deterministik, .pstats dosyası (snakeviz, pstats ile açılır)
+      sample  : ayrı thread döngü thread'inin yığınını örnekler, .collapsed
+                dosyası (flamegraph.pl / speedscope); ek yük örnekleme aralığına bağlı
+    Her iki modda da handler ve backend çağrılarının özeti .txt olarak yazılır.
+    """
+    MODES = ("cprofile", "sample")
+    
+    def __init__(self, mode="cprofile", out_dir=".", interval=0.001):
+        if mode not in self.MODES:
+            raise ValueError(f"Geçersiz profil modu: {mode}")
+        self.mode = mode
+        self.out_dir = out_dir
+        self.interval = interval
+        self.active = False
+        self.started = 0.0
+        self.profile = None
+        self.samples = {}
+        self.sampler = None
+        self.stop_event = threading.Event()
+    
+    def start(self):
+        if self.active:
+            return
+        self.active = True
+        self.started = time.monotonic()
+        if self.mode == "cprofile":
+            import cProfile
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+        else:
+            self.samples = {}
+            self.stop_event.clear()
+            self.sampler = threading.Thread(target=self._sample_loop,
+                                            args=(threading.get_ident(),), daemon=True)
+            self.sampler.start()
+    
+    def _sample_loop(self, thread_id):
+        samples = self.samples
+        while not self.stop_event.wait(self.interval):
+            frame = sys._current_frames().get(thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append((code.co_filename, code.co_firstlineno, code.co_name))
+                frame = frame.f_back
+            stack = tuple(reversed(stack))
+            samples[stack] = samples.get(stack, 0) + 1
+    
+    def stop(self, handlers, backend_calls, top=10):
+        """
+        Profili durdur, dosyaları yaz.
+        handlers/backend_calls: {(dosya, satır, isim): etiket} - özette gruplanacak fonksiyonlar
+        Dönüş: (yazılan dosyalar, özet satırları)
+        """
+        if not self.active:
+            return [], []
+        self.active = False
+        elapsed = time.monotonic() - self.started
+        base = os.path.join(self.out_dir, f"benim_profile_{datetime.now():%Y%m%d_%H%M%S}")
+        
+        if self.mode == "cprofile":
+            import pstats
+            self.profile.disable()
+            files = [base + ".pstats"]
+            self.profile.dump_stats(files[0])
+            raw = pstats.Stats(self.profile).stats
+            self.profile = None
+            # Fonksiyon başına kümülatif süre (sn) ve çağrı sayısı
+            totals = {key: (value[3], value[1]) for key, value in raw.items()}
+            unit = "sn"
+        else:
+            self.stop_event.set()
+            self.sampler.join()
+            files = [base + ".collapsed"]
+            with open(files[0], "w") as f:
+                for stack, count in self.samples.items():
+                    names = ";".join(f"{name} ({os.path.basename(fn)}:{line})" for fn, line, name in stack)
+                    f.write(f"{names} {count}\n")
+            # Fonksiyon başına kapsayıcı örnek sayısı (yığında bir kez sayılır)
+            totals = {}
+            for stack, count in self.samples.items():
+                for key in set(stack):
+                    hits, _ = totals.get(key, (0, 0))
+                    totals[key] = (hits + count, 0)
+            unit = "örnek"
+        
+        lines = [f"Profil ({self.mode}, {elapsed:.1f} sn)"]
+        for title, group in (("Handler", handlers), ("Backend", backend_calls)):
+            ranked = sorted(((totals[key], label) for key, label in group.items() if key in totals),
+                            reverse=True)[:top]
+            lines.append(f"{title}:")
+            for (value, calls), label in ranked:
+                detail = f" ({calls:,} çağrı)" if calls else ""
+                lines.append(f"  {value:10.4f} {unit}  {label}{detail}" if unit == "sn"
+                             else f"  {value:10,} {unit}  {label}")
+        files.append(base + ".txt")
+        with open(files[-1], "w") as f:
+            f.write("\n".join(lines) + "\n")
+        return files, lines
+
+# ═══════════════════════════════════════════════════════════════
+# KONTROL SOKETİ
+# ═══════════════════════════════════════════════════════════════
+def _bounded(parse, low, high):
+    """Ayrıştırıcı + aralık kontrolü: NaN ve sınır dışı değerde ValueError"""
+    def parse_bounded(raw):
+        value = parse(raw)
+        if not low <= value <= high:    # NaN her karşılaştırmada False
+            raise ValueError(f"{raw}: {low:g}..{high:g} aralığı dışında")
+        return value
+    return parse_bounded
+
+class ControlServer:
+    """
+    Unix domain soket üzerinden satır tabanlı komutlar, yanıt tek satır JSON.
+    Bağlantılar kendi thread'lerinde işlenir; canlı duruma dokunan her şey
+    UdpServer.call_in_loop() ile paket döngüsüne devredilir (paketler arasında,
+    tek adımda). LUT gibi ağır hesaplar döngü dışında yapılır.
+    
+      stats | clients | get | set ayar=değer ... | log [kategori on|off ...]
+      profile [sn|stop] | capture sn [yol] | macro [BUTON=eylem|off ...]
+      auth [off|optional|required | revoke ip] | help
+    """
+    # ayar: (Config alanı, ayrıştırıcı); sayılar komut satırıyla aynı sınırlarda
+    SETTINGS = {
+        "mouse_sensitivity": ("MOUSE_SENSITIVITY", _bounded(float, 0.0, 100.0)),
+        "scroll_sensitivity": ("SCROLL_SENSITIVITY", _bounded(float, 0.0, 100.0)),
+        "trigger_deadzone": ("TRIGGER_DEADZONE", _bounded(int, 0, 255)),
+        "joystick_as_mouse": ("JOYSTICK_AS_MOUSE", "bool"),
+        "gyro_mouse": ("GYRO_AS_MOUSE", "bool"),
+        "gyro_sensitivity": ("GYRO_SENSITIVITY", _bounded(float, 0.0, 100.0)),
+        "gyro_world_yaw": ("GYRO_WORLD_YAW", "bool"),
+        "tilt_steer": ("TILT_STEER", ImuFusion.parse_axis),
+        "tilt_range": ("TILT_STEER_RANGE", _bounded(float, 1.0, 180.0)),
+        "tilt_deadzone": ("TILT_STEER_DEADZONE", _bounded(float, 0.0, 90.0)),
+        "verify_checksum": ("VERIFY_CHECKSUM", "bool"),
+        "input_deadline": ("INPUT_DEADLINE", _bounded(float, 0.0, 3600.0)),
+        "pointer": ("POINTER_PROFILE", str),
+    }
+    LOG_CATEGORIES = {
+        "packets": "LOG_PACKETS",
+        "mouse_move": "LOG_MOUSE_MOVE",
+        "raw_bytes": "LOG_RAW_BYTES",
+        "gyro": "LOG_GYRO",
+        "buttons": "LOG_BUTTONS",
+    }
+    
+    def __init__(self, server, path):
+        self.server = server
+        self.path = path
+        self.closing = False
+        self.capture_lock = threading.Lock()
+        
+        # Eski soket dosyası: canlı bir sunucuya aitse dokunma
+        if os.path.exists(path):
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(path)
+                raise OSError(f"{path} başka bir sunucu tarafından kullanılıyor")
+            except (ConnectionRefusedError, FileNotFoundError):
+                os.unlink(path)
+            finally:
+                probe.close()
+        
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        old_umask = os.umask(0o177)
+        try:
+            self.sock.bind(path)
+        finally:
+            os.umask(old_umask)
+        self.sock.listen(4)
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+    
+    def _accept_loop(self):
+        while not self.closing:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return
+            if self.closing:
+                conn.close()
+                return
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+    
+    def _serve(self, conn):
+        with conn, conn.makefile("rwb") as stream:
+            for line in stream:
+                reply = self.handle(line.decode(errors="replace").strip())
+                stream.write(json.dumps(reply, ensure_ascii=False).encode() + b"\n")
+                stream.flush()
+    
+    def handle(self, line):
+        parts = line.split()
+        if not parts:
+            return {"ok": False, "error": "boş komut"}
+        command = getattr(self, "cmd_" + parts[0], None)
+        if command is None:
+            return {"ok": False, "error": f"bilinmeyen komut: {parts[0]}"}
+        try:
+            return {"ok": True, "result": command(*parts[1:])}
+        except Exception as e:
+            return {"ok": False, "error": str(e) or type(e).__name__}
+    
+    def close(self):
+        self.closing = True
+        try:
+            # accept() bekleyen thread'i uyandır
+            wake = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            wake.connect(self.path)
+            wake.close()
+        except OSError:
+            pass
+        self.sock.close()
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+    
+    @staticmethod
+    def _parse_bool(raw):
+        value = raw.lower()
+        if value in ("1", "on", "true", "evet"):
+            return True
+        if value in ("0", "off", "false", "hayır"):
+            return False
+        raise ValueError(f"on/off bekleniyor: {raw}")
+    
+    # ─── Komutlar ───────────────────────────────────────────────
+    
+    def cmd_help(self):
+        return {"commands": [line.strip() for line in self.__doc__.strip().splitlines()[-3:]],
+                "settings": sorted(self.SETTINGS) + ["stick=[left|right|both:]k=v,..."],
+                "log": sorted(self.LOG_CATEGORIES)}
+    
+    def cmd_stats(self):
+        server = self.server
+        stats = dict(server.stats)
+        stats["uptime"] = round(time.time() - server.start_time, 1)
+        stats["backend"] = server.backend.name if server.backend else None
+        if isinstance(server.backend, BackendSupervisor):
+            stats["backend_health"] = server.backend.health.as_dict()
+        if server.admission:
+            stats["admission"] = dict(server.admission.stats)
+        stats["auth"] = dict(server.auth.stats, mode=server.auth.mode, clients=len(server.auth.sessions))
+        stats["profiling"] = server.profiler.active
+        stats["wakeups_per_sec"] = round(stats["wakeups"] / max(stats["uptime"], 1e-9), 3)
+        stats["macros_fired"] = server.macros.fired
+        return stats
+    
+    def cmd_clients(self):
+        return self.server.call_in_loop(self.server.client_states)
+    
+    def cmd_get(self):
+        values = {name: getattr(Config, attr) for name, (attr, _) in self.SETTINGS.items()}
+        values["stick"] = {side: {k: v for k, v in profile.items() if v is not None}
+                           for side, profile in Config.STICK_PROFILES.items()}
+        return values
+    
+    def cmd_set(self, *assignments):
+        """
+        Tüm değerleri önce doğrula/hesapla, sonra döngüde tek adımda uygula;
+        tek bir geçersiz değer bütün komutu reddeder (hiçbiri uygulanmaz)
+        """
+        if not assignments:
+            raise ValueError("set ayar=değer [ayar=değer ...]")
+        updates = {}
+        profiles = None
+        for item in assignments:
+            key, sep, raw = item.partition("=")
+            if not sep:
+                raise ValueError(f"ayar=değer bekleniyor: {item}")
+            if key == "stick":
+                sides, values = StickCurve.parse_spec(raw)
+                if profiles is None:
+                    profiles = {side: dict(p) for side, p in Config.STICK_PROFILES.items()}
+                for side in sides:
+                    profiles[side].update(values)
+            elif key in self.SETTINGS:
+                attr, parse = self.SETTINGS[key]
+                try:
+                    updates[attr] = self._parse_bool(raw) if parse == "bool" else parse(raw)
+                except ValueError as e:
+                    raise ValueError(f"{key}: {e}") from None
+            else:
+                raise ValueError(f"bilinmeyen ayar: {key}")
+        
+        server = self.server
+        sticks = server.build_stick_curves(profiles) if profiles else None
+        pointer = None
+        if "POINTER_PROFILE" in updates or "MOUSE_SENSITIVITY" in updates:
+            pointer = server.build_pointer_accel(updates.get("POINTER_PROFILE"),
+                                                 updates.get("MOUSE_SENSITIVITY"))
+        
+        def swap():
+            for attr, value in updates.items():
+                setattr(Config, attr, value)
+            if sticks:
+                Config.STICK_PROFILES = profiles
+                server.stick_curves, server.stick_luts = sticks
+            if pointer:
+                server.pointer = pointer
+        
+        server.call_in_loop(swap)
+        server.log(f"Kontrol: {' '.join(assignments)}", level="OK")
+        return self.cmd_get()
+    
+    def cmd_log(self, *changes):
+        if len(changes) % 2:
+            raise ValueError("log [kategori on|off ...]")
+        updates = {}
+        for name, raw in zip(changes[::2], changes[1::2]):
+            if name not in self.LOG_CATEGORIES:
+                raise ValueError(f"bilinmeyen log kategorisi: {name}")
+            updates[self.LOG_CATEGORIES[name]] = self._parse_bool(raw)
+        for attr, value in updates.items():
+            setattr(Config, attr, value)
+        return {name: getattr(Config, attr) for name, attr in self.LOG_CATEGORIES.items()}
+    
+    def cmd_macro(self, *assignments):
+        """Makroları listele/değiştir: macro A=turbo:space@15 X=off"""
+        server = self.server
+        if not assignments:
+            return server.call_in_loop(server.macros.describe)
+        specs = {}
+        for item in assignments:
+            name, sep, spec = item.partition("=")
+            if not sep:
+                raise ValueError(f"BUTON=eylem bekleniyor: {item}")
+            MacroEngine.button_mask(name)
+            if spec != "off":
+                MacroEngine.parse(spec)
+            specs[name.upper()] = spec
+        
+        def apply():
+            server.macros.configure(specs)
+            Config.MACROS = server.macros.describe()
+            return Config.MACROS
+        
+        result = server.call_in_loop(apply)
+        server.log(f"Kontrol: macro {' '.join(assignments)}", level="OK")
+        return result
+    
+    def cmd_auth(self, arg=None, ip=None):
+        """Doğrulama modu / eşleşmiş istemciler; revoke ip anahtarı siler"""
+        server = self.server
+        auth = server.auth
+        if arg == "revoke":
+            if not ip:
+                raise ValueError("auth revoke ip")
+            if not server.call_in_loop(lambda: auth.revoke(ip)):
+                raise ValueError(f"eşleşmiş istemci yok: {ip}")
+            server.log("Kontrol: anahtar silindi", ip, "OK")
+        elif arg is not None:
+            if arg not in PacketAuth.MODES:
+                raise ValueError(f"mod {'|'.join(PacketAuth.MODES)} olmalı")
+            server.call_in_loop(lambda: (setattr(auth, "mode", arg), setattr(Config, "AUTH_MODE", arg)))
+            server.log(f"Kontrol: auth {arg}", level="OK")
+        return server.call_in_loop(lambda: {
+            "mode": auth.mode,
+            "clients": {ip: f"{s.code:06d}" for ip, s in auth.sessions.items()},
+            "pending": sorted(auth.pending),
+        })
+    
+    def cmd_profile(self, arg=None):
+        server = self.server
+        if arg == "stop":
+            return {"files": server.call_in_loop(server.stop_profile)}
+        duration = float(arg) if arg else None
+        if not server.call_in_loop(lambda: server.start_profile(duration)):
+            raise ValueError("profil zaten çalışıyor")
+        return {"mode": server.profiler.mode, "duration": duration or Config.PROFILE_DURATION}
+    
+    def cmd_capture(self, seconds, path=None):
+        """Gelen ham paketleri süre boyunca topla ve dosyaya yaz (bu thread bekler)"""
+        seconds = float(seconds)
+        if not 0 < seconds <= 600:
+            raise ValueError("süre 0-600 sn olmalı")
+        if not self.capture_lock.acquire(blocking=False):
+            raise ValueError("yakalama zaten çalışıyor")
+        server = self.server
+        try:
+            server.call_in_loop(lambda: setattr(server, "capture", []))
+            time.sleep(seconds)
+            packets = server.call_in_loop(lambda: (server.capture, setattr(server, "capture", None))[0])
+        finally:
+            self.capture_lock.release()
+        
+        path = path or os.path.join(Config.PROFILE_DIR, f"benim_capture_{datetime.now():%Y%m%d_%H%M%S}.txt")
+        start = packets[0][0] if packets else 0.0
+        with open(path, "w") as f:
+            f.write("# zaman_sn ip paket_hex\n")
+            for t, ip, data in packets:
+                f.write(f"{t - start:.6f} {ip} {data.hex()}\n")
+        return {"file": path, "packets": len(packets)}
+
+def control_request(path, command):
+    """Kontrol soketine tek komut gönder → yanıt sözlüğü (bağlanamazsa OSError)"""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    with sock:
+        sock.connect(path)
+        with sock.makefile("rwb") as stream:
+            stream.write(command.encode() + b"\n")
+            stream.flush()
+            line = stream.readline()
+    return json.loads(line) if line else {"ok": False, "error": "yanıt yok"}
+
+def run_control_client(path, command):
+    """--ctl: kontrol soketine tek komut gönder, yanıtı yazdır"""
+    try:
+        reply = control_request(path, command)
+    except OSError as e:
+        print(f"❌ Kontrol soketine bağlanılamadı ({path}): {e}")
+        return 1
+    if not reply.get("ok"):
+        print(f"❌ {reply.get('error')}")
+        return 1
+    print(json.dumps(reply.get("result"), ensure_ascii=False, indent=2))
+    return 0
+
+# ═══════════════════════════════════════════════════════════════
+# UDP SERVER
+# ═══════════════════════════════════════════════════════════════
+class UdpServer:
+    def __init__(self, port=None):
+        self.port = port or Config.UDP_PORT
+        self.running = False
+        self.backend = None
+        self.sock = None
+        self.prev_buttons = {}
+        self.last_activity = {}
+        self.start_time = time.time()
+        self.stats = {
+            'packets': 0,
+            'pings': 0,
+            'mouse_moves': 0,
+            'clicks': 0,
+            'gamepad': 0,
+            'gyro': 0,
+            'checksum_ok': 0,
+            'checksum_fail': 0,
+            'delta': 0,
+            'keyframe_requests': 0,
+            'input_releases': 0,
+            'rumble': 0,
+            'upsampled': 0,
+            'touches': 0,
+            'failovers': 0,
+            'imu': 0,
+            'edges': 0,
+            'edges_recovered': 0,
+            'stale_frames': 0,
+            'wakeups': 0,
+            'timer_wakeups': 0
+        }
+        
+        # Thread güvenliği için lock
+        self.lock = threading.Lock()
+        
+        # Stick LUT'ları (tek atamayla değiştirilir)
+        self.stick_curves, self.stick_luts = self.build_stick_curves()
+        
+        # Touchpad ivmelenme
+        self.pointer = self.build_pointer_accel()
+        
+        # Mutlak dokunma: telefon yüzeyi → ekran bölgesi (0-65535 tamsayı ölçek)
+        x0, y0, x1, y1 = Config.TOUCH_REGION
+        self.touch_map = (int(x0 * 65535), int((x1 - x0) * 65536),
+                          int(y0 * 65535), int((y1 - y0) * 65536))
+        self.touch_contacts = {}    # ip → basılı temas id'leri
+        self.scroll_rest = {}       # ip → (dikey, yatay) kesirli hi-res kaydırma
+        
+        # IMU füzyonu ve eğimle direksiyon
+        self.fusion = ImuFusion(Config.IMU_FUSION_BETA)
+        self.tilt_steer = {}        # ip → son yazılan direksiyon değeri
+        self.pad_axes = {}          # ip → son yazılan (lx, ly, rx, ry, l2, r2)
+        
+        # Buton kenarı yedekliliği: istemci başına son uygulanan kenar sırası
+        self.edge_seq = {}
+        
+        # Delta gamepad: istemci başına son keyframe (taban id, 12 byte)
+        self.gamepad_keys = {}
+        self.keyframe_asked = {}    # ip → son keyframe isteği zamanı
+        fields = ((1, 2, 3, 4), (5,), (6,), (7,), (8,), (9,), (10,))   # buton, lx, ly, rx, ry, l2, r2
+        self.delta_plan = [tuple(off for bit, field in enumerate(fields) if mask >> bit & 1 for off in field)
+                           for mask in range(1 << len(fields))]
+        
+        # Rumble hedefi: son gamepad paketini gönderen telefon
+        self.rumble_target = None
+        
+        # Takılı girdi koruması (istemci başına son tarih)
+        self.held_mouse = {}        # ip → basılı mouse butonları
+        self.gamepad_active = {}    # nötr olmayan gamepad durumu olan ip → son eksenler
+        self.deadlines = DeadlineScheduler(self._deadline_expired)
+        self.resync = set()         # son tarihte bırakılan, tam durumu yeniden istenecek ip
+        self.expiry = DeadlineScheduler(self._expire_client)
+        
+        # Stick/tetik upsampling (isteğe bağlı)
+        self.upsampler = None
+        if Config.UPSAMPLE_RATE:
+            self.upsampler = AxisUpsampler(Config.UPSAMPLE_RATE, Config.UPSAMPLE_MODE, Config.UPSAMPLE_HORIZON)
+        self.upsample_timers = DeadlineScheduler(self._upsample_tick)
+        self.timers = (self.deadlines, self.upsample_timers, self.expiry)
+        
+        # İsteğe bağlı profil (SIGUSR1)
+        self.profiler = LoopProfiler(Config.PROFILE_MODE, Config.PROFILE_DIR, Config.PROFILE_SAMPLE_INTERVAL)
+        self.profile_timer = DeadlineScheduler(lambda _: self.stop_profile())
+        self.timers += (self.profile_timer,)
+        
+        # Buton makroları (klavye/gamepad); adımlar ms çözünürlüklü zamanlayıcı çarkında
+        self.macro_wheel = TimerWheel()
+        self.macros = MacroEngine(self.macro_wheel, self._macro_key, self._macro_pad)
+        self.macros.configure(Config.MACROS)
+        self.timers += (self.macro_wheel,)
+        
+        # Kontrol soketi ve döngüye devredilen çağrılar (start() içinde açılır)
+        self.control = None
+        self.loop_calls = deque()   # (fonksiyon, Future)
+        self.loop_thread = None
+        self.wake_r = self.wake_w = None
+        self.capture = None         # kontrol komutuyla açılan ham paket yakalama listesi
+        self.selector = None
+        
+        # DSU hareket sunucusu (start() içinde açılır)
+        self.dsu = None
+        
+        # Paylaşımlı bellek dışa aktarımı (start() içinde açılır)
+        self.exporter = None
+        
+        # Kabul kontrolü
+        self.admission = None
+        if Config.ADMISSION_ENABLED:
+            self.admission = AdmissionControl(
+                Config.ADMISSION_RATES,
+                default_rate=Config.ADMISSION_DEFAULT_RATE,
+                max_clients=Config.MAX_CLIENTS,
+                allowlist=Config.ALLOWLIST,
+                pairing_window=Config.PAIRING_WINDOW
+            )
+        
+        # Paket kimlik doğrulama (eşleştirme DISCOVER ile)
+        self.auth = PacketAuth(Config.AUTH_MODE, Config.MAX_CLIENTS,
+                               pair_rate=Config.AUTH_PAIR_RATE, max_pending=Config.AUTH_MAX_PENDING)
+    
+    def build_stick_curves(self, profiles=None):
+        """Stick profillerinden (varsayılan Config.STICK_PROFILES) sol/sağ tabloları hesapla"""
+        profiles = profiles or Config.STICK_PROFILES
+        curves = {side: StickCurve(**profiles[side]) for side in ("left", "right")}
+        left, right = curves["left"], curves["right"]
+        return curves, (left.table_x, left.table_y, right.table_x, right.table_y)
+    
+    def build_pointer_accel(self, profile=None, sensitivity=None):
+        """Config'ten (veya verilen profil/hassasiyetten) pointer ivmelenme tablosunu hesapla"""
+        return PointerAccel(
+            profile or Config.POINTER_PROFILE,
+            sensitivity=Config.MOUSE_SENSITIVITY if sensitivity is None else sensitivity,
+            points=Config.POINTER_POINTS,
+            **Config.POINTER_ACCEL
+        )
+    
+    def _get_ip(self):
+        try:
+            s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            s.connect(("8.8.8.8", 80))
+            ip = s.getsockname()[0]
+            s.close()
+            return ip
+        except Exception:
+            return "127.0.0.1"
+    
+    def _print_banner(self):
+        ip = self._get_ip()
+        display = os.environ.get('XDG_SESSION_TYPE', 'x11').upper()
+        
+        print()
+        print("═" * 62)
         print("  🎮 Benim Gamepad/Mouse Server")
         print("═" * 62)
         print(f"  📌 Versiyon  : {VERSION}")
@@ -488,6 +3552,9 @@ class UdpServer:
             print(f"  🔧 Backend   : {info['name']}")
             print(f"  📦 Kütüphane : {info['library']}")
             print(f"  ⚙️  Yöntem    : {info['method']}")
+            if Config.FAILOVER_ENABLED:
+                print(f"  🩺 Failover  : {Config.HEALTH_MAX_ERRORS} hata / {Config.HEALTH_SLOW_MS:g} ms → "
+                      f"{' → '.join(cls.name for cls in backend_order())}")
         
         print("─" * 62)
         print("  📦 Paket: 12 Byte [Hdr][Btn 4B][LX][LY][RX][RY][L2][R2][XOR]")
@@ -495,9 +3562,32 @@ class UdpServer:
         print("  🎮 Butonlar: A B X Y L1 R1 L2 R2 SEL START HOME L3 R3 D-PAD")
         print("─" * 62)
         print(f"  🐛 Debug     : {'AÇIK ✓' if Config.DEBUG_MODE else 'KAPALI'}")
-        print(f"  🔐 Checksum  : {'AÇIK ✓' if Config.VERIFY_CHECKSUM else 'KAPALI'}")
+        print(f"  🔐 Checksum  : {'AÇIK ✓' if Config.VERIFY_CHECKSUM else 'KAPALI'}"
+              + (" (eşleşmiş istemcilerde MAC)" if self.auth.mode != "off" else ""))
+        print(f"  🔑 Doğrulama : {self.auth.describe()}")
+        if self.backend and self.backend.ff_fileno() is not None:
+            print(f"  📳 Rumble    : AÇIK ✓ (→ son aktif telefon, 0x{Config.PACKET_RUMBLE:02X})")
         print(f"  🌀 Gyro Mouse: {'AÇIK ✓' if Config.GYRO_AS_MOUSE else 'KAPALI'}")
         print(f"  📊 Gyro Sens : {Config.GYRO_SENSITIVITY}")
+        print(f"  🧭 IMU       : Madgwick β={Config.IMU_FUSION_BETA:g} (0x{Config.PACKET_IMU:02X})"
+              + (", dünya ekseninde yaw" if Config.GYRO_WORLD_YAW else ""))
+        if Config.TILT_STEER:
+            print(f"  🏎️  Eğim      : {Config.TILT_STEER} ← ±{Config.TILT_STEER_RANGE:g}°"
+                  f" (ölü bölge {Config.TILT_STEER_DEADZONE:g}°)")
+        if self.macros.macros:
+            print("  ⌨️  Makrolar  : " + ", ".join(f"{b}={a}" for b, a in self.macros.describe().items()))
+        print(f"  🖱️  Pointer   : {self.pointer.describe()}")
+        print(f"  👆 Dokunma   : {Config.TOUCH_MODE} (0x{Config.PACKET_TOUCH_ABS:02X}), bölge {Config.TOUCH_REGION}")
+        if self.exporter:
+            print(f"  🧩 SHM Export: {self.exporter.path} ({self.exporter.slots} slot)")
+        if self.dsu:
+            print(f"  🕹️  DSU       : {self.dsu.address[0]}:{self.dsu.address[1]} (cemuhook, {DsuServer.SLOTS} slot)")
+        if self.upsampler:
+            print(f"  ⏩ Upsample  : {self.upsampler.describe()}")
+        if self.admission:
+            print(f"  🛡️  Kabul     : {self.admission.describe()}")
+        print(f"  🕹️  Sol Stick : {self.stick_curves['left'].describe()}")
+        print(f"  🕹️  Sağ Stick : {self.stick_curves['right'].describe()}")
         print("═" * 62)
     
     def log(self, msg, client=None, level="INFO"):
@@ -534,7 +3624,10 @@ class UdpServer:
     
     def handle_ping(self, data, addr):
         if len(data) >= 9:
-            self.sock.sendto(data, addr)
+            caps = Config.CAP_GAMEPAD_DELTA | Config.CAP_IMU | Config.CAP_BUTTON_EDGES
+            if addr[0] in self.auth.sessions:
+                caps |= Config.CAP_AUTH     # yoksa (sunucu yeniden başladı) telefon yeniden eşleşir
+            self.sock.sendto(data[:9] + bytes((caps,)), addr)
             self.stats['pings'] += 1
             if Config.LOG_PACKETS:
                 self.log("Ping echo", addr[0], "PING")
@@ -543,8 +3636,8 @@ class UdpServer:
         if len(data) < 12 or not self.backend:
             return
         
-        # Checksum
-        if Config.VERIFY_CHECKSUM:
+        # Checksum (eşleşmiş istemcide paket MAC ile zaten doğrulandı)
+        if Config.VERIFY_CHECKSUM and addr[0] not in self.auth.sessions:
             if self._verify_checksum(data):
                 self.stats['checksum_ok'] += 1
             else:
@@ -553,21 +3646,187 @@ class UdpServer:
                     self.log("Checksum HATA!", addr[0], "CHECKSUM")
                 return
         
+        if len(data) > 13 and not self._apply_edges(addr[0], data[12:]):
+            return
+        
+        # Numarasız tam paket (delta kullanmayan istemci): delta tabanı olmaz
+        self.gamepad_keys.pop(addr[0], None)
+        self._apply_gamepad(data[:12], addr)
+    
+    def handle_gamepad_keyframe(self, data, addr):
+        """
+        Numaralı keyframe: [0x07][keyframe id u16 LE][butonlar u32][4 stick][2 tetik][XOR]
+        Telefon her keyframe'de id'yi bir artırır; deltalar bu id'ye göre gelir.
+        XOR'dan sonra isteğe bağlı buton kenarı eki gelebilir (bkz. _apply_edges).
+        """
+        if len(data) < 14 or not self.backend:
+            return
+        
+        if Config.VERIFY_CHECKSUM and addr[0] not in self.auth.sessions:
+            xor = 0
+            for b in data[:13]:
+                xor ^= b
+            if xor != data[13]:
+                self.stats['checksum_fail'] += 1
+                if Config.LOG_PACKETS:
+                    self.log("Keyframe checksum HATA!", addr[0], "CHECKSUM")
+                return
+            self.stats['checksum_ok'] += 1
+        
+        if len(data) > 15 and not self._apply_edges(addr[0], data[14:]):
+            return
+        
+        # Tam paket biçiminde id ile saklanır: deltalar buna göre uygulanır
+        frame = bytearray(data[2:13])
+        frame[0] = Config.PACKET_GAMEPAD
+        xor = 0
+        for b in frame:
+            xor ^= b
+        frame.append(xor)
+        frame = bytes(frame)
+        self.gamepad_keys[addr[0]] = (data[1] | (data[2] << 8), frame)
+        self._apply_gamepad(frame, addr)
+    
+    def handle_gamepad_delta(self, data, addr):
+        """
+        Delta Gamepad Paketi: [0x06][taban id u16 LE][maske][alanlar...][XOR]
+        maske bit0 = butonlar (4 byte), bit1-4 = lx/ly/rx/ry, bit5-6 = l2/r2.
+        Alanlar zincirlenmez, hep son keyframe'e göre: kayıp delta sonrakini bozmaz.
+        XOR'dan sonra isteğe bağlı buton kenarı eki gelebilir (bkz. _apply_edges).
+        """
+        if len(data) < 5 or not self.backend:
+            return
+        
+        plan = self.delta_plan[data[3] & 0x7F]
+        size = len(plan) + 5
+        if len(data) < size:
+            return
+        
+        if Config.VERIFY_CHECKSUM and addr[0] not in self.auth.sessions:
+            xor = 0
+            for b in data[:size - 1]:
+                xor ^= b
+            if xor != data[size - 1]:
+                self.stats['checksum_fail'] += 1
+                if Config.LOG_PACKETS:
+                    self.log("Delta checksum HATA!", addr[0], "CHECKSUM")
+                return
+            self.stats['checksum_ok'] += 1
+        
+        if len(data) > size + 1 and not self._apply_edges(addr[0], data[size:]):
+            return
+        
+        key = self.gamepad_keys.get(addr[0])
+        if key is None or key[0] != data[1] | (data[2] << 8):
+            self._request_keyframe(addr)
+            return
+        
+        frame = bytearray(key[1])
+        for i, off in enumerate(plan, 4):
+            frame[off] = data[i]
+        self.stats['delta'] += 1
+        self._apply_gamepad(frame, addr)
+    
+    def _apply_edges(self, ip, trailer):
+        """
+        Buton kenarı eki: [n][n × (sıra u16 LE, kenar)][XOR]
+        kenar: bit0-4 = buton biti, bit7 = basıldı; eskiden yeniye sıralı.
+        Telefon son K kenarı her pakette tekrarlar: kaybolan paketin taşıdığı
+        basma/bırakma sonraki pakette yine gelir. İstemci başına son uygulanan
+        sıra tutulur, yeni kenarlar sırayla ve bir kez uygulanır; paketin buton
+        maskesi ardından her zamanki gibi fark alınır.
+        False: paket bilinen son kenardan eski (yeniden sıralanmış) → atlanmalı.
+        """
+        n = trailer[0]
+        end = 1 + 3 * n
+        if not n or len(trailer) <= end:
+            return True
+        xor = 0
+        for b in trailer[:end]:
+            xor ^= b
+        if xor != trailer[end]:
+            self.stats['checksum_fail'] += 1
+            return True     # ek bozuk: maske farkı yine çalışır
+        
+        last = self.edge_seq.get(ip)
+        newest = trailer[end - 3] | (trailer[end - 2] << 8)
+        if last is not None:
+            ahead = (newest - last) & 0xFFFF
+            if ahead == 0:
+                return True
+            if ahead >= 0x8000:
+                if 0x10000 - ahead <= Config.EDGE_STALE_WINDOW:
+                    self.stats['stale_frames'] += 1
+                    return False
+                last = None     # büyük geri sıçrama: uygulama yeniden başlamış
+        if last is None:
+            # Taban yok (ilk temas, unutulmuş istemci, yeniden başlama): geçmiş
+            # kenarlar uygulanmaz (hayalet basışlar), sadece sıra kaydedilir;
+            # paketin buton maskesi her zamanki gibi uygulanır
+            self.edge_seq[ip] = newest
+            return True
+        
+        backend = self.backend
+        macros = self.macros if self.macros.mapped else None
+        prev = self.prev_buttons.get(ip, 0)
+        raw = macros.raw_state(ip, prev) if macros else prev
+        for off in range(1, end, 3):
+            seq = trailer[off] | (trailer[off + 1] << 8)
+            if not 0 < (seq - last) & 0xFFFF < 0x8000:
+                continue
+            last = seq
+            edge = trailer[off + 2]
+            mask = 1 << (edge & 0x1F)
+            raw = raw | mask if edge & 0x80 else raw & ~mask
+            if macros:
+                # Makro gamepad hedefi basmış olabilir: çıkış durumu yeniden okunur
+                buttons = macros.feed(ip, raw, time.monotonic())
+                prev = self.prev_buttons.get(ip, 0)
+            else:
+                buttons = raw
+            if buttons != prev:
+                # Her kenar ayrı rapor: aynı pakette gelen bas-bırak da görünür
+                backend.gamepad_buttons(buttons, prev)
+                backend.flush()
+                self.prev_buttons[ip] = prev = buttons
+            self.stats['edges'] += 1
+            if seq != newest:
+                self.stats['edges_recovered'] += 1
+        self.edge_seq[ip] = last
+        return True
+    
+    def _request_keyframe(self, addr):
+        """Taban durumu yok/eski: telefondan tam paket iste (istemci başına sınırlı)"""
+        now = time.monotonic()
+        if now - self.keyframe_asked.get(addr[0], 0) < Config.KEYFRAME_REQUEST_INTERVAL:
+            return
+        self.keyframe_asked[addr[0]] = now
+        try:
+            self.sock.sendto(bytes((Config.PACKET_KEYFRAME,)), addr)
+        except OSError:
+            return
+        self.stats['keyframe_requests'] += 1
+        if Config.LOG_PACKETS:
+            self.log("Taban yok, keyframe istendi", addr[0], "GAMEPAD")
+    
+    def _apply_gamepad(self, data, addr):
+        """Tam 12 byte'lık gamepad durumunu uygula (tam paket ve delta ortak yolu)"""
         ip = addr[0]
+        self.rumble_target = addr
         
         # Unpack
         buttons = struct.unpack('<I', data[1:5])[0]
-        lx = self._signed(data[5])
-        ly = self._signed(data[6])
-        rx = self._signed(data[7])
-        ry = self._signed(data[8])
         l2 = data[9]
         r2 = data[10]
         
         if Config.LOG_RAW_BYTES:
+            lx, ly, rx, ry = (self._signed(b) for b in data[5:9])
             self.log(f"RAW btn=0x{buttons:08X} L({lx:4},{ly:4}) R({rx:4},{ry:4}) T:{l2:3}/{r2:3}", ip, "DEBUG")
         
-        # Butonlar
+        # Butonlar (makrolu butonlar ayıklanır, makroların bastıkları eklenir)
+        raw = buttons
+        if self.macros.mapped:
+            buttons = self.macros.feed(ip, raw, time.monotonic())
         prev = self.prev_buttons.get(ip, 0)
         if buttons != prev:
             self.backend.gamepad_buttons(buttons, prev)
@@ -575,35 +3834,51 @@ class UdpServer:
             self.stats['gamepad'] += 1
             
             if Config.LOG_BUTTONS:
-                pressed = [name for mask, (name, _) in Config.GAMEPAD_BUTTONS.items() if buttons & mask]
+                pressed = [name for mask, (name, _) in Config.GAMEPAD_BUTTONS.items() if raw & mask]
                 released = [name for mask, (name, _) in Config.GAMEPAD_BUTTONS.items() if (prev & mask) and not (buttons & mask)]
                 if pressed:
                     self.log(f"▼ {', '.join(pressed)}", ip, "GAMEPAD")
                 if released and Config.LOG_PACKETS:
                     self.log(f"▲ {', '.join(released)}", ip, "GAMEPAD")
         
-        # Joystick deadzone
-        if abs(lx) < Config.JOYSTICK_DEADZONE: lx = 0
-        if abs(ly) < Config.JOYSTICK_DEADZONE: ly = 0
-        if abs(rx) < Config.JOYSTICK_DEADZONE: rx = 0
-        if abs(ry) < Config.JOYSTICK_DEADZONE: ry = 0
+        # Joystick eğrisi (deadzone + eğri tek lookup, ham byte indeksli)
+        lut_lx, lut_ly, lut_rx, lut_ry = self.stick_luts
+        li = (data[5] << 8) | data[6]
+        ri = (data[7] << 8) | data[8]
+        lx, ly = lut_lx[li], lut_ly[li]
+        rx, ry = lut_rx[ri], lut_ry[ri]
+        if l2 < Config.TRIGGER_DEADZONE: l2 = 0
+        if r2 < Config.TRIGGER_DEADZONE: r2 = 0
         
-        # Sol joystick → ABS_X/Y
-        self.backend.gamepad_left_stick(lx, ly)
+        # Eğimle direksiyon açıksa seçili X ekseni telefonun yatırılmasından gelir
+        steer = self.tilt_steer.get(ip)
+        if steer is not None and Config.TILT_STEER:
+            if Config.TILT_STEER == "lx":
+                lx = steer
+            else:
+                rx = steer
         
-        # Sağ joystick → ABS_Z/RZ (ayrı!)
-        self.backend.gamepad_right_stick(rx, ry)
+        self.pad_axes[ip] = (lx, ly, rx, ry, l2, r2)
+        self._write_axes(ip, self.pad_axes[ip])
+        self.backend.flush()
         
-        # Tetikler → ABS_BRAKE/GAS
-        if l2 < Config.TRIGGER_DEADZONE: l2 = 0
-        if r2 < Config.TRIGGER_DEADZONE: r2 = 0
-        self.backend.gamepad_triggers(l2, r2)
+        if self.exporter:
+            self.exporter.gamepad(ip, buttons, lx, ly, rx, ry, l2, r2)
+        if self.dsu:
+            self.dsu.update_pad(ip, buttons, lx, ly, rx, ry, l2, r2)
+        
+        # Nötr değilse son tarih kur (basılı makro butonu da sayılır)
+        if raw or buttons or lx or ly or rx or ry or l2 or r2:
+            self.gamepad_active[ip] = (lx, ly, rx, ry, l2, r2)
+        else:
+            self.gamepad_active.pop(ip, None)
+        self._update_deadline(ip)
         
         # Joystick as mouse
         if Config.JOYSTICK_AS_MOUSE and (lx or ly):
             self.backend.mouse_move(
-                int(lx * Config.MOUSE_SENSITIVITY / 20),
-                int(ly * Config.MOUSE_SENSITIVITY / 20)
+                int(lx * Config.MOUSE_SENSITIVITY / (20 * 258)),
+                int(ly * Config.MOUSE_SENSITIVITY / (20 * 258))
             )
     
     def handle_mouse_move(self, data, addr):
@@ -613,8 +3888,7 @@ class UdpServer:
         dx = self._signed(data[1])
         dy = self._signed(data[2])
         
-        final_dx = int(dx * Config.MOUSE_SENSITIVITY)
-        final_dy = int(dy * Config.MOUSE_SENSITIVITY)
+        final_dx, final_dy = self.pointer.apply(addr[0], dx, dy, time.monotonic())
         
         if final_dx or final_dy:
             self.backend.mouse_move(final_dx, final_dy)
@@ -630,21 +3904,74 @@ class UdpServer:
         self.backend.mouse_button(button, pressed)
         self.stats['clicks'] += 1
         
+        held = self.held_mouse.setdefault(addr[0], set())
+        if pressed:
+            held.add(button)
+        else:
+            held.discard(button)
+        self._update_deadline(addr[0])
+        
         btn_name = {0: "Sol", 1: "Sağ", 2: "Orta"}.get(button, str(button))
         self.log(f"{btn_name} {'▼' if pressed else '▲'}", addr[0], "MOUSE")
     
     def handle_mouse_wheel(self, data, addr):
+        """Scroll Paketi: [0x04][dikey][yatay (isteğe bağlı)] - işaretli byte"""
         if len(data) < 2 or not self.backend:
             return
         
+        ip = addr[0]
         delta = self._signed(data[1])
-        scroll = delta * Config.SCROLL_SENSITIVITY // 10
-        if scroll == 0 and delta:
-            scroll = 1 if delta > 0 else -1
+        hdelta = self._signed(data[2]) if len(data) >= 3 else 0
         
-        self.backend.mouse_scroll(scroll)
-        self.log(f"Scroll {'↑' if delta > 0 else '↓'} ({delta})", addr[0], "MOUSE")
+        # Hi-res birime çevir, kesirli kısmı istemci başına biriktir
+        scale = Config.SCROLL_SENSITIVITY * InputBackend.WHEEL_HI_RES / 10
+        rv, rh = self.scroll_rest.get(ip, (0.0, 0.0))
+        rv += delta * scale
+        rh += hdelta * scale
+        v, h = int(rv), int(rh)
+        self.scroll_rest[ip] = (rv - v, rh - h)
+        
+        if v or h:
+            self.backend.mouse_scroll(v, h)
+        self.log(f"Scroll {'↑' if delta > 0 else '↓'} ({delta},{hdelta})", ip, "MOUSE")
 
+    def handle_touch_abs(self, data, addr):
+        """
+        Mutlak Dokunma Paketi: [0x05][N][N × (id, durum, x_lo, x_hi, y_lo, y_hi)]
+        durum bit0 = dokunuyor, bit1 = tıklama; x/y 0-65535 telefon yüzeyi
+        """
+        if len(data) < 2 or not self.backend:
+            return
+        
+        count = min(data[1], (len(data) - 2) // 6)
+        ox, sx, oy, sy = self.touch_map
+        ip = addr[0]
+        contacts = []
+        seen, down = set(), set()
+        for off in range(2, 2 + count * 6, 6):
+            cid, state = data[off], data[off + 1]
+            x = data[off + 2] | (data[off + 3] << 8)
+            y = data[off + 4] | (data[off + 5] << 8)
+            contacts.append(((ip, cid), state, ox + ((x * sx + 0x8000) >> 16), oy + ((y * sy + 0x8000) >> 16)))
+            seen.add(cid)
+            if state & TouchTranslator.TOUCHING:
+                down.add(cid)
+        
+        # Pakette olmayan ama basılı kalan temaslar kalkmış sayılır
+        for cid in self.touch_contacts.get(ip, ()):
+            if cid not in seen:
+                contacts.append(((ip, cid), 0, 0, 0))
+        
+        self.backend.touch_frame(contacts)
+        self.stats['touches'] += 1
+        if down:
+            self.touch_contacts[ip] = down
+        else:
+            self.touch_contacts.pop(ip, None)
+        self._update_deadline(ip)
+        if Config.LOG_MOUSE_MOVE:
+            self.log(f"Touch {len(down)} temas", ip, "MOUSE")
+    
     def handle_gyro(self, data, addr):
         """
         Gyro Paketi: 7 byte (Android int16 formatı)
@@ -652,6 +3979,7 @@ class UdpServer:
         [1-2]  = gX (int16, Little-Endian, ±32767)
         [3-4]  = gY (int16)
         [5-6]  = gZ (int16)
+        [7-10] = sensör zamanı (u32 µs, isteğe bağlı - DSU çıkışı kullanır)
         """
         if len(data) < 7:
             if Config.LOG_GYRO:
@@ -667,6 +3995,11 @@ class UdpServer:
             
             # Backend'e gyro verisini gönder
             self.backend.gamepad_gyro(gx, gy, gz)
+            if self.exporter:
+                self.exporter.gyro(addr[0], gx, gy, gz)
+            if self.dsu:
+                sample_us = struct.unpack_from('<I', data, 7)[0] if len(data) >= 11 else None
+                self.dsu.update_motion(addr[0], (gx, gy, gz), sample_us=sample_us)
             
             if Config.LOG_GYRO:
                 if Config.GYRO_AS_MOUSE:
@@ -683,27 +4016,249 @@ class UdpServer:
         except Exception as e:
             self.log(f"Gyro hata: {e}", addr[0], "ERROR")
     
+    def handle_imu(self, data, addr):
+        """
+        IMU Paketi: [0x0E][n][n × 16 byte örnek]
+        Örnek: gx gy gz (int16, ±500 dps), ax ay az (int16, ±8 g), sensör zamanı (u32 µs)
+        Telefon kuyrukta biriken örnekleri tek pakette yollar; füzyon hepsini tek
+        geçişte işler. Gyro çıkışları (mouse, DSU) örnek başına beslenir.
+        """
+        if len(data) < 2 or not self.backend:
+            return
+        count = data[1]
+        size = count * 16
+        if not count or len(data) < 2 + size:
+            return
+        
+        ip = addr[0]
+        # Kopyasız görünümler (paket ve sunucu little-endian: x86/ARM)
+        block = memoryview(data)[2:2 + size]
+        samples, stamps = block.cast('h'), block.cast('I')
+        state = self.fusion.update(ip, samples, stamps, count)
+        self.stats['imu'] += count
+        up = ImuFusion.up(state) if state[5] else None
+        
+        world = up if Config.GYRO_AS_MOUSE and Config.GYRO_WORLD_YAW else None
+        accel_scale = ImuFusion.ACCEL_SCALE
+        backend, exporter, dsu = self.backend, self.exporter, self.dsu
+        for k in range(count):
+            i = k << 3
+            gx, gy, gz = samples[i], samples[i + 1], samples[i + 2]
+            backend.gamepad_gyro(gx, gy, int(ImuFusion.world_yaw(gx, gy, gz, world)) if world else gz)
+            if exporter:
+                exporter.gyro(ip, gx, gy, gz)
+            if dsu:
+                accel = (samples[i + 3] * accel_scale, samples[i + 4] * accel_scale, samples[i + 5] * accel_scale)
+                dsu.update_motion(ip, (gx, gy, gz), accel=accel, sample_us=stamps[(k << 2) + 3])
+        
+        if Config.TILT_STEER and up is not None:
+            self._apply_tilt(ip, ImuFusion.tilt(up))
+        
+        if Config.LOG_GYRO:
+            q = state
+            self.log(f"IMU x{count}: q=({q[0]:+.3f} {q[1]:+.3f} {q[2]:+.3f} {q[3]:+.3f})"
+                     + (f" eğim={ImuFusion.tilt(up):+.1f}°" if up else ""), ip, "GYRO")
+    
+    def _apply_tilt(self, ip, angle):
+        """Direksiyon açısı (derece) → seçili stick X ekseni, değiştiğinde yazılır"""
+        dead = Config.TILT_STEER_DEADZONE
+        span = max(1e-3, Config.TILT_STEER_RANGE - dead)
+        magnitude = abs(angle) - dead
+        value = 0 if magnitude <= 0 else int(min(1.0, magnitude / span) * 32767)
+        if (angle < 0) != Config.TILT_STEER_INVERT:
+            value = -value
+        if self.tilt_steer.get(ip) == value:
+            return
+        self.tilt_steer[ip] = value
+        
+        lx, ly, rx, ry, l2, r2 = self.pad_axes.get(ip, (0, 0, 0, 0, 0, 0))
+        if Config.TILT_STEER == "lx":
+            lx = value
+        else:
+            rx = value
+        axes = self.pad_axes[ip] = (lx, ly, rx, ry, l2, r2)
+        self._write_axes(ip, axes)
+        self.backend.flush()
+        if any(axes):
+            self.gamepad_active[ip] = axes
+        else:
+            self.gamepad_active.pop(ip, None)
+        self._update_deadline(ip)
+    
+    def _write_axes(self, ip, axes):
+        """Stick/tetik eksenlerini yaz; upsampling açıksa zamanlayıcıya ver (flush çağırana kalır)"""
+        if self.upsampler:
+            now = time.monotonic()
+            write_now, tick = self.upsampler.push(ip, now, axes)
+            if tick and not self.upsample_timers.armed(ip):
+                self.upsample_timers.touch(ip, now + self.upsampler.period)
+            if not write_now:
+                return
+        lx, ly, rx, ry, l2, r2 = axes
+        # Sol joystick → ABS_X/Y, sağ → ABS_Z/RZ (ayrı!), tetikler → ABS_BRAKE/GAS
+        self.backend.gamepad_left_stick(lx, ly)
+        self.backend.gamepad_right_stick(rx, ry)
+        self.backend.gamepad_triggers(l2, r2)
+    
     def handle_discovery(self, data, addr):
+        """DISCOVER → I_AM_SERVER; istemci açık anahtar gönderdiyse eşleştirme yanıtı"""
+        if b"DISCOVER" not in data:
+            return
+        reply = b"I_AM_SERVER"
+        _, sep, peer = data.partition(b" PAIR ")
+        if sep and self.auth.mode != "off":
+            try:
+                paired = self.auth.pair(addr[0], peer.strip().decode("ascii"), time.monotonic())
+            except ValueError as e:
+                self.log(f"Eşleştirme reddedildi: {e}", addr[0], "WARN")
+                return
+            if paired is None:
+                return      # hız sınırı: yanıt yok, telefon DISCOVER'ı yineler
+            public, code = paired
+            reply += b" PAIR " + public.encode()
+            self.log(f"Eşleştirildi, doğrulama kodu {code // 1000:03d} {code % 1000:03d}", addr[0], "OK")
+        elif self.auth.mode == "required":
+            self.log("Eşleştirmesiz istemci: paketleri reddedilecek (--auth required)", addr[0], "WARN")
         try:
-            if b"DISCOVER" in data:
-                self.sock.sendto(b"I_AM_SERVER", addr)
-                self.log("Discovery yanıtı", addr[0], "OK")
-        except Exception:
+            self.sock.sendto(reply, addr)
+            self.log("Discovery yanıtı", addr[0], "OK")
+        except OSError:
             pass
     
+    def handle_rumble_events(self):
+        """Sanal gamepad'in FF olaylarını son aktif telefona ilet"""
+        effects = self.backend.ff_read()
+        target = self.rumble_target
+        if not effects or not target:
+            return
+        for strong, weak, duration in effects:
+            # Durdurma sinyali sadece güç (0, 0); FF süresi 0 sonsuz demektir → 0xFFFF
+            if strong or weak:
+                duration = min(duration, 0xFFFF) or 0xFFFF
+            packet = struct.pack('<BBBH', Config.PACKET_RUMBLE, strong >> 8, weak >> 8, duration)
+            try:
+                self.sock.sendto(packet, target)
+                self.stats['rumble'] += 1
+            except OSError:
+                pass
+            if Config.LOG_PACKETS:
+                self.log(f"Rumble güçlü={strong >> 8} zayıf={weak >> 8} {duration}ms", target[0], "GAMEPAD")
+    
+    def _upsample_tick(self, ip):
+        """Upsampling tick'i: ara eksen değerlerini yaz, gerekirse yeniden kur"""
+        now = time.monotonic()
+        axes, more = self.upsampler.render(ip, now)
+        if not self.backend:
+            return
+        if axes:
+            lx, ly, rx, ry, l2, r2 = axes
+            self.backend.gamepad_left_stick(lx, ly)
+            self.backend.gamepad_right_stick(rx, ry)
+            self.backend.gamepad_triggers(l2, r2)
+            self.backend.flush()
+            self.stats['upsampled'] += 1
+        if more:
+            self.upsample_timers.touch(ip, now + self.upsampler.period)
+    
+    # ═══════════════════════════════════════════════════════════
+    # TAKILI GİRDİ KORUMASI
+    # ═══════════════════════════════════════════════════════════
+    
+    def _update_deadline(self, ip):
+        """Girdi tutuluyorsa son tarihi kur/uzat, değilse iptal et"""
+        if not Config.INPUT_DEADLINE:
+            return
+        if ip in self.gamepad_active or self.held_mouse.get(ip) or ip in self.touch_contacts:
+            self.deadlines.touch(ip, time.monotonic() + Config.INPUT_DEADLINE)
+        else:
+            self.deadlines.cancel(ip)
+    
+    def _macro_key(self, code, pressed):
+        if self.backend:
+            self.backend.key(code, pressed)
+    
+    def _macro_pad(self, ip, mask, pressed):
+        """Makronun gamepad hedefi: istemcinin buton durumuna bit ekle/çıkar"""
+        if not self.backend:
+            return
+        prev = self.prev_buttons.get(ip, 0)
+        buttons = prev | mask if pressed else prev & ~mask
+        if buttons != prev:
+            self.backend.gamepad_buttons(buttons, prev)
+            self.backend.flush()
+            self.prev_buttons[ip] = buttons
+    
+    def _holds_input(self, ip):
+        """İstemcinin sanal cihazda basılı/nötr olmayan bir girdisi var mı"""
+        return bool(self.prev_buttons.get(ip) or ip in self.gamepad_active or self.held_mouse.get(ip)
+                    or self.touch_contacts.get(ip) or self.macros.raw.get(ip) or self.macros.pad_held.get(ip))
+    
+    def _deadline_expired(self, ip):
+        """Son tarih doldu: girdiyi bırak, istemci dönünce tam durumunu iste"""
+        self._release_client(ip)
+        self.resync.add(ip)
+    
+    def _release_client(self, ip):
+        """Butonları bırak, stickleri ortala, tetikleri sıfırla"""
+        if not self.backend:
+            return
+        self.upsample_timers.cancel(ip)
+        if self.upsampler:
+            self.upsampler.forget(ip)
+        self.macros.release(ip)
+        prev = self.prev_buttons.get(ip, 0)
+        if prev:
+            self.backend.gamepad_buttons(0, prev)
+            self.prev_buttons[ip] = 0
+        if ip in self.gamepad_active:
+            self.backend.gamepad_left_stick(0, 0)
+            self.backend.gamepad_right_stick(0, 0)
+            self.backend.gamepad_triggers(0, 0)
+            self.gamepad_active.pop(ip, None)
+        self.backend.flush()
+        self.pad_axes.pop(ip, None)
+        self.tilt_steer.pop(ip, None)   # sonraki IMU paketi eğimi yeniden yazar
+        for button in self.held_mouse.pop(ip, ()):
+            self.backend.mouse_button(button, False)
+        touches = self.touch_contacts.pop(ip, ())
+        if touches:
+            self.backend.touch_frame([((ip, cid), 0, 0, 0) for cid in touches])
+        self.stats['input_releases'] += 1
+        self.log("Girdi kesildi, tutulan girdiler bırakıldı", ip, "WARN")
+    
     # ═══════════════════════════════════════════════════════════
     # PACKET ROUTER
     # ═══════════════════════════════════════════════════════════
     
     def process_packet(self, data, addr):
-        with self.lock:
-            self.last_activity[addr[0]] = time.time()
-        
         self.stats['packets'] += 1
         
         if not data:
             return
         
+        if self.capture is not None and len(self.capture) < Config.CAPTURE_MAX_PACKETS:
+            self.capture.append((time.monotonic(), addr[0], bytes(data)))
+        
+        # Kabul kontrolü (reddedilen paket burada biter)
+        now = time.monotonic()
+        if self.admission and not self.admission.admit(addr[0], data[0], now):
+            return
+        
+        with self.lock:
+            self.last_activity[addr[0]] = time.time()
+        self.expiry.touch(addr[0], now + Config.CLIENT_TIMEOUT)
+        
+        # Girdi tutan istemcinin her paketi (ping dahil) son tarihi uzatır
+        if Config.INPUT_DEADLINE and self.deadlines.armed(addr[0]):
+            self.deadlines.touch(addr[0], now + Config.INPUT_DEADLINE)
+        
+        # Son tarihte girdisi bırakılan istemci geri döndü: telefon sadece
+        # değişimde gönderdiği için tutulan durumu keyframe ile yeniden iste
+        if self.resync and addr[0] in self.resync:
+            self.resync.discard(addr[0])
+            self.keyframe_asked.pop(addr[0], None)
+            self._request_keyframe(addr)
+        
         if data.startswith(b"DISCOVER"):
             self.handle_discovery(data, addr)
             return
@@ -713,10 +4268,14 @@ class UdpServer:
         handlers = {
             Config.PACKET_PING: self.handle_ping,
             Config.PACKET_GAMEPAD: self.handle_gamepad,
+            Config.PACKET_GAMEPAD_DELTA: self.handle_gamepad_delta,
+            Config.PACKET_GAMEPAD_KEYFRAME: self.handle_gamepad_keyframe,
             Config.PACKET_MOUSE_MOVE: self.handle_mouse_move,
             Config.PACKET_MOUSE_BUTTON: self.handle_mouse_button,
             Config.PACKET_MOUSE_WHEEL: self.handle_mouse_wheel,
+            Config.PACKET_TOUCH_ABS: self.handle_touch_abs,
             Config.PACKET_GYRO: self.handle_gyro,
+            Config.PACKET_IMU: self.handle_imu,
         }
         
         handler = handlers.get(ptype)
@@ -735,13 +4294,33 @@ class UdpServer:
         
         print("\n🔧 Input backend başlatılıyor...")
         try:
-            self.backend = create_backend(Config.BACKEND)
+            self.backend = BackendSupervisor(
+                create_backend(Config.BACKEND),
+                log=self.log,
+                on_swap=self._backend_swapped,
+                defer=lambda func: self.call_in_loop(func, timeout=None),
+                max_errors=Config.HEALTH_MAX_ERRORS,
+                slow_ms=Config.HEALTH_SLOW_MS,
+                cooldown=Config.FAILOVER_COOLDOWN
+            )
             print(f"  ✅ {self.backend.name} backend başarılı")
         except Exception as e:
             print(f"\n❌ Backend hatası: {e}")
             print("\n💡 Çözüm: sudo modprobe uinput && sudo chmod 666 /dev/uinput")
             return
         
+        if Config.EXPORT_SHM:
+            try:
+                self.exporter = FrameExporter(Config.EXPORT_SHM, Config.EXPORT_SHM_SLOTS)
+            except OSError as e:
+                print(f"  ⚠️  Paylaşımlı bellek açılamadı: {e}")
+        
+        if Config.DSU_PORT:
+            try:
+                self.dsu = DsuServer(Config.DSU_HOST, Config.DSU_PORT, Config.DSU_GYRO_MAP)
+            except OSError as e:
+                print(f"  ⚠️  DSU sunucusu açılamadı: {e}")
+        
         self._print_banner()
         
         try:
@@ -750,7 +4329,7 @@ class UdpServer:
             self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
             self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 65536)  # Daha büyük buffer
             self.sock.bind((Config.UDP_HOST, self.port))
-            self.sock.settimeout(1.0)
+            self.sock.setblocking(False)
         except Exception as e:
             self.log(f"Socket hatası: {e}", level="ERROR")
             return
@@ -759,28 +4338,252 @@ class UdpServer:
         self.log("Sunucu başlatıldı", level="OK")
         self.log("Android'de 'Discover' butonuna tıklayın")
         self.log("Durdurmak için: Ctrl+C")
+        self.log(f"Profil için: kill -USR1 {os.getpid()}")
         print("─" * 62)
         
-        threading.Thread(target=self._cleanup_loop, daemon=True).start()
+        # Kontrol thread'lerinden döngüye çağrı devri için uyandırma soketi.
+        # Sinyaller de buraya bir byte yazar (set_wakeup_fd): süresiz select
+        # SIGTERM/SIGINT'te hemen döner, handler'ın kapattığı döngü biter.
+        self.wake_r, self.wake_w = socket.socketpair()
+        self.wake_r.setblocking(False)
+        self.wake_w.setblocking(False)
+        self.loop_thread = threading.get_ident()
+        old_wakeup_fd = None
+        try:
+            old_wakeup_fd = signal.set_wakeup_fd(self.wake_w.fileno(), warn_on_full_buffer=False)
+        except ValueError:
+            pass    # ana thread değil: sinyaller bu döngüye gelmez
+        if Config.CONTROL_SOCKET:
+            try:
+                self.control = ControlServer(self, Config.CONTROL_SOCKET)
+                self.log(f"Kontrol soketi: {Config.CONTROL_SOCKET}")
+            except OSError as e:
+                self.log(f"Kontrol soketi açılamadı: {e}", level="WARN")
+        
+        if hasattr(signal, "SIGUSR1"):
+            signal.signal(signal.SIGUSR1, lambda *_: self.toggle_profile())
         
+        # Olay döngüsü: UDP socket + (varsa) uinput FF fd aynı selector'da
+        self.selector = selector = selectors.DefaultSelector()
+        selector.register(self.sock, selectors.EVENT_READ, self._drain_socket)
+        ff_fd = self.backend.ff_fileno()
+        if ff_fd is not None:
+            selector.register(ff_fd, selectors.EVENT_READ, self.handle_rumble_events)
+        selector.register(self.wake_r, selectors.EVENT_READ, self._run_loop_calls)
+        if self.dsu:
+            selector.register(self.dsu, selectors.EVENT_READ, self.dsu.drain)
+        
+        stats = self.stats
         while self.running:
+            # Bekleme süresi en yakın zamanlayıcıya göre; hiçbiri yoksa süresiz
+            # (paket, kontrol çağrısı ya da sinyal uyandırır)
+            timeout = None
+            for timer in self.timers:
+                next_deadline = timer.next_deadline()
+                if next_deadline is not None:
+                    wait = max(0.0, next_deadline - time.monotonic())
+                    if timeout is None or wait < timeout:
+                        timeout = wait
+            
             try:
-                data, addr = self.sock.recvfrom(1024)
-                self.process_packet(data, addr)
-            except socket.timeout:
-                continue
+                events = selector.select(timeout)
+                stats['wakeups'] += 1
+                if not events:
+                    stats['timer_wakeups'] += 1
+                for key, _ in events:
+                    key.data()
             except KeyboardInterrupt:
                 break
             except Exception as e:
                 if self.running:
                     self.log(f"Hata: {e}", level="ERROR")
+            
+            now = time.monotonic()
+            for timer in self.timers:
+                timer.run_expired(now)
+        
+        selector.close()
+        self.selector = None
+        if old_wakeup_fd is not None:
+            signal.set_wakeup_fd(old_wakeup_fd)
         
         self.stop()
     
+    # ═══════════════════════════════════════════════════════════
+    # PROFİL
+    # ═══════════════════════════════════════════════════════════
+    
+    def toggle_profile(self, duration=None):
+        if self.profiler.active:
+            self.stop_profile()
+        else:
+            self.start_profile(duration)
+    
+    def start_profile(self, duration=None):
+        """Döngü profilini başlat, duration (sn) sonra kendiliğinden durur"""
+        if self.profiler.active:
+            return False
+        duration = duration or Config.PROFILE_DURATION
+        self.profiler.start()
+        self.profile_timer.touch("profile", time.monotonic() + duration)
+        self.log(f"Profil başladı ({self.profiler.mode}, {duration:g} sn)", level="DEBUG")
+        return True
+    
+    def stop_profile(self):
+        """Profili durdur, dosyaları yaz ve özeti logla"""
+        self.profile_timer.cancel("profile")
+        if not self.profiler.active:
+            return []
+        handlers = {}
+        for name in dir(self):
+            if name.startswith("handle_"):
+                code = getattr(self, name).__code__
+                handlers[(code.co_filename, code.co_firstlineno, code.co_name)] = name
+        backend_calls = {}
+        for cls in type(getattr(self.backend, "backend", self.backend)).__mro__ if self.backend else ():
+            for name, func in vars(cls).items():
+                code = getattr(func, "__code__", None)
+                if code and not name.startswith("__"):
+                    backend_calls.setdefault((code.co_filename, code.co_firstlineno, code.co_name),
+                                             f"{cls.__name__}.{name}")
+        try:
+            files, lines = self.profiler.stop(handlers, backend_calls)
+        except OSError as e:
+            self.log(f"Profil yazılamadı: {e}", level="ERROR")
+            return []
+        for line in lines:
+            self.log(line, level="DEBUG")
+        self.log(f"Profil dosyaları: {', '.join(files)}", level="OK")
+        return files
+    
+    # ═══════════════════════════════════════════════════════════
+    # BACKEND DEĞİŞİMİ
+    # ═══════════════════════════════════════════════════════════
+    
+    def _backend_swapped(self, old, new, reason):
+        """BackendSupervisor yeni backend'e geçti: FF fd'yi taşı, tutulan girdiyi yeniden yaz"""
+        if self.selector:
+            for backend, register in ((old, False), (new, True)):
+                try:
+                    fd = backend.ff_fileno()
+                    if fd is None:
+                        continue
+                    if register:
+                        self.selector.register(fd, selectors.EVENT_READ, self.handle_rumble_events)
+                    else:
+                        self.selector.unregister(fd)
+                except (OSError, KeyError, ValueError):
+                    pass
+        self._replay_held_input()
+        self.stats['failovers'] += 1
+        self.log(f"Backend değişti: {old.name} → {new.name} ({reason})", level="WARN")
+    
+    def _replay_held_input(self):
+        """Basılı buton/stick/tetik ve mouse butonlarını yeni backend'e yaz.
+        Dokunma temasları konum tutulmadığı için bir sonraki paketle gelir."""
+        for ip, buttons in self.prev_buttons.items():
+            if buttons:
+                self.backend.gamepad_buttons(buttons, 0)
+        for lx, ly, rx, ry, l2, r2 in self.gamepad_active.values():
+            self.backend.gamepad_left_stick(lx, ly)
+            self.backend.gamepad_right_stick(rx, ry)
+            self.backend.gamepad_triggers(l2, r2)
+        self.backend.flush()
+        self.macros.replay_keys()
+        for held in self.held_mouse.values():
+            for button in held:
+                self.backend.mouse_button(button, True)
+    
+    # ═══════════════════════════════════════════════════════════
+    # DÖNGÜYE ÇAĞRI DEVRİ
+    # ═══════════════════════════════════════════════════════════
+    
+    def request_stop(self):
+        """Döngüyü durdur (sinyal handler'ı ve başka thread'lerden güvenli); özet start() sonunda"""
+        self.running = False
+        wake = self.wake_w
+        if wake is not None:
+            try:
+                wake.send(b"\0")
+            except OSError:
+                pass
+    
+    def call_in_loop(self, func, timeout=5.0):
+        """func'ı paket döngüsü thread'inde paketler arasında çalıştır, sonucu bekle"""
+        if not self.running or self.wake_w is None or threading.get_ident() == self.loop_thread:
+            return func()
+        future = Future()
+        self.loop_calls.append((func, future))
+        try:
+            self.wake_w.send(b"\0")
+        except BlockingIOError:
+            pass    # uyandırma zaten bekliyor
+        return future.result(timeout)
+    
+    def _run_loop_calls(self):
+        try:
+            while self.wake_r.recv(256):
+                pass
+        except (BlockingIOError, InterruptedError):
+            pass
+        while self.loop_calls:
+            func, future = self.loop_calls.popleft()
+            try:
+                future.set_result(func())
+            except Exception as e:
+                future.set_exception(e)
+    
+    def client_states(self):
+        """İstemci başına canlı durum (kontrol soketi için, döngüde çağrılır)"""
+        now = time.time()
+        with self.lock:
+            activity = dict(self.last_activity)
+        return {
+            ip: {
+                "idle": round(now - seen, 2),
+                "buttons": f"0x{self.prev_buttons.get(ip, 0):08X}",
+                "gamepad_active": ip in self.gamepad_active,
+                "held_mouse": sorted(self.held_mouse.get(ip, ())),
+                "touches": len(self.touch_contacts.get(ip, ())),
+                "keyframe": ip in self.gamepad_keys,
+                "deadline_armed": self.deadlines.armed(ip),
+            }
+            for ip, seen in activity.items()
+        }
+    
+    def _drain_socket(self, limit=64):
+        """Socket'te bekleyen datagramları işle (tek uyanmada en fazla limit).
+        Önce hepsi okunur, MAC doğrulaması toplu yapılır, sonra route edilir."""
+        batch = []
+        recv = self.sock.recvfrom
+        for _ in range(limit):
+            try:
+                batch.append(recv(1024))
+            except (BlockingIOError, InterruptedError):
+                break
+        for data, addr in self.auth.verify(batch):
+            try:
+                self.process_packet(data, addr)
+            except Exception as e:
+                self.log(f"Hata: {e}", addr[0], "ERROR")
+    
     def stop(self):
         self.running = False
+        if self.profiler.active:
+            self.stop_profile()
+        if self.control:
+            self.control.close()
+            self.control = None
+        for sock in (self.wake_r, self.wake_w):
+            if sock:
+                sock.close()
+        self.wake_r = self.wake_w = None
         if self.backend:
             self.backend.close()
+        if self.exporter:
+            self.exporter.close()
+        if self.dsu:
+            self.dsu.close()
         if self.sock:
             try: 
                 self.sock.close()
@@ -793,25 +4596,706 @@ class UdpServer:
         print()
         print("📊 İstatistikler:")
         print(f"   Toplam Paket   : {self.stats['packets']:,}")
+        uptime = max(time.time() - self.start_time, 1e-9)
+        print(f"   Döngü Uyanma   : {self.stats['wakeups']:,} ({self.stats['wakeups'] / uptime:.2f}/sn,"
+              f" zamanlayıcı {self.stats['timer_wakeups']:,})")
         print(f"   Ping           : {self.stats['pings']:,}")
         print(f"   Mouse Hareket  : {self.stats['mouse_moves']:,}")
+        print(f"   Dokunma Frame  : {self.stats['touches']:,}")
         print(f"   Mouse Tık      : {self.stats['clicks']:,}")
         print(f"   Gamepad        : {self.stats['gamepad']:,}")
         print(f"   Gyro           : {self.stats['gyro']:,}")
+        if self.stats['imu']:
+            print(f"   IMU örnekleri  : {self.stats['imu']:,}")
+        if self.stats['edges']:
+            print(f"   Buton kenarı   : {self.stats['edges']:,} (kurtarılan {self.stats['edges_recovered']:,},"
+                  f" eski paket {self.stats['stale_frames']:,})")
+        if self.macros.fired:
+            print(f"   Makro Adımı    : {self.macros.fired:,}")
         print(f"   Checksum OK    : {self.stats['checksum_ok']:,}")
         print(f"   Checksum HATA  : {self.stats['checksum_fail']:,}")
+        print(f"   Delta Gamepad  : {self.stats['delta']:,} (keyframe isteği {self.stats['keyframe_requests']:,})")
+        print(f"   Girdi Bırakma  : {self.stats['input_releases']:,}")
+        print(f"   Rumble         : {self.stats['rumble']:,}")
+        if self.dsu:
+            print(f"   DSU Gönderim   : {self.dsu.sent:,} (eski örnek {self.dsu.stale:,})")
+        if isinstance(self.backend, BackendSupervisor):
+            health = self.backend.health
+            print(f"   Backend Hata   : {health.errors:,} (değişim {self.stats['failovers']:,}, "
+                  f"ort. yazma {health.latency * 1000:.2f} ms)")
+        if self.upsampler:
+            print(f"   Upsample Tick  : {self.stats['upsampled']:,}")
+        if self.admission:
+            adm = self.admission.stats
+            print(f"   Hız Sınırı     : {adm['rate_limited']:,}")
+            print(f"   İzinsiz Kaynak : {adm['not_allowed']:,}")
+            print(f"   LRU Çıkarılan  : {adm['evicted']:,}")
+        auth = self.auth.stats
+        if auth['paired']:
+            print(f"   Doğrulanan     : {auth['authenticated']:,} (eşleşme {auth['paired']:,}, MAC hata {auth['auth_fail']:,},"
+                  f" tekrar {auth['replayed']:,}, etiketsiz {auth['auth_missing']:,})")
         print("─" * 62)
     
-    def _cleanup_loop(self):
-        while self.running:
-            time.sleep(30)
-            now = time.time()
-            with self.lock:
-                expired = [ip for ip, t in self.last_activity.items() if now - t > 60]
-                for ip in expired:
-                    del self.last_activity[ip]
-                    self.prev_buttons.pop(ip, None)
-                    self.log("Zaman aşımı", ip, "WARN")
+    def _expire_client(self, ip):
+        """CLIENT_TIMEOUT boyunca paket gelmedi (döngüde, expiry zamanlayıcısından)"""
+        self._forget_client(ip)
+        self.log("Zaman aşımı", ip, "WARN")
+    
+    def _forget_client(self, ip):
+        """İstemciye ait tüm durumu bırak (zaman aşımı)"""
+        # Tutulan girdi önce sanal cihazda bırakılır: durum silindikten sonra
+        # gelen bırakma paketi 0'a göre fark alır ve hiçbir şey yazmaz
+        if self._holds_input(ip):
+            self._release_client(ip)
+        self.macros.release(ip)
+        with self.lock:
+            self.last_activity.pop(ip, None)
+            self.prev_buttons.pop(ip, None)
+        self.deadlines.cancel(ip)
+        self.expiry.cancel(ip)
+        self.upsample_timers.cancel(ip)
+        if self.upsampler:
+            self.upsampler.forget(ip)
+        self.gamepad_active.pop(ip, None)
+        self.held_mouse.pop(ip, None)
+        self.touch_contacts.pop(ip, None)
+        self.scroll_rest.pop(ip, None)
+        self.gamepad_keys.pop(ip, None)
+        self.keyframe_asked.pop(ip, None)
+        self.resync.discard(ip)
+        self.edge_seq.pop(ip, None)
+        self.pad_axes.pop(ip, None)
+        self.tilt_steer.pop(ip, None)
+        self.fusion.forget(ip)
+        self.pointer.forget(ip)
+        if self.exporter:
+            self.exporter.forget(ip)
+        if self.dsu:
+            self.dsu.forget(ip)
+        if self.admission:
+            self.admission.forget(ip)
+
+# ═══════════════════════════════════════════════════════════════
+# BENCHMARK
+# ═══════════════════════════════════════════════════════════════
+def _bench_frames(count):
+    """Gerçekçi gamepad frame dizisi: dönen stickler, değişen buton/tetik"""
+    frames = []
+    for i in range(count):
+        a = i * 0.05
+        frames.append((
+            (1 << (i // 30 % 13)) if i % 60 < 30 else 0,
+            int(math.cos(a) * 32767), int(math.sin(a) * 32767),
+            int(math.sin(a * 0.7) * 20000), int(math.cos(a * 0.7) * 20000),
+            (i * 3) & 0xFF, 255 - ((i * 3) & 0xFF),
+        ))
+    return frames
+
+def bench_backend_frames(backend_cls, frames):
+    """Backend başına ortalama frame yazma süresi (sn)"""
+    backend = backend_cls()
+    try:
+        prev = 0
+        t0 = time.perf_counter()
+        for buttons, lx, ly, rx, ry, l2, r2 in frames:
+            if buttons != prev:
+                backend.gamepad_buttons(buttons, prev)
+                prev = buttons
+            backend.gamepad_left_stick(lx, ly)
+            backend.gamepad_right_stick(rx, ry)
+            backend.gamepad_triggers(l2, r2)
+            backend.flush()
+        return (time.perf_counter() - t0) / len(frames)
+    finally:
+        backend.close()
+
+def run_benchmark(frames=20000):
+    print(f"\n⏱️  Benchmark ({frames:,} frame)")
+    print("─" * 62)
+    data = _bench_frames(frames)
+    
+    print("  Gamepad frame yazımı (butonlar + 2 stick + tetikler + SYN):")
+    for backend_cls in (UinputBackend, EvdevBackend):
+        try:
+            per = bench_backend_frames(backend_cls, data)
+        except Exception as e:
+            print(f"    {backend_cls.name:8}: atlandı ({e})")
+            continue
+        print(f"    {backend_cls.name:8}: {per * 1e6:8.2f} µs/frame  ({1 / per:,.0f} frame/sn)")
+    
+    timers, rate, fires, per, p50, p99 = bench_timer_wheel()
+    print(f"  Zamanlayıcı çarkı ({timers} turbo @ {rate:g} Hz, gerçek select döngüsü):")
+    print(f"    {fires:,} tetik, {per * 1e6:.2f} µs/tetik, gecikme p50 {p50 * 1e6:.0f} µs / p99 {p99 * 1e6:.0f} µs")
+    
+    single, batched, xor = bench_packet_auth()
+    print("  Paket doğrulama (11 byte gyro + 12 byte ek, 4 istemci):")
+    print(f"    MAC tekil    : {single * 1e6:8.2f} µs/paket  ({1 / single:,.0f} paket/sn)")
+    print(f"    MAC 64'lük   : {batched * 1e6:8.2f} µs/paket  ({1 / batched:,.0f} paket/sn)")
+    print(f"    XOR checksum : {xor * 1e6:8.2f} µs/paket")
+    print("─" * 62)
+
+def bench_packet_auth(packets=20000, batch=64):
+    """PacketAuth.verify paket başına süre: tek tek, toplu; karşılaştırma için XOR (sn)"""
+    auth = PacketAuth("required")
+    clients = [(f"10.0.0.{i + 1}", 26760) for i in range(4)]
+    for addr in clients:
+        auth._install(addr[0], _AuthSession(os.urandom(32)))
+    data = []
+    for i in range(packets):
+        addr = clients[i % len(clients)]
+        rate = i % 2000 - 1000
+        body = struct.pack('<B3hII', Config.PACKET_GYRO, rate, -rate, rate >> 1, i, i // len(clients) + 1)
+        data.append((body + auth.sessions[addr[0]].tag(body), addr))
+    
+    def run(size):
+        for addr in clients:
+            session = auth.sessions[addr[0]]
+            session.top, session.window = 0, 1
+        t0 = time.perf_counter()
+        for i in range(0, packets, size):
+            auth.verify(data[i:i + size])
+        return (time.perf_counter() - t0) / packets
+    
+    single = run(1)
+    batched = run(batch)
+    assert auth.stats['authenticated'] == 2 * packets
+    
+    t0 = time.perf_counter()
+    for payload, _ in data:
+        xor = 0
+        for b in payload[:10]:
+            xor ^= b
+        xor == payload[10]
+    return single, batched, (time.perf_counter() - t0) / packets
+
+def bench_timer_wheel(timers=500, rate=20.0, duration=2.0):
+    """Periyodik zamanlayıcılar döngüde: tetik başına işlem süresi ve planlanan zamana göre gecikme"""
+    wheel = TimerWheel()
+    selector = selectors.DefaultSelector()
+    period = 1.0 / rate
+    late = []
+    
+    def fire(when):
+        late.append(time.monotonic() - when)
+        wheel.schedule(when + period, fire, when + period)
+    
+    start = time.monotonic() + 0.01
+    for i in range(timers):
+        when = start + period * i / timers
+        wheel.schedule(when, fire, when)
+    
+    busy = 0.0
+    end = start + duration
+    while time.monotonic() < end:
+        deadline = wheel.next_deadline()
+        selector.select(max(0.0, deadline - time.monotonic()))
+        t0 = time.perf_counter()
+        wheel.run_expired(time.monotonic())
+        busy += time.perf_counter() - t0
+    selector.close()
+    
+    late.sort()
+    fires = len(late)
+    return timers, rate, fires, busy / max(1, fires), late[fires // 2], late[int(fires * 0.99)]
+
+# ═══════════════════════════════════════════════════════════════
+# GECİKME ÖZ TESTİ (LOOPBACK)
+# ═══════════════════════════════════════════════════════════════
+class EventProbe:
+    """
+    Sanal cihazın /dev/input/eventN düğümünü okur. Olay zamanı
+    EVIOCSCLOCKID ile CLOCK_MONOTONIC'e çekilir; gönderim anıyla doğrudan
+    karşılaştırılır (okuyucu thread'in uyanma gecikmesi ölçüme girmez).
+    """
+    EVENT = struct.Struct('llHHi')
+    EVIOCSCLOCKID = 0x400445a0
+    
+    def __init__(self, path):
+        import fcntl, select
+        self.path = path
+        self.fd = os.open(path, os.O_RDONLY | os.O_NONBLOCK)
+        fcntl.ioctl(self.fd, self.EVIOCSCLOCKID, struct.pack('i', time.CLOCK_MONOTONIC))
+        self.poller = select.poll()
+        self.poller.register(self.fd, select.POLLIN)
+    
+    @staticmethod
+    def nodes():
+        """{/dev/input/eventN: cihaz adı}"""
+        import glob
+        found = {}
+        for sys_path in glob.glob("/sys/class/input/event*"):
+            try:
+                with open(os.path.join(sys_path, "device", "name")) as f:
+                    found["/dev/input/" + os.path.basename(sys_path)] = f.read().strip()
+            except OSError:
+                pass
+        return found
+    
+    @classmethod
+    def find(cls, name, before=None):
+        """Adı eşleşen düğüm; before verilirse önce yeni oluşanlar tercih edilir"""
+        matches = [path for path, dev in cls.nodes().items() if dev == name]
+        fresh = [path for path in matches if before is None or path not in before]
+        pick = fresh or matches
+        return max(pick, key=lambda p: int(p.rsplit("event", 1)[1])) if pick else None
+    
+    def drain(self):
+        try:
+            while os.read(self.fd, self.EVENT.size * 64):
+                pass
+        except BlockingIOError:
+            pass
+    
+    def wait(self, etype, code, deadline):
+        """İlk eşleşen olayın çekirdek zamanı (sn, monotonic) ya da None"""
+        size = self.EVENT.size
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not self.poller.poll(remaining * 1000):
+                return None
+            try:
+                data = os.read(self.fd, size * 64)
+            except BlockingIOError:
+                continue
+            for off in range(0, len(data) - size + 1, size):
+                sec, usec, ev_type, ev_code, _ = self.EVENT.unpack_from(data, off)
+                if ev_type == etype and ev_code == code:
+                    return sec + usec / 1e6
+    
+    def close(self):
+        os.close(self.fd)
+
+class PointerProbe:
+    """X imleç durumu (konum + sol tuş) - XTest kullanan backend'ler için, Xvfb üzerinde"""
+    def __init__(self):
+        try:
+            from Xlib import display, X
+            self.display = display.Display()
+            self.root = self.display.screen().root
+            self.button_mask = X.Button1Mask
+            self.read = self._read_xlib
+        except ImportError:
+            if not shutil.which("xdotool"):
+                raise RuntimeError("python-xlib veya xdotool gerekli")
+            self.read = self._read_xdotool
+    
+    def _read_xlib(self):
+        p = self.root.query_pointer()
+        return p.root_x, p.root_y, bool(p.mask & self.button_mask)
+    
+    def _read_xdotool(self):
+        out = subprocess.run(["xdotool", "getmouselocation"], capture_output=True, text=True).stdout
+        fields = dict(item.split(":") for item in out.split() if ":" in item)
+        return int(fields.get("x", 0)), int(fields.get("y", 0)), False
+    
+    def wait(self, before, deadline):
+        """Durum değiştiği an (monotonic) ya da None"""
+        while time.monotonic() < deadline:
+            if self.read() != before:
+                return time.monotonic()
+        return None
+
+def _start_xvfb():
+    """Boş bir ekran numarasında Xvfb başlat → (süreç, DISPLAY)"""
+    if not shutil.which("Xvfb"):
+        raise RuntimeError("Xvfb bulunamadı")
+    for num in range(99, 120):
+        if not os.path.exists(f"/tmp/.X11-unix/X{num}"):
+            break
+    else:
+        raise RuntimeError("boş X ekranı bulunamadı")
+    proc = subprocess.Popen(["Xvfb", f":{num}", "-screen", "0", "1280x720x24", "-nolisten", "tcp"],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 5
+    while not os.path.exists(f"/tmp/.X11-unix/X{num}"):
+        if proc.poll() is not None or time.monotonic() > deadline:
+            proc.kill()
+            raise RuntimeError("Xvfb başlatılamadı")
+        time.sleep(0.05)
+    return proc, f":{num}"
+
+def _selftest_packets():
+    """(etiket, i → paket, beklenen) - beklenen: (cihaz, EV tipi, kod) | ("x", alan)"""
+    def gamepad(i):
+        frame = bytes((Config.PACKET_GAMEPAD, 1 - (i & 1), 0, 0, 0, 0, 0, 0, 0, 0, 0))
+        xor = 0
+        for b in frame:
+            xor ^= b
+        return frame + bytes((xor,))
+    return [
+        ("mouse_move", lambda i: bytes((Config.PACKET_MOUSE_MOVE, 6 if i & 1 else 250, 0)),
+         ("Benim Virtual Mouse", 0x02, 0x00), ("x", "move")),
+        ("mouse_button", lambda i: bytes((Config.PACKET_MOUSE_BUTTON, 0, 1 - (i & 1))),
+         ("Benim Virtual Mouse", 0x01, 0x110), ("x", "button")),
+        ("mouse_wheel", lambda i: bytes((Config.PACKET_MOUSE_WHEEL, 5 if i & 1 else 251)),
+         ("Benim Virtual Mouse", 0x02, 0x0b), None),
+        ("gamepad", gamepad,
+         ("Benim Virtual Gamepad", 0x01, 0x130), None),
+    ]
+
+def _selftest_backend(name, samples, interval):
+    """Tek backend için sunucuyu bu thread'de çalıştır, ölçümü yan thread'de yap"""
+    import io, contextlib
+    results, notes = {}, []
+    x_backend = name in ("pynput", "xdotool")
+    saved_env = {key: os.environ.get(key) for key in ("DISPLAY", "XDG_SESSION_TYPE")}
+    xvfb = None
+    if x_backend:
+        xvfb, display = _start_xvfb()
+        os.environ["DISPLAY"] = display
+        os.environ["XDG_SESSION_TYPE"] = "x11"
+    
+    probe_port = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    probe_port.bind(("127.0.0.1", 0))
+    port = probe_port.getsockname()[1]
+    probe_port.close()
+    
+    Config.BACKEND = name
+    Config.UDP_HOST = "127.0.0.1"
+    srv = UdpServer(port)
+    before = set(EventProbe.nodes())
+    finished = threading.Event()
+    
+    def measure():
+        deadline = time.monotonic() + 10
+        while srv.selector is None:
+            if finished.is_set() or time.monotonic() > deadline:
+                return
+            time.sleep(0.02)
+        sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sender.connect(("127.0.0.1", port))
+        probes = {}
+        try:
+            for label, make, evdev_expect, x_expect in _selftest_packets():
+                if x_backend:
+                    if not x_expect:
+                        continue
+                    probe = probes.get("x") or probes.setdefault("x", PointerProbe())
+                else:
+                    device = "ydotoold virtual device" if name == "ydotool" else evdev_expect[0]
+                    if device not in probes:
+                        path = EventProbe.find(device, before)
+                        if not path:
+                            notes.append(f"{label}: {device} düğümü yok")
+                            continue
+                        probes[device] = EventProbe(path)
+                    probe = probes[device]
+                
+                latencies, lost = [], 0
+                for i in range(samples):
+                    packet = make(i)
+                    if x_backend:
+                        state = probe.read()
+                        sent = time.monotonic()
+                        sender.send(packet)
+                        seen = probe.wait(state, sent + 1.0)
+                    else:
+                        probe.drain()
+                        sent = time.monotonic()
+                        sender.send(packet)
+                        seen = probe.wait(evdev_expect[1], evdev_expect[2], sent + 1.0)
+                    if seen is None:
+                        lost += 1
+                    else:
+                        latencies.append((seen - sent) * 1000)
+                    time.sleep(interval)
+                results[label] = (latencies, lost)
+        except Exception as e:
+            notes.append(f"ölçüm hatası: {e}")
+        finally:
+            for probe in probes.values():
+                if isinstance(probe, EventProbe):
+                    probe.close()
+            sender.close()
+            srv.call_in_loop(lambda: setattr(srv, "running", False))
+    
+    worker = threading.Thread(target=measure, daemon=True)
+    worker.start()
+    out = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(out):
+            srv.start()
+    finally:
+        finished.set()
+        worker.join(5)
+        if xvfb:
+            xvfb.terminate()
+            xvfb.wait(5)
+        for key, value in saved_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+    if not srv.backend:
+        failure = next((line for line in out.getvalue().splitlines() if "Backend hatası" in line), "başlatılamadı")
+        notes.append(failure.strip(" ❌\n"))
+    return results, notes
+
+def run_selftest(samples=200, backends=None):
+    """
+    Uçtan uca gecikme: loopback UDP gönderimi → sanal cihazda olayın görünmesi.
+    uinput/evdev/ydotool için /dev/input/eventN okunur (okuma izni gerekir),
+    pynput/xdotool için Xvfb üzerinde X imleci izlenir.
+    """
+    backends = backends or ["uinput", "evdev", "ydotool", "pynput", "xdotool"]
+    print(f"\n⏱️  Gecikme öz testi ({samples} örnek/paket tipi, loopback)")
+    print("─" * 62)
+    # Ölçümü etkilemeyecek şekilde: log, kontrol soketi, DSU, failover kapalı
+    Config.LOG_BUTTONS = False
+    Config.CONTROL_SOCKET = None
+    Config.DSU_PORT = None
+    Config.EXPORT_SHM = None
+    Config.FAILOVER_ENABLED = False
+    Config.UPSAMPLE_RATE = 0
+    interval = 0.012    # kabul kontrolü sınırlarının altında (mouse butonu dahil)
+    
+    print(f"  {'Backend':9} {'Paket':13} {'n':>5} {'kayıp':>5} {'min':>7} {'p50':>7} {'p95':>7} {'p99':>7} {'max':>7}  (ms)")
+    for name in backends:
+        try:
+            results, notes = _selftest_backend(name, samples, interval)
+        except Exception as e:
+            results, notes = {}, [str(e)]
+        for label, (latencies, lost) in results.items():
+            latencies.sort()
+            n = len(latencies)
+            if not n:
+                print(f"  {name:9} {label:13} {0:5} {lost:5}")
+                continue
+            pct = lambda q: latencies[min(n - 1, int(q * n))]
+            print(f"  {name:9} {label:13} {n:5} {lost:5} {latencies[0]:7.3f} {pct(0.5):7.3f} "
+                  f"{pct(0.95):7.3f} {pct(0.99):7.3f} {latencies[-1]:7.3f}")
+        for note in notes:
+            print(f"  {name:9} atlandı/uyarı: {note}")
+    print("─" * 62)
+
+# ═══════════════════════════════════════════════════════════════
+# YÜK ÜRETECİ (ÇOKLU İSTEMCİ)
+# ═══════════════════════════════════════════════════════════════
+class LoadClient:
+    """
+    Tek sanal telefon: kendi socket'i (ayrı kaynak port/IP) ve akış başına
+    durumu. Paketler uygulamanın gönderdiği biçimde ve doğru checksum'la üretilir.
+    """
+    def __init__(self, index, target, bind_ip):
+        self.index = index
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind((bind_ip, 0))
+        self.sock.connect(target)
+        self.sock.setblocking(False)
+        self.phase = index * 0.7            # istemciler aynı anda aynı hareketi yapmasın
+        self.buttons = 0
+        self.started = time.monotonic()
+    
+    def gamepad(self, now):
+        t = now - self.started + self.phase
+        # Sticks: yavaş daire, tetikler: testere; buton: ~yarım saniyede bir değişim
+        lx = int(math.cos(t * 2.0) * 120) & 0xFF
+        ly = int(math.sin(t * 2.0) * 120) & 0xFF
+        rx = int(math.sin(t * 3.1) * 90) & 0xFF
+        ry = int(math.cos(t * 2.3) * 90) & 0xFF
+        l2 = int((t * 200) % 256)
+        r2 = 255 - l2
+        if int(t * 2) & 1:
+            self.buttons |= 1 << (int(t) % 4)
+        else:
+            self.buttons = 0
+        frame = bytearray((Config.PACKET_GAMEPAD,)) + struct.pack('<I', self.buttons) + bytes((lx, ly, rx, ry, l2, r2))
+        xor = 0
+        for b in frame:
+            xor ^= b
+        frame.append(xor)
+        return bytes(frame)
+    
+    def gyro(self, now):
+        t = now - self.started + self.phase
+        return struct.pack('<Bhhh', Config.PACKET_GYRO, int(math.sin(t * 5) * 3000),
+                           int(math.cos(t * 4) * 2000), int(math.sin(t * 3) * 1000)) \
+            + struct.pack('<I', int(now * 1e6) & 0xFFFFFFFF)
+    
+    def mouse(self, now):
+        t = now - self.started + self.phase
+        return bytes((Config.PACKET_MOUSE_MOVE, int(math.cos(t * 3) * 4) & 0xFF, int(math.sin(t * 3) * 4) & 0xFF))
+    
+    def ping(self, now):
+        # Yankı ilk 9 byte'ı aynen döndürür: gönderim zamanı içinde taşınır
+        return struct.pack('<BQ', Config.PACKET_PING, time.monotonic_ns())
+    
+    def close(self):
+        self.sock.close()
+
+class LoadGenerator:
+    """
+    N istemciyi tek thread'de sürer: (zaman, istemci, akış) heap'i ile
+    gönderim zamanlanır, aralarda ping yankıları okunur. Patlama (burst)
+    deseni: her periyodun ilk `on` saniyesinde oranlar `factor` ile çarpılır.
+    """
+    STREAMS = ("gamepad", "gyro", "mouse", "ping")
+    MAX_LOOPBACK_CLIENTS = 255 * 254    # 127.0.1-255.1-254
+    
+    @staticmethod
+    def loopback_address(i):
+        """i. istemcinin kaynak adresi: 127.0.1.1 … 127.0.1.254, 127.0.2.1 …"""
+        return f"127.0.{1 + i // 254}.{1 + i % 254}"
+    
+    def __init__(self, target, clients, rates, burst=None):
+        self.target = target
+        self.rates = rates
+        self.burst = burst
+        loopback = target[0].startswith("127.")
+        # Loopback'te her istemci ayrı 127.0.x.y adresinden gelir → sunucuda ayrı istemci
+        if loopback and clients > self.MAX_LOOPBACK_CLIENTS:
+            raise ValueError(f"loopback'te en fazla {self.MAX_LOOPBACK_CLIENTS} istemci")
+        self.clients = [LoadClient(i, target, self.loopback_address(i) if loopback else "")
+                        for i in range(clients)]
+        self.sent = dict.fromkeys(self.STREAMS, 0)
+        self.send_errors = 0
+        self.rtts = []
+    
+    def _rate_factor(self, elapsed):
+        if not self.burst:
+            return 1.0
+        factor, on, period = self.burst
+        return factor if elapsed % period < on else 1.0
+    
+    def _read_echoes(self, sock):
+        try:
+            while True:
+                data = sock.recv(64)
+                if len(data) >= 9 and data[0] == Config.PACKET_PING:
+                    sent_ns = struct.unpack_from('<Q', data, 1)[0]
+                    self.rtts.append((time.monotonic_ns() - sent_ns) / 1e6)
+        except (BlockingIOError, InterruptedError):
+            pass
+        except OSError:
+            pass    # ICMP port unreachable: sunucu kapalı
+    
+    def run(self, duration):
+        selector = selectors.DefaultSelector()
+        for client in self.clients:
+            selector.register(client.sock, selectors.EVENT_READ, client)
+        
+        start = time.monotonic()
+        end = start + duration
+        heap = []
+        for client in self.clients:
+            for stream in self.STREAMS:
+                if self.rates.get(stream):
+                    # Başlangıçları dağıt: tüm istemciler aynı anda göndermesin
+                    offset = (client.index / len(self.clients)) / self.rates[stream]
+                    heapq.heappush(heap, (start + offset, client.index, stream))
+        
+        try:
+            while heap:
+                due, index, stream = heap[0]
+                now = time.monotonic()
+                if due > now:
+                    for key, _ in selector.select(min(due, end) - now):
+                        self._read_echoes(key.fileobj)
+                    continue
+                if due >= end:
+                    break
+                client = self.clients[index]
+                try:
+                    client.sock.send(getattr(client, stream)(now))
+                    self.sent[stream] += 1
+                except OSError:
+                    self.send_errors += 1
+                rate = self.rates[stream] * self._rate_factor(due - start)
+                heapq.heapreplace(heap, (due + 1.0 / rate, index, stream))
+            
+            # Geç kalan yankılar
+            grace = time.monotonic() + 0.5
+            while time.monotonic() < grace:
+                for key, _ in selector.select(grace - time.monotonic()):
+                    self._read_echoes(key.fileobj)
+        finally:
+            selector.close()
+            for client in self.clients:
+                client.close()
+        return time.monotonic() - start
+
+def _server_stats(control_path):
+    """Kontrol soketinden sunucu istatistikleri (yoksa None)"""
+    if not control_path:
+        return None
+    try:
+        reply = control_request(control_path, "stats")
+    except (OSError, ValueError):
+        return None
+    return reply.get("result") if reply.get("ok") else None
+
+def run_loadgen(target, client_steps, rates, duration, burst=None, control_path=None, scales=(1.0,)):
+    """
+    --loadgen: her (istemci sayısı, oran çarpanı) adımı için yük uygula.
+    İstemci tarafı: gönderilen paketler, ping RTT yüzdelikleri.
+    Sunucu tarafı (kontrol soketi erişilebilirse): alınan paket farkı,
+    kabul kontrolü reddi ve checksum hatası → kayıp.
+    """
+    print(f"\n📶 Yük üreteci → {target[0]}:{target[1]}, adım başına {duration:g} sn")
+    rate_text = ", ".join(f"{k}={v:g}" for k, v in rates.items())
+    print(f"  İstemci başına oranlar (Hz): {rate_text}")
+    if burst:
+        print(f"  Patlama: her {burst[2]:g} sn'nin ilk {burst[1]:g} sn'si x{burst[0]:g}")
+    if not target[0].startswith("127."):
+        print("  ⚠️  Uzak hedef: istemciler tek IP'den (ayrı portlardan) gelir, sunucu tek istemci görür")
+    if not _server_stats(control_path):
+        print("  ⚠️  Kontrol soketi yok: sunucu tarafı kayıp raporlanmayacak")
+    print("─" * 78)
+    print(f"  {'İstemci':>7} {'x':>4} {'hedef/s':>8} {'gönd/s':>8} {'srv kayıp':>9} {'reddedilen':>10} "
+          f"{'ping':>9} {'p50':>6} {'p95':>6} {'p99':>6} {'max':>6}")
+    
+    for clients in client_steps:
+        for scale in scales:
+            step_rates = {k: v * scale for k, v in rates.items()}
+            before = _server_stats(control_path)
+            gen = LoadGenerator(target, clients, step_rates, burst)
+            elapsed = gen.run(duration)
+            after = _server_stats(control_path)
+            
+            total = sum(gen.sent.values())
+            target_rate = sum(step_rates.values()) * clients
+            if burst:
+                factor, on, period = burst
+                target_rate *= (min(on, period) * factor + max(0.0, period - on)) / period
+            pings = gen.sent["ping"]
+            rtts = sorted(gen.rtts)
+            
+            srv_loss = rejected = "-"
+            if before and after:
+                received = after["packets"] - before["packets"]
+                adm_b, adm_a = before.get("admission", {}), after.get("admission", {})
+                refused = (adm_a.get("rate_limited", 0) - adm_b.get("rate_limited", 0)
+                           + after["checksum_fail"] - before["checksum_fail"])
+                lost = max(0, total - received)
+                srv_loss = f"{100.0 * lost / total:.2f}%" if total else "-"
+                rejected = f"{100.0 * refused / total:.2f}%" if total else "-"
+            
+            ping_text = f"{len(rtts)}/{pings}"
+            if rtts:
+                n = len(rtts)
+                pct = lambda q: rtts[min(n - 1, int(q * n))]
+                rtt_text = f"{pct(0.5):6.2f} {pct(0.95):6.2f} {pct(0.99):6.2f} {rtts[-1]:6.2f}"
+            else:
+                rtt_text = f"{'-':>6} {'-':>6} {'-':>6} {'-':>6}"
+            print(f"  {clients:7} {scale:4g} {target_rate:8.0f} {total / elapsed:8.0f} {srv_loss:>9} "
+                  f"{rejected:>10} {ping_text:>9} {rtt_text}")
+            if gen.send_errors:
+                print(f"  {'':7} gönderim hatası: {gen.send_errors}")
+    print("─" * 78)
+    print("  srv kayıp: sunucuya hiç ulaşmayan (socket buffer / ağ), reddedilen: kabul kontrolü + checksum")
+    print("  RTT (ms): ping yankısı, sunucu döngüsünün o anki yükünü içerir")
+
+def _parse_load_rates(text):
+    """'gamepad=60,gyro=100' → {akış: Hz}, belirtilmeyenler varsayılan"""
+    rates = {"gamepad": 60.0, "gyro": 100.0, "mouse": 125.0, "ping": 10.0}
+    if text:
+        for item in text.split(","):
+            name, _, value = item.partition("=")
+            name = name.strip()
+            if name not in rates:
+                raise ValueError(f"bilinmeyen akış: {name} ({', '.join(rates)})")
+            rates[name] = max(0.0, float(value))
+    return rates
 
 # ═══════════════════════════════════════════════════════════════
 # MAIN
@@ -830,10 +5314,17 @@ Paket Formatı (12 Byte):
   ./run.sh                    Normal başlat
   ./run.sh -d                 Debug modu (tüm loglar)
   ./run.sh -d --no-checksum   Debug + checksum kapalı
+  ./run.sh --pairing 60 --auth required   60 sn içinde eşleşen telefonlar, MAC zorunlu
   ./run.sh -g                 Sadece gyro logları
   ./run.sh -p 5000            Farklı port
   ./run.sh -b evdev           Evdev backend
   ./run.sh --gyro-mouse       Gyro'yu mouse olarak kullan
+  ./run.sh --stick right:curve=power,exponent=2.2,deadzone=8
+                              Sağ stick için üstel eğri
+  ./run.sh --pointer adaptive Touchpad için hıza bağlı ivmelenme
+  ./run.sh --bench            Backend/işleme benchmark'ı
+  ./run.sh --selftest         Uçtan uca gecikme testi (loopback → /dev/input)
+  ./run.sh --loadgen --load-clients 1,5,10,20   Çoklu istemci yük testi
         """
     )
     parser.add_argument("-p", "--port", type=int, default=26760, help="UDP port")
@@ -841,13 +5332,117 @@ Paket Formatı (12 Byte):
     parser.add_argument("-g", "--gyro-log", action="store_true", help="Gyro loglarını aç")
     parser.add_argument("--gyro-mouse", action="store_true", help="Gyro'yu mouse hareketi olarak kullan")
     parser.add_argument("--gyro-sens", type=float, default=1.0, help="Gyro hassasiyeti (varsayılan: 1.0)")
-    parser.add_argument("-b", "--backend", choices=["auto", "evdev", "pynput", "xdotool", "ydotool"],
+    parser.add_argument("--no-world-yaw", action="store_true",
+                        help="Gyro mouse yatayını yerçekimi yerine telefonun z ekseninden al")
+    parser.add_argument("--imu-beta", type=float, default=Config.IMU_FUSION_BETA, metavar="β",
+                        help=f"IMU füzyonu ivme düzeltme kazancı (varsayılan: {Config.IMU_FUSION_BETA})")
+    parser.add_argument("--tilt-steer", type=ImuFusion.parse_axis, metavar="lx|rx",
+                        help="Telefonu yana yatırmayı bu stick eksenine ver (IMU paketi gerekir)")
+    parser.add_argument("--tilt-range", type=float, default=Config.TILT_STEER_RANGE, metavar="DERECE",
+                        help=f"Tam direksiyon için eğim açısı (varsayılan: {Config.TILT_STEER_RANGE:g})")
+    parser.add_argument("--tilt-invert", action="store_true", help="Eğim yönünü ters çevir")
+    parser.add_argument("--macro", action="append", default=[], metavar="BUTON=EYLEM",
+                        help="Buton makrosu, tekrarlanabilir: A=key:ctrl+c, X=tap:f5, Y=seq:h,i,enter, "
+                             "R1=turbo:space@15, L1=repeat:right@30/300, B=turbo:A@20")
+    parser.add_argument("-b", "--backend", choices=["auto", "uinput", "evdev", "pynput", "xdotool", "ydotool"],
                        default="auto", help="Input backend")
     parser.add_argument("--no-checksum", action="store_true", help="XOR checksum doğrulamayı kapat")
+    parser.add_argument("--pointer", choices=PointerAccel.PROFILES, default="flat",
+                       help="Touchpad ivmelenme profili")
+    parser.add_argument("--touch-mode", choices=TouchTranslator.MODES, default="pointer",
+                        help="Mutlak dokunma: pointer (tablet imleci) | touchscreen (çoklu dokunma)")
+    parser.add_argument("--touch-region", metavar="X0,Y0,X1,Y1",
+                        help="Telefon yüzeyinin eşlendiği ekran bölgesi (0-1, varsayılan: tüm ekran)")
+    parser.add_argument("--pointer-points", metavar="V:G;V:G",
+                       help="custom profil noktaları (hız birim/ms : kazanç)")
+    parser.add_argument("--allow", action="append", default=[], metavar="IP",
+                       help="Sadece bu IP'lerden gelen paketleri kabul et (tekrarlanabilir)")
+    parser.add_argument("--pairing", type=float, default=0, metavar="SN",
+                       help="Başlangıçtan sonra SN saniye içinde DISCOVER gönderenleri eşle, diğerlerini reddet")
+    parser.add_argument("--auth", choices=PacketAuth.MODES, default=Config.AUTH_MODE,
+                       help="Paket MAC doğrulaması: eşleşmiş istemciler (optional) ya da herkes (required)")
+    parser.add_argument("--max-clients", type=int, default=64, help="İzlenen istemci sınırı (LRU)")
+    parser.add_argument("--no-admission", action="store_true", help="Token bucket kabul kontrolünü kapat")
+    parser.add_argument("--input-deadline", type=float, default=Config.INPUT_DEADLINE, metavar="SN",
+                       help="Girdi tutulurken bu süre paket gelmezse her şeyi bırak (0 = kapalı)")
+    parser.add_argument("--upsample", type=int, default=0, metavar="HZ",
+                       help="Stick/tetik çıkışını HZ hızında üret (0 = kapalı)")
+    parser.add_argument("--upsample-mode", choices=AxisUpsampler.MODES, default="extrapolate",
+                       help="Ara değer yöntemi (varsayılan: extrapolate)")
+    parser.add_argument("--export-shm", nargs="?", const=Config.EXPORT_SHM_DEFAULT, metavar="YOL",
+                       help=f"Decode edilen frame'leri paylaşımlı belleğe yaz (varsayılan {Config.EXPORT_SHM_DEFAULT})")
+    parser.add_argument("--no-failover", action="store_true",
+                        help="Backend hata/yavaşlıkta yeniden kurma ve yedeğe geçişi kapat")
+    parser.add_argument("--dsu", type=int, nargs="?", const=Config.DSU_PORT_DEFAULT, metavar="PORT",
+                        help=f"DSU/cemuhook hareket sunucusunu aç (varsayılan port: {Config.DSU_PORT_DEFAULT})")
+    parser.add_argument("--dsu-host", default=Config.DSU_HOST, metavar="IP",
+                        help="DSU dinleme adresi (varsayılan: sadece loopback)")
+    parser.add_argument("--dsu-gyro-map", metavar="P,Y,R",
+                        help="Telefon ekseni → DSU pitch,yaw,roll (örn. -y,z,-x)")
+    parser.add_argument("--no-rumble", action="store_true", help="Force-feedback (rumble) desteğini kapat")
+    parser.add_argument("--stick", action="append", default=[], metavar="SPEC",
+                       help="Stick eğrisi: [left|right|both:]mode=radial,curve=power,exponent=2,"
+                            "deadzone=10,anti_deadzone=0,outer=127,points=x:y;x:y")
+    parser.add_argument("--profile-mode", choices=LoopProfiler.MODES, default="cprofile",
+                        help="SIGUSR1 profili: cprofile (pstats) | sample (collapsed stack)")
+    parser.add_argument("--profile-duration", type=float, default=Config.PROFILE_DURATION, metavar="SN",
+                        help="Profil süresi (varsayılan: 10, tekrar SIGUSR1 erken durdurur)")
+    parser.add_argument("--profile-dir", default=".", metavar="DİZİN", help="Profil çıktı dizini")
+    parser.add_argument("--control", default=Config.CONTROL_SOCKET, metavar="YOL",
+                        help=f"Kontrol soketi yolu (varsayılan: {Config.CONTROL_SOCKET})")
+    parser.add_argument("--no-control", action="store_true", help="Kontrol soketini kapat")
+    parser.add_argument("--ctl", nargs="+", metavar="KOMUT",
+                        help="Çalışan sunucuya komut gönder: stats, clients, get, set k=v, log, profile, capture")
+    parser.add_argument("--selftest", type=int, nargs="?", const=200, metavar="N",
+                        help="Loopback gecikme öz testi, paket tipi başına N örnek (varsayılan: 200)")
+    parser.add_argument("--selftest-backends", metavar="LİSTE",
+                        help="Test edilecek backend'ler, virgülle (varsayılan: hepsi)")
+    parser.add_argument("--loadgen", nargs="?", const="127.0.0.1", metavar="HOST",
+                        help="Yük üreteci: çalışan sunucuya N sanal istemciyle yük uygula (port: -p)")
+    parser.add_argument("--load-clients", default="10", metavar="LİSTE",
+                        help="İstemci sayıları, virgülle adım adım (örn: 1,5,10,20)")
+    parser.add_argument("--load-rates", metavar="AKIŞ=HZ,...",
+                        help="İstemci başına oranlar (varsayılan: gamepad=60,gyro=100,mouse=125,ping=10)")
+    parser.add_argument("--load-scale", default="1", metavar="LİSTE",
+                        help="Oran çarpanları, virgülle adım adım (örn: 1,2,4)")
+    parser.add_argument("--load-duration", type=float, default=10.0, metavar="SN",
+                        help="Adım başına süre (varsayılan: 10)")
+    parser.add_argument("--load-burst", metavar="ÇARPAN:AÇIK:PERİYOT",
+                        help="Patlama deseni, örn 4:0.2:2 → her 2 sn'nin ilk 0.2 sn'si x4")
+    parser.add_argument("--bench", type=int, nargs="?", const=20000, metavar="N",
+                       help="Benchmark çalıştır ve çık (varsayılan 20000 frame)")
     parser.add_argument("-v", "--version", action="version", version=f"v{VERSION}")
     
     args = parser.parse_args()
     
+    if args.bench:
+        run_benchmark(args.bench)
+        return
+    
+    if args.ctl:
+        sys.exit(run_control_client(args.control, " ".join(args.ctl)))
+    
+    if args.loadgen:
+        try:
+            rates = _parse_load_rates(args.load_rates)
+            burst = tuple(float(v) for v in args.load_burst.split(":")) if args.load_burst else None
+            if burst and (len(burst) != 3 or burst[2] <= 0):
+                raise ValueError("--load-burst ÇARPAN:AÇIK:PERİYOT")
+            steps = [int(v) for v in args.load_clients.split(",")]
+            if not all(0 < n <= LoadGenerator.MAX_LOOPBACK_CLIENTS for n in steps):
+                raise ValueError(f"--load-clients: 1..{LoadGenerator.MAX_LOOPBACK_CLIENTS} arası olmalı")
+            scales = [float(v) for v in args.load_scale.split(",")]
+        except ValueError as e:
+            parser.error(str(e))
+        run_loadgen((args.loadgen, args.port), steps, rates, args.load_duration,
+                    burst=burst, control_path=None if args.no_control else args.control, scales=scales)
+        return
+    
+    if args.selftest:
+        names = [n.strip() for n in args.selftest_backends.split(",")] if args.selftest_backends else None
+        run_selftest(args.selftest, names)
+        return
+    
     # Config ayarları
     if args.debug:
         Config.enable_debug()
@@ -862,11 +5457,88 @@ Paket Formatı (12 Byte):
     if args.no_checksum:
         Config.VERIFY_CHECKSUM = False
     
+    Config.GYRO_WORLD_YAW = not args.no_world_yaw
+    Config.IMU_FUSION_BETA = max(0.0, args.imu_beta)
+    Config.TILT_STEER = args.tilt_steer
+    Config.TILT_STEER_RANGE = max(1.0, args.tilt_range)
+    Config.TILT_STEER_INVERT = args.tilt_invert
+    for item in args.macro:
+        name, sep, spec = item.partition("=")
+        try:
+            if not sep:
+                raise ValueError(f"BUTON=EYLEM bekleniyor: {item}")
+            MacroEngine.button_mask(name)
+            MacroEngine.parse(spec)
+        except ValueError as e:
+            parser.error(f"--macro: {e}")
+        Config.MACROS[name.strip().upper()] = spec
+    
     Config.BACKEND = args.backend
     
+    Config.INPUT_DEADLINE = max(0.0, args.input_deadline)
+    Config.FF_ENABLED = not args.no_rumble
+    Config.FAILOVER_ENABLED = not args.no_failover
+    Config.DSU_PORT = args.dsu
+    Config.DSU_HOST = args.dsu_host
+    if args.dsu_gyro_map:
+        axes = tuple(a.strip() for a in args.dsu_gyro_map.split(","))
+        if len(axes) != 3 or any(a.lstrip("+-") not in ("x", "y", "z") for a in axes):
+            parser.error(f"--dsu-gyro-map: geçersiz eşleme {args.dsu_gyro_map}")
+        Config.DSU_GYRO_MAP = axes
+    if args.dsu == args.port:
+        parser.error("--dsu portu telefon portundan farklı olmalı")
+    Config.UPSAMPLE_RATE = max(0, args.upsample)
+    Config.UPSAMPLE_MODE = args.upsample_mode
+    Config.EXPORT_SHM = args.export_shm
+    Config.ADMISSION_ENABLED = not args.no_admission
+    Config.ALLOWLIST = set(args.allow) or None
+    Config.PAIRING_WINDOW = args.pairing
+    Config.AUTH_MODE = args.auth
+    Config.MAX_CLIENTS = args.max_clients
+    
+    Config.CONTROL_SOCKET = None if args.no_control else args.control
+    Config.PROFILE_MODE = args.profile_mode
+    Config.PROFILE_DURATION = max(0.1, args.profile_duration)
+    Config.PROFILE_DIR = args.profile_dir
+    
+    Config.TOUCH_MODE = args.touch_mode
+    if args.touch_region:
+        try:
+            region = tuple(float(n) for n in args.touch_region.split(","))
+        except ValueError:
+            region = ()
+        if len(region) != 4 or not all(0 <= n <= 1 for n in region) \
+                or region[0] >= region[2] or region[1] >= region[3]:
+            parser.error(f"--touch-region: geçersiz bölge {args.touch_region}")
+        Config.TOUCH_REGION = region
+    
+    Config.POINTER_PROFILE = args.pointer
+    if args.pointer_points:
+        try:
+            Config.POINTER_POINTS = PointerAccel.parse_points(args.pointer_points)
+        except ValueError as e:
+            parser.error(f"--pointer-points {args.pointer_points}: {e}")
+    if args.pointer == "custom" and not Config.POINTER_POINTS:
+        parser.error("--pointer custom için --pointer-points gerekli")
+    
+    for spec in args.stick:
+        try:
+            sides, values = StickCurve.parse_spec(spec)
+        except ValueError as e:
+            parser.error(f"--stick {spec}: {e}")
+        for side in sides:
+            Config.STICK_PROFILES[side].update(values)
+    # Birleşik profil burada denetlenir (tablolar sunucu kurulurken hesaplanır)
+    for side, profile in Config.STICK_PROFILES.items():
+        try:
+            StickCurve.validate(**profile)
+        except ValueError as e:
+            parser.error(f"--stick ({side}): {e}")
+    
     # Bağımlılık kontrolü
     def check_dependencies():
-        required = ['evdev', 'pynput']
+        # evdev sadece evdev backend'i için gerekli (uinput backend'i ham ioctl kullanır)
+        required = ['pynput'] + (['evdev'] if args.backend == 'evdev' else [])
         missing = []
         
         for dep in required:
@@ -899,8 +5571,7 @@ Paket Formatı (12 Byte):
     
     def sig_handler(sig, frame):
         print("\n\n🛑 Kapatılıyor...")
-        server.stop()
-        sys.exit(0)
+        server.request_stop()
     
     signal.signal(signal.SIGINT, sig_handler)
     signal.signal(signal.SIGTERM, sig_handler)
@@ -0,0 +1,79 @@
+"""Kabul kontrolü (AdmissionControl) LRU çıkarma regresyon testleri"""
+import os
+import struct
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import server
+from server import Config
+
+PHONE = ("192.168.1.50", 40000)
+BTN_A = 0x01
+
+
+class RecordingBackend(server.InputBackend):
+    name = "test"
+
+    def __init__(self):
+        self.writes = []
+
+    def mouse_move(self, dx, dy): pass
+    def mouse_button(self, button, pressed): pass
+    def mouse_scroll(self, vertical, horizontal=0): pass
+
+    def gamepad_buttons(self, buttons, prev):
+        self.writes.append((buttons, prev))
+
+
+class NullSocket:
+    def sendto(self, data, addr):
+        pass
+
+
+def frame(buttons):
+    data = bytearray(struct.pack('<BI', Config.PACKET_GAMEPAD, buttons) + bytes((128, 128, 128, 128, 0, 0)))
+    xor = 0
+    for b in data:
+        xor ^= b
+    data.append(xor)
+    return bytes(data)
+
+
+def ping():
+    return struct.pack('<BQ', Config.PACKET_PING, 0)
+
+
+class AdmissionEvictionTests(unittest.TestCase):
+
+    def setUp(self):
+        self.saved = (Config.CONTROL_SOCKET, Config.LOG_BUTTONS, Config.ADMISSION_ENABLED)
+        Config.CONTROL_SOCKET = None
+        Config.LOG_BUTTONS = False
+        Config.ADMISSION_ENABLED = True
+        self.srv = server.UdpServer(port=0)
+        self.srv.backend = RecordingBackend()
+        self.srv.sock = NullSocket()
+        self.srv.log = lambda *args, **kwargs: None
+
+    def tearDown(self):
+        Config.CONTROL_SOCKET, Config.LOG_BUTTONS, Config.ADMISSION_ENABLED = self.saved
+
+    def test_source_flood_keeps_held_buttons(self):
+        self.srv.process_packet(frame(BTN_A), PHONE)
+        self.srv.backend.writes.clear()
+        # Sahte kaynaklardan tablo sınırını aşan ping seli: telefon LRU ile çıkarılır
+        for i in range(Config.MAX_CLIENTS + 6):
+            self.srv.process_packet(ping(), (f"10.9.{i // 250}.{i % 250 + 1}", 5000))
+        self.assertGreater(self.srv.admission.stats['evicted'], 0)
+        self.assertNotIn(PHONE[0], self.srv.admission.clients)
+        self.assertEqual(self.srv.backend.writes, [])
+        self.assertEqual(self.srv.prev_buttons[PHONE[0]], BTN_A)
+        # Telefonun sonraki paketi yeniden kabul edilir, basılı durum sürer
+        self.srv.process_packet(frame(BTN_A), PHONE)
+        self.assertEqual(self.srv.backend.writes, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+"""BackendSupervisor: yedek backend kurulumu paket döngüsünü durdurmamalı"""
+import os
+import sys
+import threading
+import time
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import server
+from server import BackendSupervisor, Config
+
+
+class BrokenBackend(server.InputBackend):
+    name = "broken"
+    built = False
+
+    def __init__(self):
+        # Yeniden kurulamaz: failover sıradakine geçmeli
+        if BrokenBackend.built:
+            raise OSError("yeniden kurulamadı")
+        BrokenBackend.built = True
+
+    def mouse_move(self, dx, dy): raise OSError("cihaz yok")
+    def mouse_button(self, button, pressed): pass
+    def mouse_scroll(self, vertical, horizontal=0): pass
+
+
+class SlowStartBackend(server.InputBackend):
+    """ydotoold başlatma gibi saniyelik kurulum"""
+    name = "slow"
+    started = threading.Event()
+
+    def __init__(self):
+        SlowStartBackend.started.wait(5)
+        self.moves = []
+
+    def mouse_move(self, dx, dy): self.moves.append((dx, dy))
+    def mouse_button(self, button, pressed): pass
+    def mouse_scroll(self, vertical, horizontal=0): pass
+
+
+class FailoverTests(unittest.TestCase):
+
+    def setUp(self):
+        self.saved = (server.backend_order, Config.FAILOVER_ENABLED)
+        server.backend_order = lambda: [SlowStartBackend]
+        Config.FAILOVER_ENABLED = True
+        SlowStartBackend.started.clear()
+        BrokenBackend.built = False
+        self.deferred = []
+        self.swaps = []
+        self.supervisor = BackendSupervisor(
+            BrokenBackend(), max_errors=2,
+            on_swap=lambda old, new, reason: self.swaps.append((old.name, new.name)),
+            defer=self.deferred.append)
+
+    def tearDown(self):
+        server.backend_order, Config.FAILOVER_ENABLED = self.saved
+        SlowStartBackend.started.set()
+
+    def test_candidate_built_off_loop_and_swapped_in_loop(self):
+        t0 = time.monotonic()
+        self.supervisor.mouse_move(1, 1)
+        self.supervisor.mouse_move(1, 1)    # ikinci hata: failover
+        self.assertLess(time.monotonic() - t0, 0.5)
+        self.assertTrue(self.supervisor.swapping)
+        # Kurulum sürerken çıkış yutulur, hata sayılmaz
+        self.supervisor.mouse_move(2, 2)
+        self.assertEqual(self.supervisor.health.errors, 2)
+
+        SlowStartBackend.started.set()
+        deadline = time.monotonic() + 5
+        while not self.deferred and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.supervisor.backend.name, "broken")    # değişim döngüde yapılır
+        self.deferred.pop()()
+        self.assertEqual(self.swaps, [("broken", "slow")])
+        self.assertFalse(self.supervisor.swapping)
+        self.supervisor.mouse_move(3, 3)
+        self.assertEqual(self.supervisor.backend.moves, [(3, 3)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+"""Buton kenarı eki (UdpServer._apply_edges) regresyon testleri"""
+import os
+import struct
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import server
+from server import Config
+
+IP = "10.0.0.7"
+BTN_A, BTN_B = 0x01, 0x02
+
+
+class RecordingBackend(server.InputBackend):
+    name = "test"
+
+    def __init__(self):
+        self.writes = []
+
+    def mouse_move(self, dx, dy): pass
+    def mouse_button(self, button, pressed): pass
+    def mouse_scroll(self, vertical, horizontal=0): pass
+
+    def gamepad_buttons(self, buttons, prev):
+        self.writes.append((buttons, prev))
+
+
+class NullSocket:
+    def sendto(self, data, addr):
+        pass
+
+
+def edge(seq, button_bit, pressed):
+    return (seq, button_bit | (0x80 if pressed else 0))
+
+
+def frame(buttons, edges):
+    """Tam gamepad paketi (12 byte, XOR) + kenar eki [n][sıra u16 LE, kenar]...[XOR]"""
+    data = bytearray(struct.pack('<BI', Config.PACKET_GAMEPAD, buttons) + bytes((128, 128, 128, 128, 0, 0)))
+    xor = 0
+    for b in data:
+        xor ^= b
+    data.append(xor)
+    trailer = bytearray((len(edges),))
+    for seq, value in edges:
+        trailer += struct.pack('<HB', seq, value)
+    xor = 0
+    for b in trailer:
+        xor ^= b
+    trailer.append(xor)
+    return bytes(data + trailer)
+
+
+class ButtonEdgeTests(unittest.TestCase):
+
+    def setUp(self):
+        self.saved = (Config.CONTROL_SOCKET, Config.LOG_BUTTONS)
+        Config.CONTROL_SOCKET = None
+        Config.LOG_BUTTONS = False
+        self.srv = server.UdpServer(port=0)
+        self.srv.backend = RecordingBackend()
+        self.srv.sock = NullSocket()
+        self.srv.log = lambda *args, **kwargs: None
+
+    def tearDown(self):
+        Config.CONTROL_SOCKET, Config.LOG_BUTTONS = self.saved
+
+    def send(self, data):
+        self.srv.process_packet(data, (IP, 40000))
+        writes = self.srv.backend.writes[:]
+        self.srv.backend.writes.clear()
+        return writes
+
+    def test_history_not_replayed_without_baseline(self):
+        # İlk temas: son 4 kenar (A bas/bırak, B bas/bırak) taşıyan nötr paket
+        history = [edge(10, 0, True), edge(11, 0, False), edge(12, 1, True), edge(13, 1, False)]
+        self.assertEqual(self.send(frame(0, history)), [])
+        self.assertEqual(self.srv.edge_seq[IP], 13)
+
+    def test_history_not_replayed_after_forget(self):
+        self.send(frame(BTN_A, [edge(20, 0, True)]))
+        self.send(frame(0, [edge(20, 0, True), edge(21, 0, False)]))
+        self.srv._forget_client(IP)
+        self.assertEqual(self.send(frame(0, [edge(20, 0, True), edge(21, 0, False)])), [])
+
+    def test_lost_frame_edges_recovered(self):
+        self.send(frame(0, [edge(30, 0, True), edge(31, 0, False)]))
+        # 32 (A bas) ve 33 (A bırak) taşıyan paketler kayboldu; sonraki ek ikisini de getirir
+        writes = self.send(frame(0, [edge(32, 0, True), edge(33, 0, False), edge(34, 1, True), edge(35, 1, False)]))
+        self.assertEqual(writes, [(BTN_A, 0), (0, BTN_A), (BTN_B, 0), (0, BTN_B)])
+        self.assertEqual(self.srv.stats['edges_recovered'], 3)
+
+    def test_reordered_stale_frame_dropped(self):
+        self.send(frame(0, [edge(40, 0, False)]))
+        self.send(frame(BTN_A, [edge(40, 0, False), edge(41, 0, True)]))
+        # Geç gelen eski paket (A basılı değil) yeni durumu geri almamalı
+        self.assertEqual(self.send(frame(0, [edge(40, 0, False)])), [])
+        self.assertEqual(self.srv.prev_buttons[IP], BTN_A)
+        self.assertEqual(self.srv.stats['stale_frames'], 1)
+
+    def test_sequence_wraps(self):
+        self.send(frame(0, [edge(0xFFFF, 0, False)]))
+        writes = self.send(frame(BTN_A, [edge(0xFFFF, 0, False), edge(0, 0, True)]))
+        self.assertEqual(writes, [(BTN_A, 0)])
+        self.assertEqual(self.srv.edge_seq[IP], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
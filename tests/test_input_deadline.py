@@ -0,0 +1,87 @@
+"""Takılı girdi koruması: son tarih bırakması ve keyframe ile yeniden eşitleme"""
+import os
+import struct
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import server
+from server import Config
+
+PHONE = ("192.168.1.50", 40000)
+BTN_A = 0x01
+
+
+class RecordingBackend(server.InputBackend):
+    name = "test"
+
+    def __init__(self):
+        self.writes = []
+
+    def mouse_move(self, dx, dy): pass
+    def mouse_button(self, button, pressed): pass
+    def mouse_scroll(self, vertical, horizontal=0): pass
+
+    def gamepad_buttons(self, buttons, prev):
+        self.writes.append((buttons, prev))
+
+
+class RecordingSocket:
+    def __init__(self):
+        self.sent = []
+
+    def sendto(self, data, addr):
+        self.sent.append((bytes(data), addr))
+
+
+def frame(buttons):
+    data = bytearray(struct.pack('<BI', Config.PACKET_GAMEPAD, buttons) + bytes((128, 128, 128, 128, 0, 0)))
+    xor = 0
+    for b in data:
+        xor ^= b
+    data.append(xor)
+    return bytes(data)
+
+
+def ping():
+    return struct.pack('<BQ', Config.PACKET_PING, 0)
+
+
+class InputDeadlineTests(unittest.TestCase):
+
+    def setUp(self):
+        self.saved = (Config.CONTROL_SOCKET, Config.LOG_BUTTONS)
+        Config.CONTROL_SOCKET = None
+        Config.LOG_BUTTONS = False
+        self.srv = server.UdpServer(port=0)
+        self.srv.backend = RecordingBackend()
+        self.srv.sock = RecordingSocket()
+        self.srv.log = lambda *args, **kwargs: None
+
+    def tearDown(self):
+        Config.CONTROL_SOCKET, Config.LOG_BUTTONS = self.saved
+
+    def keyframe_requests(self):
+        return [addr for data, addr in self.srv.sock.sent if data == bytes((Config.PACKET_KEYFRAME,))]
+
+    def test_default_covers_two_ping_periods(self):
+        self.assertGreater(Config.INPUT_DEADLINE, 2.0)
+
+    def test_release_requests_keyframe_on_return(self):
+        self.srv.process_packet(frame(BTN_A), PHONE)
+        self.srv._deadline_expired(PHONE[0])
+        self.assertEqual(self.srv.backend.writes[-1], (0, BTN_A))
+        self.assertEqual(self.keyframe_requests(), [])
+        # Geç gelen ping: telefon tutulan durumu yeniden göndermeli
+        self.srv.process_packet(ping(), PHONE)
+        self.assertEqual(self.keyframe_requests(), [PHONE])
+        self.srv.process_packet(frame(BTN_A), PHONE)
+        self.assertEqual(self.srv.backend.writes[-1], (BTN_A, 0))
+        # Sadece bir kez istenir
+        self.srv.process_packet(ping(), PHONE)
+        self.assertEqual(self.keyframe_requests(), [PHONE])
+
+
+if __name__ == "__main__":
+    unittest.main()
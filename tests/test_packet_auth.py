@@ -0,0 +1,66 @@
+"""Eşleştirme (PacketAuth.pair) ve bekleyen oturum regresyon testleri"""
+import hashlib
+import os
+import struct
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from server import Config, PacketAuth, _AuthSession
+
+
+def client_pair(auth, ip, now):
+    """Telefon tarafı DH: açık anahtarı gönder, sunucu yanıtından oturumu kur"""
+    secret = int.from_bytes(os.urandom(32), "big")
+    public = pow(PacketAuth.GENERATOR, secret, PacketAuth.PRIME).to_bytes(PacketAuth.PUBLIC_SIZE, "big")
+    reply = auth.pair(ip, public.hex(), now)
+    if reply is None:
+        return None
+    server_public = bytes.fromhex(reply[0])
+    shared = pow(int.from_bytes(server_public, "big"), secret, PacketAuth.PRIME).to_bytes(PacketAuth.PUBLIC_SIZE, "big")
+    return _AuthSession(hashlib.sha256(shared + public + server_public).digest())
+
+
+def ping(session, counter):
+    body = struct.pack('<BQI', Config.PACKET_PING, 0, counter)
+    return body + session.tag(body)
+
+
+class PacketAuthTests(unittest.TestCase):
+
+    def test_unverified_pairing_does_not_evict_sessions(self):
+        auth = PacketAuth("required", max_clients=2, pair_rate=(1000, 1000), max_pending=2)
+        verified = {}
+        for ip in ("10.0.0.1", "10.0.0.2"):
+            verified[ip] = client_pair(auth, ip, 0.0)
+            self.assertEqual(len(auth.verify([(ping(verified[ip], 1), (ip, 1))])), 1)
+        # Doğrulanmış paket göndermeyen eşleştirme seli
+        for i in range(10):
+            client_pair(auth, f"10.0.1.{i}", 0.0)
+        self.assertEqual(list(auth.sessions), ["10.0.0.1", "10.0.0.2"])
+        self.assertEqual(len(auth.pending), 2)
+        for ip, session in verified.items():
+            self.assertEqual(len(auth.verify([(ping(session, 2), (ip, 1))])), 1)
+
+    def test_pending_promoted_on_first_valid_tag(self):
+        auth = PacketAuth("required")
+        session = client_pair(auth, "10.0.0.3", 0.0)
+        self.assertNotIn("10.0.0.3", auth.sessions)
+        forged = _AuthSession(os.urandom(32))
+        self.assertEqual(auth.verify([(ping(forged, 1), ("10.0.0.3", 1))]), [])
+        self.assertNotIn("10.0.0.3", auth.sessions)
+        self.assertEqual(len(auth.verify([(ping(session, 1), ("10.0.0.3", 1))])), 1)
+        self.assertIn("10.0.0.3", auth.sessions)
+        self.assertNotIn("10.0.0.3", auth.pending)
+
+    def test_pairing_rate_limited_globally(self):
+        auth = PacketAuth("optional", pair_rate=(2, 4))
+        replies = [client_pair(auth, f"10.0.2.{i}", 0.0) for i in range(6)]
+        self.assertEqual(sum(r is not None for r in replies), 4)
+        self.assertEqual(auth.stats['pair_limited'], 2)
+        self.assertIsNotNone(client_pair(auth, "10.0.2.9", 0.5))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,20 +5,134 @@ Port: 26760
 """
 
 import socket
+import selectors
+import signal
 import struct
 import time
 import threading
+import queue
 from datetime import datetime
 import json
 import sys
 
+class WorkerPool:
+    """
+    Sabit boyutlu işçi havuzu.
+    İstemciler adres hash'ine göre işçilere dağıtılır, böylece bir
+    istemcinin paketleri hep aynı işçide sırayla işlenir.
+    Kuyruklar sınırlıdır; dolunca taşma politikası uygulanır:
+      drop_newest: yeni paketi at
+      drop_oldest: kuyruktaki en eski paketi atıp yenisini ekle
+      block      : yer açılana kadar bekle (alım döngüsünü yavaşlatır)
+    """
+    POLICIES = ("drop_newest", "drop_oldest", "block")
+    
+    def __init__(self, handler, workers=4, queue_size=256, policy="drop_newest"):
+        if policy not in self.POLICIES:
+            raise ValueError(f"Geçersiz taşma politikası: {policy}")
+        self.handler = handler
+        self.size = max(1, workers)
+        self.policy = policy
+        self.queues = [queue.Queue(maxsize=queue_size) for _ in range(self.size)]
+        self.threads = []
+        self.processed = [0] * self.size
+        self.dropped = [0] * self.size
+        self.busy_time = [0.0] * self.size
+        self.high_water = [0] * self.size
+        self.started_at = None
+    
+    def start(self):
+        """İşçi thread'lerini başlat"""
+        self.started_at = time.monotonic()
+        for i in range(self.size):
+            t = threading.Thread(target=self._worker, args=(i,), daemon=True)
+            t.start()
+            self.threads.append(t)
+    
+    def submit(self, data, client_address):
+        """Paketi istemcinin işçisine kuyrukla, atılırsa False döner"""
+        idx = hash(client_address) % self.size
+        q = self.queues[idx]
+        item = (data, client_address)
+        
+        if self.policy == "block":
+            q.put(item)
+        else:
+            try:
+                q.put_nowait(item)
+            except queue.Full:
+                if self.policy == "drop_newest":
+                    self.dropped[idx] += 1
+                    return False
+                # drop_oldest: en eskiyi at, yenisini ekle
+                try:
+                    q.get_nowait()
+                    self.dropped[idx] += 1
+                except queue.Empty:
+                    pass
+                try:
+                    q.put_nowait(item)
+                except queue.Full:
+                    self.dropped[idx] += 1
+                    return False
+        
+        depth = q.qsize()
+        if depth > self.high_water[idx]:
+            self.high_water[idx] = depth
+        return True
+    
+    def _worker(self, idx):
+        """Kuyruktaki paketleri sırayla işle"""
+        q = self.queues[idx]
+        while True:
+            item = q.get()
+            if item is None:
+                break
+            t0 = time.perf_counter()
+            try:
+                self.handler(*item)
+            except Exception:
+                pass
+            self.busy_time[idx] += time.perf_counter() - t0
+            self.processed[idx] += 1
+    
+    def stop(self, timeout=1.0):
+        """İşçilere durma sinyali gönder"""
+        for q in self.queues:
+            try:
+                q.put_nowait(None)
+            except queue.Full:
+                pass
+        for t in self.threads:
+            t.join(timeout)
+    
+    def get_stats(self):
+        """Havuz kullanım istatistikleri"""
+        elapsed = max(time.monotonic() - self.started_at, 1e-9) if self.started_at else 0
+        return {
+            "workers": self.size,
+            "policy": self.policy,
+            "processed": sum(self.processed),
+            "dropped": sum(self.dropped),
+            "queued": [q.qsize() for q in self.queues],
+            "high_water": list(self.high_water),
+            "utilization": [round(b / elapsed, 4) if elapsed else 0.0 for b in self.busy_time],
+        }
+
 class UdpServer:
-    def __init__(self, host='0.0.0.0', port=26760):
+    def __init__(self, host='0.0.0.0', port=26760, workers=4, queue_size=256, overflow="drop_newest"):
         self.host = host
         self.port = port
         self.running = False
         self.clients = {}
         self.last_activity = {}
+        self.lock = threading.Lock()
+        self.stats = {"received": 0, "wakeups": 0}
+        self.started_at = None
+        self.client_timeout = 30  # saniye
+        
+        # Paket işleme havuzu
+        self.pool = WorkerPool(self.process_packet, workers, queue_size, overflow)
         
         # Paket tipleri (Android uygulamasıyla aynı)
         self.PACKET_PING = 0x7F
@@ -34,6 +148,7 @@ class UdpServer:
         print(f"Port: {port}")
         print(f"IP adresiniz: {self.get_local_ip()}")
         print(f"Log dosyası: {self.log_file}")
+        print(f"İşçi havuzu: {self.pool.size} işçi, kuyruk {queue_size}, taşma: {overflow}")
         print("-" * 50)
     
     def get_local_ip(self):
@@ -163,7 +278,8 @@ class UdpServer:
         client_ip = client_address[0]
         
         # Aktivite zamanını güncelle
-        self.last_activity[client_ip] = time.time()
+        with self.lock:
+            self.last_activity[client_ip] = time.time()
         
         # İlk byte paket tipini belirler
         if len(data) == 0:
@@ -199,20 +315,22 @@ class UdpServer:
             self.log(f"Bilinmeyen paket tipi: {packet_type:02X}", client_ip)
     
     def cleanup_clients(self):
-        """Eski bağlantıları temizle"""
+        """Eski bağlantıları temizle, bir sonraki zaman aşımı anını döndür (istemci yoksa None)"""
         current_time = time.time()
-        timeout = 30  # 30 saniye
+        timeout = self.client_timeout
         
-        to_remove = []
-        for client_ip, last_time in self.last_activity.items():
-            if current_time - last_time > timeout:
-                to_remove.append(client_ip)
-                self.log(f"İstemci zaman aşımı: {client_ip}")
+        with self.lock:
+            to_remove = [ip for ip, last_time in self.last_activity.items()
+                         if current_time - last_time > timeout]
+            for client_ip in to_remove:
+                del self.last_activity[client_ip]
+                if client_ip in self.clients:
+                    del self.clients[client_ip]
+            next_cleanup = min(self.last_activity.values(), default=None)
         
         for client_ip in to_remove:
-            del self.last_activity[client_ip]
-            if client_ip in self.clients:
-                del self.clients[client_ip]
+            self.log(f"İstemci zaman aşımı: {client_ip}")
+        return next_cleanup + timeout if next_cleanup is not None else None
     
     def start(self):
         """Sunucuyu başlat"""
@@ -232,30 +350,44 @@ class UdpServer:
             self.log("Çıkmak için Ctrl+C")
             print("-" * 50)
             
-            # Temizleme thread'i
-            cleanup_thread = threading.Thread(target=self.cleanup_loop, daemon=True)
-            cleanup_thread.start()
+            # İşçi havuzu
+            self.pool.start()
+            self.started_at = time.monotonic()
             
-            # Ana dinleme döngüsü
+            # Ana dinleme döngüsü: istemci yokken süresiz bekler; sadece paket
+            # ya da en eski istemcinin zaman aşımı anında uyanır. Soket
+            # bloklamasız: bekleyen paketler doğrudan okunur, süre sadece
+            # boşta poll'a verilir (paket başına settimeout sistem çağrısı yok)
+            self.sock.setblocking(False)
+            selector = selectors.DefaultSelector()
+            selector.register(self.sock, selectors.EVENT_READ)
+            next_cleanup = None
             while self.running:
                 try:
-                    data, client_address = self.sock.recvfrom(1024)
+                    try:
+                        data, client_address = self.sock.recvfrom(1024)
+                    except BlockingIOError:
+                        # Gerçek bekleme: uyanma sadece burada sayılır (paket ya da zaman aşımı)
+                        selector.select(None if next_cleanup is None else max(0.0, next_cleanup - time.time()))
+                        self.stats["wakeups"] += 1
+                        data = None
                     
-                    # Yeni thread'de paketi işle
-                    thread = threading.Thread(
-                        target=self.process_packet,
-                        args=(data, client_address),
-                        daemon=True
-                    )
-                    thread.start()
+                    if data is not None:
+                        self.stats["received"] += 1
+                        # İstemcinin işçisine kuyrukla (sıra korunur)
+                        self.pool.submit(data, client_address)
+                        if next_cleanup is None:
+                            next_cleanup = time.time() + self.client_timeout
+                    
+                    if next_cleanup is not None and time.time() >= next_cleanup:
+                        next_cleanup = self.cleanup_clients()
                     
-                except socket.timeout:
-                    continue
                 except KeyboardInterrupt:
                     self.log("Sunucu durduruluyor...")
                     break
                 except Exception as e:
                     self.log(f"Alım hatası: {e}")
+            selector.close()
         
         except Exception as e:
             self.log(f"Sunucu başlatma hatası: {e}")
@@ -263,20 +395,32 @@ class UdpServer:
         finally:
             self.stop()
     
-    def cleanup_loop(self):
-        """Periyodik temizleme döngüsü"""
-        while self.running:
-            time.sleep(10)  # Her 10 saniyede bir
-            self.cleanup_clients()
+    def get_stats(self):
+        """Sunucu ve havuz istatistikleri"""
+        stats = dict(self.stats)
+        elapsed = time.monotonic() - self.started_at if self.started_at else 0
+        stats["wakeups_per_sec"] = round(stats["wakeups"] / elapsed, 3) if elapsed else 0.0
+        stats["pool"] = self.pool.get_stats()
+        return stats
     
     def stop(self):
         """Sunucuyu durdur"""
+        if not self.running:
+            return
         self.running = False
         try:
             self.sock.close()
         except:
             pass
+        self.pool.stop()
         self.log("Sunucu durduruldu")
+        
+        stats = self.get_stats()
+        pool = stats["pool"]
+        self.log(f"Alınan: {self.stats['received']}, işlenen: {pool['processed']}, "
+                 f"atılan: {pool['dropped']}")
+        self.log(f"Döngü uyanma: {stats['wakeups']} ({stats['wakeups_per_sec']}/sn)")
+        self.log(f"İşçi kullanımı: {pool['utilization']}, en yüksek kuyruk: {pool['high_water']}")
 
 def main():
     """Ana fonksiyon"""
@@ -286,8 +430,9 @@ def main():
     
     # Kullanım bilgisi
     if len(sys.argv) > 1 and sys.argv[1] in ["-h", "--help"]:
-        print("Kullanım: python3 server.py [port]")
-        print("Örnek: python3 server.py 26760")
+        print("Kullanım: python3 server.py [port] [işçi sayısı] [taşma politikası]")
+        print("Örnek: python3 server.py 26760 4 drop_oldest")
+        print(f"Taşma politikaları: {', '.join(WorkerPool.POLICIES)}")
         return
     
     # Port belirleme
@@ -298,8 +443,28 @@ def main():
         except:
             print(f"Geçersiz port: {sys.argv[1]}, varsayılan {port} kullanılıyor")
     
+    # İşçi sayısı ve taşma politikası
+    workers = 4
+    if len(sys.argv) > 2:
+        try:
+            workers = int(sys.argv[2])
+        except:
+            print(f"Geçersiz işçi sayısı: {sys.argv[2]}, varsayılan {workers} kullanılıyor")
+    
+    overflow = "drop_newest"
+    if len(sys.argv) > 3:
+        if sys.argv[3] in WorkerPool.POLICIES:
+            overflow = sys.argv[3]
+        else:
+            print(f"Geçersiz taşma politikası: {sys.argv[3]}, varsayılan {overflow} kullanılıyor")
+    
     # Sunucuyu başlat
-    server = UdpServer(port=port)
+    server = UdpServer(port=port, workers=workers, overflow=overflow)
+    
+    # SIGTERM de Ctrl+C gibi bekleyen recvfrom'u keser (özet yazılır)
+    def sigterm(sig, frame):
+        raise KeyboardInterrupt
+    signal.signal(signal.SIGTERM, sigterm)
     
     try:
         server.start()